@@ -0,0 +1,208 @@
+"""
+Response Cache
+Cache de réponses en mémoire avec validation ETag / Last-Modified
+
+Les endpoints consultés en polling par le dashboard (rapport hebdo,
+tendances, sessions d'une semaine) passent par `cached_response()` :
+
+1. Tant qu'une entrée a moins de `RESPONSE_CACHE_TTL` secondes, elle est
+   servie sans aucun appel GCS.
+2. Au-delà, l'entrée est revalidée avec les métadonnées des objets sous-
+   jacents (generation GCS) : si rien n'a changé, le corps en cache est
+   réutilisé sans téléchargement.
+3. Si le client envoie `If-None-Match` (ou `If-Modified-Since`) et que la
+   représentation n'a pas changé, la réponse est un 304 vide, sans
+   téléchargement même quand l'entrée n'est pas (ou plus) en cache.
+
+Les revalidations concurrentes d'une même clé sont coalescées (single-flight).
+"""
+
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from datetime import datetime
+from email.utils import format_datetime, parsedate_to_datetime
+from fastapi import Request, Response
+from fastapi.responses import JSONResponse
+from typing import Any, Awaitable, Callable, Iterable, Optional
+import hashlib
+import os
+import time
+
+from api.singleflight import SingleFlight, request_coalescer
+
+RESPONSE_CACHE_TTL = float(os.environ.get("RESPONSE_CACHE_TTL", "30"))
+RESPONSE_CACHE_MAX_ENTRIES = int(os.environ.get("RESPONSE_CACHE_MAX_ENTRIES", "256"))
+
+
+@dataclass
+class Validation:
+    """Résultat d'une revalidation: empreinte des objets + contexte pour `build`"""
+    validator: str
+    last_modified: Optional[datetime] = None
+    context: Any = None
+
+
+@dataclass
+class CacheEntry:
+    body: Any
+    validator: str
+    etag: str
+    last_modified: Optional[datetime]
+    stored_at: float = field(default_factory=time.monotonic)
+
+    def is_fresh(self, ttl: float) -> bool:
+        return time.monotonic() - self.stored_at < ttl
+
+
+class ResponseCache:
+    """Cache LRU borné en taille avec TTL (utilisé depuis l'event loop uniquement)"""
+
+    def __init__(self, max_entries: int = RESPONSE_CACHE_MAX_ENTRIES, ttl: float = RESPONSE_CACHE_TTL):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, CacheEntry]" = OrderedDict()
+        self.hits = 0
+        self.revalidated = 0
+        self.misses = 0
+        self.not_modified = 0
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+        return entry
+
+    def put(self, key: str, entry: CacheEntry):
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, contains: Optional[str] = None):
+        """Supprime toutes les entrées (ou celles dont la clé contient `contains`)"""
+        if contains is None:
+            self._entries.clear()
+            return
+        for key in [k for k in self._entries if contains in k]:
+            del self._entries[key]
+
+    def stats(self) -> dict:
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl,
+            "hits": self.hits,
+            "revalidated": self.revalidated,
+            "misses": self.misses,
+            "not_modified": self.not_modified,
+        }
+
+
+# Instance unique pour le process
+response_cache = ResponseCache()
+
+
+# =============================================================================
+# Helpers
+# =============================================================================
+def cache_key(request: Request) -> str:
+    """Clé = route + paramètres (query triée)"""
+    query = "&".join(f"{k}={v}" for k, v in sorted(request.query_params.multi_items()))
+    return f"{request.url.path}?{query}"
+
+
+def fingerprint(blobs: Iterable) -> Validation:
+    """Empreinte d'un ensemble d'objets GCS à partir de (name, generation)"""
+    digest = hashlib.sha1()
+    last_modified = None
+    for blob in sorted(blobs, key=lambda b: b.name):
+        digest.update(f"{blob.name}#{blob.generation}\n".encode())
+        if blob.updated and (last_modified is None or blob.updated > last_modified):
+            last_modified = blob.updated
+    return Validation(validator=digest.hexdigest(), last_modified=last_modified)
+
+
+def _not_modified(request: Request, entry: CacheEntry) -> bool:
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        tags = [t.strip() for t in if_none_match.split(",")]
+        return "*" in tags or entry.etag in tags or f"W/{entry.etag}" in tags
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since and entry.last_modified:
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        return entry.last_modified.replace(microsecond=0) <= since
+    return False
+
+
+def _headers(entry: CacheEntry) -> dict:
+    headers = {
+        "ETag": entry.etag,
+        "Cache-Control": "private, no-cache",
+    }
+    if entry.last_modified:
+        headers["Last-Modified"] = format_datetime(entry.last_modified, usegmt=True)
+    return headers
+
+
+async def cached_response(
+    request: Request,
+    revalidate: Callable[[], Awaitable[Validation]],
+    build: Callable[[Validation], Awaitable[Any]],
+    cache: ResponseCache = response_cache,
+    coalescer: SingleFlight = request_coalescer,
+) -> Response:
+    """
+    Sert une réponse JSON depuis le cache, en revalidant si nécessaire
+
+    Args:
+        request: Requête entrante (clé de cache + en-têtes conditionnels)
+        revalidate: Lit les métadonnées des objets sources (sans télécharger)
+        build: Construit le corps à partir de la validation (télécharge/parse)
+    """
+    key = cache_key(request)
+    entry = cache.get(key)
+
+    if entry is not None and entry.is_fresh(cache.ttl):
+        cache.hits += 1
+    else:
+        async def revalidate_entry() -> tuple[Validation, Optional[CacheEntry]]:
+            current = cache.get(key)
+            validation = await revalidate()
+            if current is not None and current.validator == validation.validator:
+                cache.revalidated += 1
+                current.stored_at = time.monotonic()
+                return validation, current
+            return validation, None
+
+        # Concurrent identical requests share one revalidation...
+        validation, entry = await coalescer.do(key, revalidate_entry)
+        if entry is None:
+            etag = '"' + hashlib.sha1(f"{key}|{validation.validator}".encode()).hexdigest()[:32] + '"'
+            candidate = CacheEntry(body=None, validator=validation.validator, etag=etag, last_modified=validation.last_modified)
+            if _not_modified(request, candidate):
+                # Le client a déjà cette version (cache vide, redémarrage, autre
+                # instance) : 304 sans téléchargement
+                cache.not_modified += 1
+                return Response(status_code=304, headers=_headers(candidate))
+
+            async def rebuild() -> CacheEntry:
+                current = cache.get(key)
+                if current is not None and current.validator == validation.validator:
+                    return current
+                cache.misses += 1
+                candidate.body = await build(validation)
+                cache.put(key, candidate)
+                return candidate
+
+            # ...and one download
+            entry = await coalescer.do(f"{key}#build", rebuild)
+
+    if _not_modified(request, entry):
+        cache.not_modified += 1
+        return Response(status_code=304, headers=_headers(entry))
+
+    return JSONResponse(content=entry.body, headers=_headers(entry))
@@ -0,0 +1,243 @@
+"""
+Google Cloud Clients
+Registre applicatif des clients GCP partagés entre les requêtes
+
+Chaque client (Storage, Cloud Run, Logging, IAM Credentials) est créé une seule fois par
+process, à la première utilisation, puis réutilisé : la découverte des
+credentials et l'établissement des connexions TLS/gRPC ne sont payés
+qu'une fois. Les routes y accèdent via les dépendances FastAPI
+`get_storage_client`, `get_jobs_client`, etc.
+"""
+
+from google.cloud import storage, run_v2, logging as cloud_logging, iam_credentials_v1
+from google.cloud.run_v2.services.jobs.transports.grpc import JobsGrpcTransport
+from google.cloud.run_v2.services.executions.transports.grpc import ExecutionsGrpcTransport
+from google.auth import compute_engine
+from google.auth.transport.requests import AuthorizedSession
+from requests.adapters import HTTPAdapter
+import google.auth
+import logging
+import os
+import requests
+import threading
+
+logger = logging.getLogger(__name__)
+
+PROJECT_ID = os.environ.get("PROJECT_ID", "build-unicorn25par-4813")
+
+# Taille du pool HTTP vers storage.googleapis.com (connexions keep-alive réutilisées)
+GCS_HTTP_POOL_SIZE = int(os.environ.get("GCS_HTTP_POOL_SIZE", "32"))
+# Nombre de pools (un par hôte) conservés par la session HTTP
+GCS_HTTP_POOL_CONNECTIONS = int(os.environ.get("GCS_HTTP_POOL_CONNECTIONS", "4"))
+# Keepalive du channel gRPC partagé vers run.googleapis.com
+GRPC_KEEPALIVE_MS = int(os.environ.get("GRPC_KEEPALIVE_MS", "30000"))
+GRPC_MAX_MESSAGE_BYTES = int(os.environ.get("GRPC_MAX_MESSAGE_BYTES", str(32 * 1024 * 1024)))
+
+CLOUD_PLATFORM_SCOPE = "https://www.googleapis.com/auth/cloud-platform"
+
+METADATA_EMAIL_URL = "http://metadata.google.internal/computeMetadata/v1/instance/service-accounts/default/email"
+
+
+class ClientRegistry:
+    """
+    Registre thread-safe de clients GCP créés paresseusement
+
+    Un seul jeu de credentials est résolu pour tous les clients. Storage
+    utilise une session HTTP dont le pool de connexions est dimensionné par
+    `GCS_HTTP_POOL_SIZE`; Jobs et Executions partagent un même channel gRPC
+    (les deux services sont sur run.googleapis.com).
+    """
+
+    def __init__(
+        self,
+        http_pool_size: int = GCS_HTTP_POOL_SIZE,
+        http_pool_connections: int = GCS_HTTP_POOL_CONNECTIONS,
+        grpc_keepalive_ms: int = GRPC_KEEPALIVE_MS,
+    ):
+        self.http_pool_size = http_pool_size
+        self.http_pool_connections = http_pool_connections
+        self.grpc_keepalive_ms = grpc_keepalive_ms
+
+        self._lock = threading.Lock()
+        self._credentials = None
+        self._project = None
+        self._storage = None
+        self._http = None
+        self._run_channel = None
+        self._jobs = None
+        self._executions = None
+        self._logging = None
+        self._iam_credentials = None
+        self._service_account_email = None
+
+    # -------------------------------------------------------------------------
+    # Credentials
+    # -------------------------------------------------------------------------
+    def _ensure_credentials(self):
+        """Résout les Application Default Credentials une seule fois (lock tenu)"""
+        if self._credentials is None:
+            self._credentials, project = google.auth.default(scopes=[CLOUD_PLATFORM_SCOPE])
+            self._project = project or PROJECT_ID
+        return self._credentials
+
+    @property
+    def credentials(self):
+        with self._lock:
+            return self._ensure_credentials()
+
+    @property
+    def uses_metadata_credentials(self) -> bool:
+        """True sur Cloud Run / GCE: pas de clé privée locale, signature via IAM"""
+        return isinstance(self.credentials, compute_engine.Credentials)
+
+    @property
+    def service_account_email(self) -> str:
+        """Email du compte de service d'exécution (metadata server interrogé une fois)"""
+        if self._service_account_email is None:
+            with self._lock:
+                if self._service_account_email is None:
+                    credentials = self._ensure_credentials()
+                    email = getattr(credentials, "service_account_email", None)
+                    if not email or email == "default":
+                        response = requests.get(
+                            METADATA_EMAIL_URL,
+                            headers={"Metadata-Flavor": "Google"},
+                            timeout=5,
+                        )
+                        response.raise_for_status()
+                        email = response.text.strip()
+                    self._service_account_email = email
+        return self._service_account_email
+
+    # -------------------------------------------------------------------------
+    # Cloud Storage (HTTP/JSON API)
+    # -------------------------------------------------------------------------
+    @property
+    def storage(self) -> storage.Client:
+        if self._storage is None:
+            with self._lock:
+                if self._storage is None:
+                    credentials = self._ensure_credentials()
+                    session = AuthorizedSession(credentials)
+                    adapter = HTTPAdapter(
+                        pool_connections=self.http_pool_connections,
+                        pool_maxsize=self.http_pool_size,
+                    )
+                    session.mount("https://", adapter)
+                    self._http = session
+                    self._storage = storage.Client(
+                        project=self._project,
+                        credentials=credentials,
+                        _http=session,
+                    )
+                    logger.info(f"🔌 Storage client ready (HTTP pool size={self.http_pool_size})")
+        return self._storage
+
+    # -------------------------------------------------------------------------
+    # Cloud Run (gRPC)
+    # -------------------------------------------------------------------------
+    def _ensure_run_channel(self):
+        if self._run_channel is None:
+            self._run_channel = JobsGrpcTransport.create_channel(
+                credentials=self._ensure_credentials(),
+                scopes=[CLOUD_PLATFORM_SCOPE],
+                options=[
+                    ("grpc.keepalive_time_ms", self.grpc_keepalive_ms),
+                    ("grpc.keepalive_permit_without_calls", 1),
+                    ("grpc.max_send_message_length", GRPC_MAX_MESSAGE_BYTES),
+                    ("grpc.max_receive_message_length", GRPC_MAX_MESSAGE_BYTES),
+                ],
+            )
+        return self._run_channel
+
+    @property
+    def jobs(self) -> run_v2.JobsClient:
+        if self._jobs is None:
+            with self._lock:
+                if self._jobs is None:
+                    channel = self._ensure_run_channel()
+                    self._jobs = run_v2.JobsClient(transport=JobsGrpcTransport(channel=channel))
+        return self._jobs
+
+    @property
+    def executions(self) -> run_v2.ExecutionsClient:
+        if self._executions is None:
+            with self._lock:
+                if self._executions is None:
+                    channel = self._ensure_run_channel()
+                    self._executions = run_v2.ExecutionsClient(
+                        transport=ExecutionsGrpcTransport(channel=channel)
+                    )
+        return self._executions
+
+    # -------------------------------------------------------------------------
+    # Cloud Logging
+    # -------------------------------------------------------------------------
+    @property
+    def logging(self) -> cloud_logging.Client:
+        if self._logging is None:
+            with self._lock:
+                if self._logging is None:
+                    self._logging = cloud_logging.Client(
+                        project=self._project or PROJECT_ID,
+                        credentials=self._ensure_credentials(),
+                    )
+        return self._logging
+
+    # -------------------------------------------------------------------------
+    # IAM Credentials (signBlob pour les URLs signées sans clé privée)
+    # -------------------------------------------------------------------------
+    @property
+    def iam_credentials(self) -> iam_credentials_v1.IAMCredentialsClient:
+        if self._iam_credentials is None:
+            with self._lock:
+                if self._iam_credentials is None:
+                    self._iam_credentials = iam_credentials_v1.IAMCredentialsClient(
+                        credentials=self._ensure_credentials(),
+                    )
+        return self._iam_credentials
+
+    # -------------------------------------------------------------------------
+    # Lifecycle
+    # -------------------------------------------------------------------------
+    def close(self):
+        """Ferme les connexions ouvertes (appelé au shutdown de l'app)"""
+        with self._lock:
+            if self._http is not None:
+                self._http.close()
+            if self._run_channel is not None:
+                self._run_channel.close()
+            self._storage = None
+            self._http = None
+            self._run_channel = None
+            self._jobs = None
+            self._executions = None
+            self._logging = None
+            self._iam_credentials = None
+
+
+# Instance unique pour le process
+registry = ClientRegistry()
+
+
+# =============================================================================
+# FastAPI dependencies
+# =============================================================================
+def get_registry() -> ClientRegistry:
+    return registry
+
+
+def get_storage_client() -> storage.Client:
+    return registry.storage
+
+
+def get_jobs_client() -> run_v2.JobsClient:
+    return registry.jobs
+
+
+def get_executions_client() -> run_v2.ExecutionsClient:
+    return registry.executions
+
+
+def get_logging_client() -> cloud_logging.Client:
+    return registry.logging
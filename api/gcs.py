@@ -0,0 +1,169 @@
+"""
+Async Storage Layer
+Accès non bloquant à Cloud Storage pour les handlers async
+
+Le client `google-cloud-storage` est synchrone : chaque appel réseau est
+exécuté dans un pool de threads borné (`GCS_IO_WORKERS`) afin que l'event
+loop reste libre pour les autres requêtes et les WebSockets live.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from google.api_core.exceptions import NotFound
+from google.cloud import storage
+from google.cloud.storage.batch import Batch
+import asyncio
+import functools
+import json
+import os
+
+# Nombre max d'appels GCS simultanés par instance (≤ GCS_HTTP_POOL_SIZE)
+GCS_IO_WORKERS = int(os.environ.get("GCS_IO_WORKERS", "16"))
+# Nombre max de fetchs simultanés lancés par une même requête (fan-out)
+GCS_FETCH_CONCURRENCY = int(os.environ.get("GCS_FETCH_CONCURRENCY", str(GCS_IO_WORKERS)))
+
+# Nombre max de suppressions par requête batch (limite de l'API JSON GCS: 100)
+GCS_BATCH_SIZE = int(os.environ.get("GCS_BATCH_SIZE", "100"))
+
+_executor = ThreadPoolExecutor(max_workers=GCS_IO_WORKERS, thread_name_prefix="gcs-io")
+
+
+async def run_blocking(fn, *args, **kwargs):
+    """Exécute un appel bloquant dans le pool GCS et attend son résultat"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_executor, functools.partial(fn, *args, **kwargs))
+
+
+async def list_blobs(bucket: storage.Bucket, prefix: str | None = None) -> list[storage.Blob]:
+    """Liste (et pagine) les objets sous un préfixe sans bloquer l'event loop"""
+    return await run_blocking(lambda: list(bucket.list_blobs(prefix=prefix)))
+
+
+async def list_prefixes(bucket: storage.Bucket, prefix: str | None = None, delimiter: str = "/") -> list[str]:
+    """
+    Liste les "dossiers" directs sous un préfixe (ex: semaines `2025-W42/`)
+
+    Avec un délimiteur, GCS ne renvoie que les préfixes communs : une semaine
+    coûte une entrée dans la réponse au lieu d'une par objet.
+    """
+    def fetch():
+        iterator = bucket.list_blobs(prefix=prefix, delimiter=delimiter)
+        for _ in iterator.pages:
+            pass
+        return sorted(iterator.prefixes)
+
+    return await run_blocking(fetch)
+
+
+async def list_weeks(bucket: storage.Bucket) -> list[str]:
+    """Semaines présentes à la racine d'un bucket (`2025-W42/...`), plus récentes d'abord"""
+    prefixes = await list_prefixes(bucket)
+    weeks = [p.rstrip("/") for p in prefixes if p.startswith("20")]  # Basic year check
+    return sorted(weeks, reverse=True)
+
+
+async def gather_bounded(coros, limit: int = GCS_FETCH_CONCURRENCY) -> list:
+    """`asyncio.gather` avec au plus `limit` coroutines en cours (ordre conservé)"""
+    semaphore = asyncio.Semaphore(limit)
+
+    async def bounded(coro):
+        async with semaphore:
+            return await coro
+
+    return await asyncio.gather(*[bounded(c) for c in coros])
+
+
+async def get_blob(bucket: storage.Bucket, name: str) -> storage.Blob | None:
+    """Lit les métadonnées d'un objet (generation, updated...) sans le télécharger"""
+    return await run_blocking(bucket.get_blob, name)
+
+
+async def blob_exists(blob: storage.Blob) -> bool:
+    return await run_blocking(blob.exists)
+
+
+async def download_text(blob: storage.Blob) -> str:
+    return await run_blocking(blob.download_as_text)
+
+
+async def download_json(blob: storage.Blob):
+    """Télécharge et parse un objet JSON (le parsing reste hors event loop)"""
+    return await run_blocking(lambda: json.loads(blob.download_as_text()))
+
+
+async def download_json_or_none(blob: storage.Blob):
+    """
+    Télécharge un objet JSON en un seul GET, `None` s'il n'existe pas
+
+    Évite le couple `exists()` + `download_as_text()` (deux allers-retours) :
+    un 404 sur le GET suffit à savoir que l'objet est absent.
+    """
+    def fetch():
+        try:
+            return json.loads(blob.download_as_text())
+        except NotFound:
+            return None
+
+    return await run_blocking(fetch)
+
+
+class _DeleteBatch(Batch):
+    """Batch qui garde le statut HTTP de chaque requête différée (`finish()` les renvoie, `__exit__` non)"""
+
+    statuses: tuple[int, ...] = ()
+
+    def finish(self, raise_exception=True):
+        responses = super().finish(raise_exception=raise_exception)
+        self.statuses = tuple(response.status_code for response in responses)
+        return responses
+
+
+def _delete_batch(client: storage.Client, blobs: list[storage.Blob]) -> tuple[int, int]:
+    """
+    Supprime jusqu'à `GCS_BATCH_SIZE` objets en une requête multipart
+
+    La pile de batchs du client est propre à chaque thread : ouvrir le batch
+    sur le client partagé depuis un thread du pool ne diffère pas les appels
+    des autres threads.
+    """
+    with _DeleteBatch(client, raise_exception=False) as batch:
+        for blob in blobs:
+            blob.delete(client=client)
+
+    # 404 = déjà supprimé (purge relancée, suppression concurrente): compté comme fait
+    deleted = sum(1 for status in batch.statuses if 200 <= status < 300 or status == 404)
+    return deleted, len(blobs) - deleted
+
+
+async def delete_blobs(
+    client: storage.Client,
+    blobs: list[storage.Blob],
+    on_progress=None,
+    batch_size: int = GCS_BATCH_SIZE,
+) -> tuple[int, int]:
+    """
+    Supprime des objets par requêtes batch envoyées en parallèle
+
+    Args:
+        on_progress: Appelé `(deleted, failed)` après chaque batch terminé
+
+    Returns:
+        (deleted, failed)
+    """
+    deleted = failed = 0
+
+    async def run(chunk):
+        nonlocal deleted, failed
+        ok, ko = await run_blocking(_delete_batch, client, chunk)
+        deleted += ok
+        failed += ko
+        if on_progress is not None:
+            on_progress(ok, ko)
+
+    chunks = [blobs[i:i + batch_size] for i in range(0, len(blobs), batch_size)]
+    await gather_bounded([run(chunk) for chunk in chunks])
+    return deleted, failed
+
+
+def shutdown():
+    """Arrête le pool (appelé au shutdown de l'app)"""
+    _executor.shutdown(wait=False, cancel_futures=True)
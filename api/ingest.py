@@ -0,0 +1,85 @@
+"""
+Session Ingest
+Traitement complet d'une session audio (STT → prosodie → NLU → agrégat hebdo)
+
+Exécuté par les workers de la file de jobs (`api.jobs`), jamais dans une
+requête HTTP : une session prend 30 à 120 secondes (STT + Gemini).
+"""
+
+from typing import Callable
+import os
+
+BUCKET_RAW = os.environ.get("BUCKET_RAW", "pz-audio-raw-build-unicorn25par-4813")
+BUCKET_ANALYTICS = os.environ.get("BUCKET_ANALYTICS", "pz-analytics-build-unicorn25par-4813")
+
+
+def audio_path(week: str, session_id: str) -> str:
+    """Chemin de l'audio brut d'une session dans `BUCKET_RAW`"""
+    return f"{week}/{session_id}.wav"
+
+
+def process_session(week: str, session_id: str, on_stage: Callable[[str], None]) -> dict:
+    """
+    Exécute STT, prosodie et NLU pour une session, écrit les artefacts et
+    met à jour l'agrégat de la semaine (et donc `weekly_report.json`)
+
+    Bloquant. `on_stage(name)` est appelé au début de chaque étape.
+
+    Returns:
+        Chemins gs:// des artefacts produits
+    """
+    # Import pipeline functions
+    import sys
+    sys.path.append("/app")  # Adjust path for Cloud Run
+
+    from pipeline.main import (
+        stt_transcribe, download_to_tmp, extract_prosody,
+        nlu_events_emotions, compute_index, upload_json,
+        update_weekly_aggregate,
+    )
+
+    audio_uri = f"gs://{BUCKET_RAW}/{audio_path(week, session_id)}"
+
+    # 1. Speech-to-Text
+    on_stage("stt")
+    text, words = stt_transcribe(audio_uri)
+    transcript_obj = {
+        "session_id": session_id,
+        "audio_uri": audio_uri,
+        "language_code": "fr-FR",
+        "transcript": text,
+        "words": words,
+    }
+    transcript_path = f"{week}/{session_id}/transcript.json"
+    upload_json(BUCKET_ANALYTICS, transcript_path, transcript_obj)
+
+    # 2. Prosody Analysis
+    on_stage("prosody")
+    local_audio = download_to_tmp(audio_uri)  # fichier propre à ce job
+    try:
+        prosody = extract_prosody(local_audio)
+    finally:
+        os.remove(local_audio)
+    prosody["session_id"] = session_id
+    prosody_path = f"{week}/{session_id}/prosody_features.json"
+    upload_json(BUCKET_ANALYTICS, prosody_path, prosody)
+
+    # 3. NLU - Events & Emotions
+    on_stage("nlu")
+    nlu = nlu_events_emotions(text)
+    nlu["session_id"] = session_id
+    nlu["emotion_index"] = round(compute_index(nlu.get("emotions", [])), 1)
+    nlu_path = f"{week}/{session_id}/events_emotions.json"
+    upload_json(BUCKET_ANALYTICS, nlu_path, nlu)
+
+    # 4. Running weekly aggregate → weekly_report.json is current right away
+    on_stage("aggregate")
+    update_weekly_aggregate(week, session_id, nlu=nlu, prosody=prosody)
+
+    return {
+        "transcript": f"gs://{BUCKET_ANALYTICS}/{transcript_path}",
+        "prosody": f"gs://{BUCKET_ANALYTICS}/{prosody_path}",
+        "nlu": f"gs://{BUCKET_ANALYTICS}/{nlu_path}",
+        "weekly_report": f"gs://{BUCKET_ANALYTICS}/{week}/weekly_report.json",
+        "audio_uri": audio_uri,
+    }
@@ -0,0 +1,357 @@
+"""
+Ingest Job Queue
+File de jobs en process pour le traitement des sessions (STT → prosodie → NLU)
+
+`/v1/ingest/finish` et `/v1/run-session` ne traitent plus la session dans la
+requête : ils soumettent un job et renvoient son `job_id` immédiatement.
+
+- Un pool borné de workers (`JOB_WORKERS`) exécute les jobs hors event loop
+- Priorités : un ingest interactif (upload depuis l'app) passe avant un
+  retraitement batch
+- Une soumission identique `(week, session_id)` déjà en file ou en cours
+  renvoie le job existant au lieu d'en créer un second
+- L'état des jobs est conservé par un store interchangeable : en mémoire
+  (par défaut) ou en JSON dans GCS (`JOB_STORE=gcs`), auquel cas les jobs
+  non terminés sont relancés au redémarrage de l'instance
+"""
+
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime
+from google.api_core.exceptions import NotFound
+from typing import Callable, Optional
+import asyncio
+import itertools
+import json
+import logging
+import os
+import time
+import uuid
+
+from api.clients import registry
+from api.ingest import BUCKET_ANALYTICS, process_session
+from api import gcs
+
+logger = logging.getLogger(__name__)
+
+# Nombre de sessions traitées en parallèle par instance
+JOB_WORKERS = int(os.environ.get("JOB_WORKERS", "2"))
+# Backend de persistance des jobs: "memory" ou "gcs"
+JOB_STORE = os.environ.get("JOB_STORE", "memory")
+JOB_STORE_BUCKET = os.environ.get("JOB_STORE_BUCKET", BUCKET_ANALYTICS)
+JOB_STORE_PREFIX = os.environ.get("JOB_STORE_PREFIX", "_jobs/")
+# Nombre de jobs gardés en mémoire pour consultation
+JOB_HISTORY_SIZE = int(os.environ.get("JOB_HISTORY_SIZE", "500"))
+
+# Plus petit = plus prioritaire
+PRIORITY_INGEST = 0
+PRIORITY_REPROCESS = 10
+
+ACTIVE_STATUSES = ("queued", "running")
+
+
+def _now() -> str:
+    return datetime.utcnow().isoformat() + "Z"
+
+
+@dataclass
+class Job:
+    week: str
+    session_id: str
+    kind: str = "ingest"  # ingest | reprocess
+    priority: int = PRIORITY_INGEST
+    job_id: str = field(default_factory=lambda: uuid.uuid4().hex[:16])
+    status: str = "queued"  # queued → running → succeeded | failed
+    stage: Optional[str] = None
+    stages: dict = field(default_factory=dict)  # stage → {started_at, duration_ms}
+    artifacts: dict = field(default_factory=dict)
+    error: Optional[str] = None
+    submissions: int = 1
+    created_at: str = field(default_factory=_now)
+    started_at: Optional[str] = None
+    finished_at: Optional[str] = None
+    duration_ms: Optional[int] = None
+    _stage_clock: Optional[float] = field(default=None, repr=False, compare=False)
+
+    @property
+    def key(self) -> tuple:
+        return (self.week, self.session_id)
+
+    def enter_stage(self, stage: str):
+        """Ferme l'étape en cours et démarre `stage` (appelé depuis le worker)"""
+        self.close_stage()
+        self.stage = stage
+        self.stages[stage] = {"started_at": _now(), "duration_ms": None}
+        self._stage_clock = time.monotonic()
+
+    def close_stage(self):
+        if self.stage in self.stages and self._stage_clock is not None:
+            self.stages[self.stage]["duration_ms"] = int((time.monotonic() - self._stage_clock) * 1000)
+        self._stage_clock = None
+
+    def to_dict(self) -> dict:
+        return {
+            "job_id": self.job_id,
+            "week": self.week,
+            "session_id": self.session_id,
+            "kind": self.kind,
+            "priority": self.priority,
+            "status": self.status,
+            "stage": self.stage,
+            "stages": self.stages,
+            "artifacts": self.artifacts,
+            "error": self.error,
+            "submissions": self.submissions,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "duration_ms": self.duration_ms,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "Job":
+        return cls(**{k: v for k, v in data.items() if k in cls.__dataclass_fields__ and not k.startswith("_")})
+
+
+# =============================================================================
+# Stores
+# =============================================================================
+class MemoryJobStore:
+    """
+    Jobs récents en mémoire (perdus au redémarrage)
+
+    Au-delà de `max_entries`, les jobs terminés les plus anciens sont
+    oubliés ; un job en file ou en cours reste toujours consultable.
+    """
+
+    def __init__(self, max_entries: int = JOB_HISTORY_SIZE):
+        self.max_entries = max_entries
+        self._jobs: "OrderedDict[str, Job]" = OrderedDict()
+
+    async def save(self, job: Job):
+        self._jobs[job.job_id] = job
+        self._jobs.move_to_end(job.job_id)
+        excess = len(self._jobs) - self.max_entries
+        if excess > 0:
+            finished = [job_id for job_id, j in self._jobs.items() if j.status not in ACTIVE_STATUSES]
+            for job_id in finished[:excess]:
+                del self._jobs[job_id]
+
+    async def load(self, job_id: str) -> Optional[Job]:
+        return self._jobs.get(job_id)
+
+    async def pending(self) -> list[Job]:
+        return []
+
+
+class GCSJobStore(MemoryJobStore):
+    """
+    Jobs persistés en JSON dans GCS (`<prefix><job_id>.json`)
+
+    Un marqueur `<prefix>pending/<job_id>` existe tant que le job n'est pas
+    terminé : la reprise au démarrage ne liste que ces marqueurs.
+    """
+
+    def __init__(self, bucket_name: str = JOB_STORE_BUCKET, prefix: str = JOB_STORE_PREFIX, max_entries: int = JOB_HISTORY_SIZE):
+        super().__init__(max_entries)
+        self.bucket_name = bucket_name
+        self.prefix = prefix
+
+    @property
+    def bucket(self):
+        return registry.storage.bucket(self.bucket_name)
+
+    async def save(self, job: Job):
+        await super().save(job)
+        bucket = self.bucket
+        record = bucket.blob(f"{self.prefix}{job.job_id}.json")
+        marker = bucket.blob(f"{self.prefix}pending/{job.job_id}")
+
+        await gcs.run_blocking(
+            record.upload_from_string, json.dumps(job.to_dict(), ensure_ascii=False), content_type="application/json"
+        )
+        if job.status == "queued":
+            await gcs.run_blocking(marker.upload_from_string, b"")
+        elif job.status not in ACTIVE_STATUSES:
+            try:
+                await gcs.run_blocking(marker.delete)
+            except NotFound:
+                pass
+
+    async def load(self, job_id: str) -> Optional[Job]:
+        job = await super().load(job_id)
+        if job is not None:
+            return job
+        data = await gcs.download_json_or_none(self.bucket.blob(f"{self.prefix}{job_id}.json"))
+        return Job.from_dict(data) if data else None
+
+    async def pending(self) -> list[Job]:
+        markers = await gcs.list_blobs(self.bucket, prefix=f"{self.prefix}pending/")
+        jobs = await gcs.gather_bounded([self.load(m.name.rsplit("/", 1)[-1]) for m in markers])
+        return [job for job in jobs if job is not None and job.status in ACTIVE_STATUSES]
+
+
+def make_store(kind: str = JOB_STORE) -> MemoryJobStore:
+    if kind == "gcs":
+        return GCSJobStore()
+    if kind != "memory":
+        logger.warning(f"⚠️ Unknown JOB_STORE={kind!r}, falling back to memory")
+    return MemoryJobStore()
+
+
+# =============================================================================
+# Queue
+# =============================================================================
+class JobQueue:
+    """File à priorités + pool de workers (démarrée/arrêtée avec l'app)"""
+
+    def __init__(
+        self,
+        runner: Callable[[str, str, Callable[[str], None]], dict] = process_session,
+        store: Optional[MemoryJobStore] = None,
+        workers: int = JOB_WORKERS,
+    ):
+        self.runner = runner
+        self.store = store or make_store()
+        self.workers = workers
+
+        self._queue: Optional[asyncio.PriorityQueue] = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._tasks: list[asyncio.Task] = []
+        self._active: dict[tuple, Job] = {}
+        self._seq = itertools.count()
+
+        self.submitted = 0
+        self.deduplicated = 0
+        self.succeeded = 0
+        self.failed = 0
+
+    async def start(self):
+        if self._queue is not None:
+            return
+        self._queue = asyncio.PriorityQueue()
+        self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="ingest-job")
+        self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+        logger.info(f"🧵 Job queue started ({self.workers} workers, store={type(self.store).__name__})")
+
+        # Jobs left unfinished by a previous instance
+        for job in await self.store.pending():
+            job.status = "queued"
+            job.stage = None
+            self._active[job.key] = job
+            self._push(job)
+            logger.info(f"♻️ Requeued job {job.job_id} ({job.week}/{job.session_id})")
+
+    async def stop(self):
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+        self._tasks = []
+        self._queue = None
+        self._executor = None
+
+    def _push(self, job: Job):
+        # seq départage les priorités égales (FIFO) : les Job ne sont jamais comparés
+        self._queue.put_nowait((job.priority, next(self._seq), job))
+
+    async def submit(self, week: str, session_id: str, kind: str = "ingest", priority: int = PRIORITY_INGEST) -> tuple[Job, bool]:
+        """
+        Soumet un job, ou renvoie celui déjà en file/en cours pour la même session
+
+        Returns:
+            (job, created)
+        """
+        if self._queue is None:
+            raise RuntimeError("Job queue is not started")
+
+        existing = self._active.get((week, session_id))
+        if existing is not None:
+            existing.submissions += 1
+            self.deduplicated += 1
+            # Un ingest interactif fait remonter un retraitement encore en file
+            if existing.status == "queued" and priority < existing.priority:
+                existing.priority = priority
+                self._push(existing)
+            return existing, False
+
+        job = Job(week=week, session_id=session_id, kind=kind, priority=priority)
+        # Enregistré avant l'await : une soumission concurrente est dédupliquée
+        self._active[job.key] = job
+        self.submitted += 1
+        try:
+            await self.store.save(job)
+        except Exception:
+            # Jamais mis en file : ne doit pas capter les soumissions suivantes
+            if self._active.get(job.key) is job:
+                del self._active[job.key]
+            self.submitted -= 1
+            raise
+        self._push(job)
+        return job, True
+
+    async def get(self, job_id: str) -> Optional[Job]:
+        return await self.store.load(job_id)
+
+    async def _worker(self):
+        while True:
+            priority, _, job = await self._queue.get()
+            try:
+                # Entrée périmée (job promu à une meilleure priorité, ou déjà traité)
+                if job.status != "queued" or priority != job.priority:
+                    continue
+                await self._run(job)
+            finally:
+                self._queue.task_done()
+
+    async def _run(self, job: Job):
+        job.status = "running"
+        job.started_at = _now()
+        started = time.monotonic()
+        await self._save(job)
+
+        loop = asyncio.get_running_loop()
+        try:
+            job.artifacts = await loop.run_in_executor(
+                self._executor, self.runner, job.week, job.session_id, job.enter_stage
+            )
+            job.status = "succeeded"
+            self.succeeded += 1
+            logger.info(f"✅ Job {job.job_id} ({job.week}/{job.session_id}) done in {time.monotonic() - started:.1f}s")
+        except Exception as e:
+            job.status = "failed"
+            job.error = str(e)
+            self.failed += 1
+            logger.error(f"❌ Job {job.job_id} ({job.week}/{job.session_id}) failed at {job.stage}: {e}", exc_info=True)
+        finally:
+            job.close_stage()
+            job.finished_at = _now()
+            job.duration_ms = int((time.monotonic() - started) * 1000)
+            if self._active.get(job.key) is job:
+                del self._active[job.key]
+            await self._save(job)
+
+    async def _save(self, job: Job):
+        try:
+            await self.store.save(job)
+        except Exception as e:
+            logger.warning(f"⚠️ Could not persist job {job.job_id}: {e}")
+
+    def stats(self) -> dict:
+        running = sum(1 for job in self._active.values() if job.status == "running")
+        return {
+            "workers": self.workers,
+            "store": type(self.store).__name__,
+            "queued": len(self._active) - running,
+            "running": running,
+            "submitted": self.submitted,
+            "deduplicated": self.deduplicated,
+            "succeeded": self.succeeded,
+            "failed": self.failed,
+        }
+
+
+# Instance unique pour le process
+job_queue = JobQueue()
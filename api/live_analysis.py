@@ -0,0 +1,657 @@
+"""
+Live Prosody Workers
+Analyse prosodique temps réel hors event loop (processus dédiés)
+
+L'analyse d'un chunk (YIN + RMS, librosa) est du calcul pur qui tient le
+GIL : exécutée dans le handler WebSocket, elle bloque l'event loop et la
+latence de toutes les connexions de l'instance monte avec le nombre de
+sessions. Ici l'event loop ne fait que de l'I/O :
+
+- Un pool de `LIVE_WORKERS` processus, un exécuteur mono-processus par slot.
+  Chaque session est attachée à un slot pour toute sa durée : son
+  `StreamingProsodyAnalyzer` vit dans ce processus, et l'exécuteur traite
+  les tâches dans l'ordre de soumission (ordre des chunks garanti)
+- L'audio passe par un ring buffer float32 en mémoire partagée par session
+  (`SharedAudioRing`) : l'event loop y copie le chunk, seul l'indice de fin
+  est transmis au worker, qui lit les échantillons sans pickling
+- Les chunks de toutes les sessions d'un worker sont regroupés en lots
+  (`LIVE_BATCH_MS`) : un aller-retour inter-processus par lot au lieu
+  d'un par chunk
+- Files bornées par session : audio coalescé, fenêtres périmées et
+  analyses non envoyées abandonnées, hop étiré quand un worker sature ;
+  chaque `emotion_update` indique son retard de traitement (`lag_ms`)
+- Les processus sont lancés en `spawn` : pas de fork d'un process uvicorn
+  qui a déjà des threads (pools GCS, gRPC)
+"""
+
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass, field
+from multiprocessing import shared_memory
+from typing import Optional
+import asyncio
+import logging
+import multiprocessing
+import os
+import sys
+import time
+import uuid
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Processus d'analyse live par instance (0 = un par CPU, moins un pour l'event loop)
+LIVE_WORKERS = int(os.environ.get("LIVE_WORKERS", "0")) or max(1, (os.cpu_count() or 2) - 1)
+# Audio gardé par session en attendant son worker, secondes
+LIVE_RING_SECONDS = float(os.environ.get("LIVE_RING_SECONDS", "10"))
+# Fenêtre de regroupement des chunks de toutes les sessions d'un worker, ms
+LIVE_BATCH_MS = float(os.environ.get("LIVE_BATCH_MS", "5"))
+# Analyses prêtes gardées par session quand le client lit moins vite
+LIVE_MAX_PENDING_UPDATES = int(os.environ.get("LIVE_MAX_PENDING_UPDATES", "2"))
+# Retard d'analyse au-delà duquel le hop est étiré, et étirement maximal
+LIVE_TARGET_LAG_MS = float(os.environ.get("LIVE_TARGET_LAG_MS", "500"))
+LIVE_MAX_HOP_FACTOR = int(os.environ.get("LIVE_MAX_HOP_FACTOR", "3"))
+LIVE_SAMPLE_RATE = 16000
+LIVE_HOP_SECONDS = 1.0
+
+# Lissage du retard des lots, et intervalle minimal entre deux changements de hop (s)
+LAG_SMOOTHING = 0.2
+HOP_ADAPT_INTERVAL = 1.0
+# Chunks dont on garde l'heure de réception (~20 s de chunks de 20 ms)
+ARRIVALS_MAXLEN = 1024
+
+PIPELINE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "pipeline"))
+
+
+# =============================================================================
+# Shared-memory ring
+# =============================================================================
+class SharedAudioRing:
+    """
+    Ring buffer float32 en mémoire partagée, un écrivain (event loop) et un
+    lecteur (worker de la session)
+
+    Les positions sont des indices absolus d'échantillons. L'en-tête (int64)
+    contient la tête d'écriture, avancée *avant* la copie : un lecteur qui
+    la relit après sa propre copie sait quels échantillons ont pu être
+    écrasés pendant qu'il lisait.
+    """
+
+    HEADER_BYTES = 8
+
+    def __init__(self, capacity: int, name: Optional[str] = None):
+        self.capacity = capacity
+        self.owner = name is None
+        if self.owner:
+            self.shm = shared_memory.SharedMemory(create=True, size=self.HEADER_BYTES + 4 * capacity)
+        else:
+            # Les workers (spawn) partagent le resource tracker du process
+            # API : le segment reste suivi jusqu'à l'unlink du propriétaire
+            self.shm = shared_memory.SharedMemory(name=name)
+        self._head = np.ndarray((1,), dtype=np.int64, buffer=self.shm.buf, offset=0)
+        self._data = np.ndarray((capacity,), dtype=np.float32, buffer=self.shm.buf, offset=self.HEADER_BYTES)
+        if self.owner:
+            self._head[0] = 0
+
+    @property
+    def name(self) -> str:
+        return self.shm.name
+
+    @property
+    def head(self) -> int:
+        return int(self._head[0])
+
+    def write(self, chunk: np.ndarray) -> int:
+        """Copie `chunk` à la suite et retourne la nouvelle fin (côté event loop)"""
+        chunk = np.asarray(chunk, dtype=np.float32).reshape(-1)
+        end = self.head + chunk.size
+        if chunk.size > self.capacity:
+            chunk = chunk[-self.capacity:]
+        self._head[0] = end
+
+        offset = (end - chunk.size) % self.capacity
+        first = min(chunk.size, self.capacity - offset)
+        self._data[offset:offset + first] = chunk[:first]
+        self._data[:chunk.size - first] = chunk[first:]
+        return end
+
+    def read(self, begin: int, stop: int) -> tuple[np.ndarray, int]:
+        """
+        Copie des échantillons [begin, stop) encore présents (côté worker)
+
+        Returns:
+            (samples, first) : `first` > `begin` quand le début a été écrasé
+            (worker en retard de plus d'une capacité)
+        """
+        first = max(begin, stop - self.capacity)
+        out = np.empty(max(0, stop - first), dtype=np.float32)
+        offset = first % self.capacity
+        head = min(out.size, self.capacity - offset)
+        out[:head] = self._data[offset:offset + head]
+        out[head:] = self._data[:out.size - head]
+
+        # Écrasé pendant la copie : l'écrivain a réservé jusqu'à self.head
+        overwritten = self.head - self.capacity - first
+        if overwritten > 0:
+            return out[overwritten:], first + overwritten
+        return out, first
+
+    def close(self):
+        # Les vues numpy doivent disparaître avant de fermer le segment
+        self._head = self._data = None
+        self.shm.close()
+        if self.owner:
+            self.shm.unlink()
+
+
+# =============================================================================
+# Worker process side
+# =============================================================================
+@dataclass
+class _WorkerSession:
+    analyzer: object
+    ring: SharedAudioRing
+    read_pos: int = 0
+
+
+# Sessions servies par ce processus worker, par clé de session
+_worker_sessions: dict[str, _WorkerSession] = {}
+
+
+def _init_worker():
+    """Initialisation d'un processus worker (imports et compilation JIT une seule fois)"""
+    if PIPELINE_DIR not in sys.path:
+        sys.path.append(PIPELINE_DIR)
+    from prosody_emotion_analyzer import StreamingProsodyAnalyzer
+
+    # ~2 s de compilation numba au premier appel librosa : pas sur le premier lot
+    warm_up = StreamingProsodyAnalyzer(sample_rate=LIVE_SAMPLE_RATE)
+    warm_up.add_audio_chunk(np.zeros(warm_up.window_size, dtype=np.float32))
+
+
+def _ping() -> int:
+    return os.getpid()
+
+
+def _read(
+    key: str, ring_name: str, capacity: int, stop: int, sample_rate: int, hop_duration: float, max_hop_duration: float
+) -> tuple[Optional[_WorkerSession], np.ndarray, int, int]:
+    """
+    Audio de la session arrivé depuis la dernière lecture, jusqu'à `stop`
+
+    Returns:
+        (état de la session, échantillons, échantillons perdus car écrasés
+        dans le ring, échantillons périmés abandonnés) ; état None si la
+        session est déjà fermée côté API
+    """
+    from prosody_emotion_analyzer import StreamingProsodyAnalyzer
+
+    state = _worker_sessions.get(key)
+    if state is None:
+        try:
+            ring = SharedAudioRing(capacity, name=ring_name)
+        except FileNotFoundError:
+            return None, np.empty(0, dtype=np.float32), 0, 0
+        analyzer = StreamingProsodyAnalyzer(sample_rate=sample_rate, max_hop_duration=max_hop_duration)
+        # Ring déjà rempli (worker relancé après un crash) : l'audio écrasé
+        # avant ce worker n'est pas une perte de lecture, on part du plus ancien
+        state = _WorkerSession(analyzer, ring, read_pos=max(0, stop - capacity))
+        _worker_sessions[key] = state
+
+    samples, first = state.ring.read(state.read_pos, stop)
+    dropped = first - state.read_pos
+    state.read_pos = stop
+
+    analyzer = state.analyzer
+    analyzer.set_hop_duration(hop_duration)
+    # Plus d'une fenêtre et un hop de retard : les fenêtres intermédiaires
+    # sont périmées, seule la plus récente est analysée
+    skipped = 0
+    if samples.size > analyzer.window_size + analyzer.hop_size:
+        skipped = samples.size - analyzer.window_size
+        samples = samples[skipped:]
+        analyzer.drop_backlog()
+    return state, samples, dropped, skipped
+
+
+def _analyze(
+    key: str, ring_name: str, capacity: int, stop: int, sample_rate: int, hop_duration: float, max_hop_duration: float
+) -> tuple:
+    """
+    Analyse l'audio de la session arrivé jusqu'à `stop`
+
+    Returns:
+        (analyse ou None, échantillons perdus, échantillons périmés,
+        fin de la fenêtre analysée dans le flux ou None)
+    """
+    state, samples, dropped, skipped = _read(key, ring_name, capacity, stop, sample_rate, hop_duration, max_hop_duration)
+    if state is None:
+        return None, dropped, skipped, None
+    analyzer = state.analyzer
+    analysis = analyzer.add_audio_chunk(samples)
+    if analysis is None:
+        return None, dropped, skipped, None
+    # Position dans le flux = position dans l'analyzer + décalage
+    # (l'analyzer a tout lu jusqu'à `stop`)
+    window_end = stop - (analyzer.buffer.end - analyzer.window_end)
+    return analysis, dropped, skipped, window_end
+
+
+def _run_batch(requests: list[tuple]) -> list:
+    """
+    Exécute un lot de requêtes d'un slot, dans l'ordre
+
+    - `("analyze", key, ring_name, capacity, stop, sample_rate, hop, max_hop)`
+      → résultat de `_analyze`
+    - `("summary" | "reset" | "close", key)` → résultat de l'opération
+    """
+    return [
+        _analyze(*request[1:]) if request[0] == "analyze" else _CONTROL[request[0]](request[1])
+        for request in requests
+    ]
+
+
+def _summary(key: str) -> Optional[dict]:
+    state = _worker_sessions.get(key)
+    return state.analyzer.get_emotion_summary() if state is not None else None
+
+
+def _reset(key: str):
+    state = _worker_sessions.get(key)
+    if state is not None:
+        state.analyzer.reset()
+
+
+def _close(key: str) -> Optional[dict]:
+    """Libère la session dans le worker et retourne son résumé final"""
+    state = _worker_sessions.pop(key, None)
+    if state is None:
+        return None
+    state.ring.close()
+    return state.analyzer.get_emotion_summary()
+
+
+_CONTROL = {"summary": _summary, "reset": _reset, "close": _close}
+
+
+# =============================================================================
+# Pool (API process side)
+# =============================================================================
+@dataclass
+class LiveSession:
+    session_id: str
+    slot: int
+    ring: SharedAudioRing
+    # Messages pas encore envoyés (bornée : les plus anciens cèdent la place)
+    updates: asyncio.Queue
+    key: str = field(default_factory=lambda: uuid.uuid4().hex)
+    # (fin dans le flux, instant de réception) des chunks pas encore analysés
+    arrivals: deque = field(default_factory=lambda: deque(maxlen=ARRIVALS_MAXLEN))
+    chunks: int = 0
+    analyses: int = 0
+    dropped_samples: int = 0
+    skipped_samples: int = 0
+    stale_updates: int = 0
+
+
+@dataclass
+class _Request:
+    """Requête en attente du prochain lot de son slot"""
+    session: LiveSession
+    op: str  # analyze | summary | reset | close
+    stop: int = 0  # analyze : fin de l'audio à analyser
+    future: Optional[asyncio.Future] = None  # opérations de contrôle
+
+
+class _Slot:
+    """Un processus worker, les requêtes qui attendent son prochain lot et sa charge"""
+
+    def __init__(self, executor: ProcessPoolExecutor):
+        self.executor = executor
+        self.requests: list[_Request] = []
+        # Analyse de chaque session encore extensible (pas d'opération après elle)
+        self.analyses: dict[str, _Request] = {}
+        self.waiting_since: Optional[float] = None
+        self.wakeup = asyncio.Event()
+        self.task: Optional[asyncio.Task] = None
+
+        self.lag = 0.0  # retard lissé des lots (s)
+        self.hop_factor = 1
+        self.hop_changed_at = 0.0
+
+
+class LiveAnalysisPool:
+    """
+    Slots de workers d'analyse live (démarrés/arrêtés avec l'app)
+
+    Micro-batching : les chunks reçus sont regroupés par slot pendant
+    `batch_ms` (ou tant que le lot précédent du slot est en cours), puis
+    envoyés au worker en un seul lot. Les chunks d'une même session dans un
+    lot ne font qu'une lecture du ring (`_run_batch`) : un aller-retour
+    inter-processus par lot au lieu d'un par chunk.
+
+    Contre-pression : rien ne s'accumule sans borne quand l'analyse prend
+    du retard
+    - audio : une seule analyse en attente par session, étendue par les
+      chunks suivants ; au-delà d'une fenêtre + un hop de retard, le worker
+      n'analyse que la fenêtre la plus récente
+    - résultats : `max_pending_updates` analyses non envoyées par session,
+      les plus anciennes sont abandonnées
+    - cadence : quand le retard lissé d'un worker dépasse `target_lag_ms`,
+      le hop de ses sessions est étiré (jusqu'à `max_hop_factor` fois),
+      puis ramené quand la charge retombe
+    """
+
+    def __init__(
+        self,
+        workers: int = LIVE_WORKERS,
+        ring_seconds: float = LIVE_RING_SECONDS,
+        sample_rate: int = LIVE_SAMPLE_RATE,
+        batch_ms: float = LIVE_BATCH_MS,
+        max_pending_updates: int = LIVE_MAX_PENDING_UPDATES,
+        target_lag_ms: float = LIVE_TARGET_LAG_MS,
+        max_hop_factor: int = LIVE_MAX_HOP_FACTOR,
+    ):
+        self.workers = workers
+        self.sample_rate = sample_rate
+        self.ring_capacity = int(ring_seconds * sample_rate)
+        self.batch_window = batch_ms / 1000
+        self.max_pending_updates = max_pending_updates
+        self.target_lag = target_lag_ms / 1000
+        self.max_hop_factor = max(1, max_hop_factor)
+
+        self._slots: list[_Slot] = []
+        self._sessions: dict[str, LiveSession] = {}
+
+        self.opened = 0
+        self.chunks = 0
+        self.batches = 0
+        self.batched_sessions = 0
+        self.dropped_samples = 0
+        self.skipped_samples = 0
+        self.stale_updates = 0
+        self.restarts = 0
+        self.lost_analyses = 0
+        self.reset_sessions = 0
+
+    async def start(self):
+        if self._slots:
+            return
+        self._slots = [_Slot(self._spawn()) for _ in range(self.workers)]
+
+        # Lance les processus et leurs imports (librosa) avant le premier client
+        loop = asyncio.get_running_loop()
+        results = await asyncio.gather(
+            *(loop.run_in_executor(slot.executor, _ping) for slot in self._slots), return_exceptions=True
+        )
+        failed = [r for r in results if isinstance(r, Exception)]
+        if failed:
+            logger.warning(f"⚠️ Live analysis workers failed to start: {failed[0]}")
+
+        for slot in self._slots:
+            slot.task = asyncio.create_task(self._dispatch(slot))
+        logger.info(
+            f"🎙️ Live analysis pool started ({self.workers} worker processes, "
+            f"{self.ring_capacity} samples per ring, {self.batch_window * 1000:.0f}ms batches)"
+        )
+
+    async def stop(self):
+        for slot in self._slots:
+            slot.task.cancel()
+        await asyncio.gather(*(slot.task for slot in self._slots), return_exceptions=True)
+        for session in list(self._sessions.values()):
+            self._release(session)
+        for slot in self._slots:
+            for request in slot.requests:
+                if request.future is not None:
+                    request.future.cancel()
+            slot.executor.shutdown(wait=False, cancel_futures=True)
+        self._slots = []
+
+    def _spawn(self) -> ProcessPoolExecutor:
+        return ProcessPoolExecutor(
+            max_workers=1, mp_context=multiprocessing.get_context("spawn"), initializer=_init_worker
+        )
+
+    def _args(self, request: _Request, hop: float) -> tuple:
+        if request.op != "analyze":
+            return (request.op, request.session.key)
+        return (
+            "analyze", request.session.key, request.session.ring.name, self.ring_capacity,
+            request.stop, self.sample_rate, hop, LIVE_HOP_SECONDS * self.max_hop_factor,
+        )
+
+    async def _dispatch(self, slot: _Slot):
+        """Envoie les requêtes du slot au worker, un lot à la fois (ordre conservé)"""
+        loop = asyncio.get_running_loop()
+        while True:
+            await slot.wakeup.wait()
+            # Laisse arriver les chunks des autres sessions du slot
+            await asyncio.sleep(self.batch_window)
+            slot.wakeup.clear()
+            requests, slot.requests, slot.analyses = slot.requests, [], {}
+            waiting_since, slot.waiting_since = slot.waiting_since, None
+
+            hop = LIVE_HOP_SECONDS * slot.hop_factor
+            self.batches += 1
+            self.batched_sessions += len(requests)
+            try:
+                results = await loop.run_in_executor(
+                    slot.executor, _run_batch, [self._args(r, hop) for r in requests]
+                )
+            except BrokenProcessPool as e:
+                # Worker mort (OOM...) : nouveau processus, les sessions du slot repartent de zéro
+                index = self._slots.index(slot)
+                logger.warning(f"⚠️ Live analysis worker {index} died, restarting it")
+                slot.executor = self._spawn()
+                self.restarts += 1
+                self._fail(requests, e)
+                self._lost(requests)
+                for session in self._sessions.values():
+                    if session.slot == index:
+                        self._notify(session, "analysis_reset", "worker_restarted")
+                        self.reset_sessions += 1
+                continue
+            except Exception as e:
+                logger.error(f"❌ Live analysis batch failed: {e}", exc_info=True)
+                self._fail(requests, e)
+                for session in self._lost(requests):
+                    self._notify(session, "analysis_error", str(e))
+                continue
+
+            self._adapt(slot, time.monotonic() - waiting_since)
+            for request, result in zip(requests, results):
+                if request.op == "analyze":
+                    self._analyzed(request.session, hop, *result)
+                elif not request.future.done():
+                    request.future.set_result(result)
+
+    def _adapt(self, slot: _Slot, lag: float):
+        """Étire ou resserre le hop des sessions du slot selon son retard lissé"""
+        slot.lag += LAG_SMOOTHING * (lag - slot.lag)
+        now = time.monotonic()
+        if now - slot.hop_changed_at < HOP_ADAPT_INTERVAL:
+            return
+        if slot.lag > self.target_lag and slot.hop_factor < self.max_hop_factor:
+            slot.hop_factor += 1
+        elif slot.lag < self.target_lag / 4 and slot.hop_factor > 1:
+            slot.hop_factor -= 1
+        else:
+            return
+        slot.hop_changed_at = now
+        logger.info(
+            f"🎚️ Live analysis worker {self._slots.index(slot)}: lag {slot.lag * 1000:.0f}ms, "
+            f"hop now {LIVE_HOP_SECONDS * slot.hop_factor:.0f}s"
+        )
+
+    def _analyzed(
+        self, session: LiveSession, hop: float,
+        analysis: Optional[dict], dropped: int, skipped: int, window_end: Optional[int],
+    ):
+        if dropped:
+            session.dropped_samples += dropped
+            self.dropped_samples += dropped
+            logger.warning(f"⚠️ Live session {session.session_id}: worker behind, {dropped} samples overwritten")
+        if skipped:
+            session.skipped_samples += skipped
+            self.skipped_samples += skipped
+        if analysis is None:
+            return
+        session.analyses += 1
+
+        # Réception du chunk qui a complété la fenêtre analysée
+        arrivals = session.arrivals
+        received_at = time.monotonic()
+        while arrivals and arrivals[0][0] < window_end:
+            received_at = arrivals.popleft()[1]
+        if arrivals:
+            received_at = arrivals[0][1]
+
+        self._deliver(session, ("emotion_update", analysis, received_at, hop))
+
+    def _deliver(self, session: LiveSession, message: tuple):
+        """Met un message (type, contenu, réception, hop) dans la file bornée de la session"""
+        if session.updates.full():
+            # Client en retard : le message le plus ancien est périmé
+            if session.updates.get_nowait()[0] == "emotion_update":
+                session.stale_updates += 1
+                self.stale_updates += 1
+        session.updates.put_nowait(message)
+
+    def _notify(self, session: LiveSession, kind: str, reason: str):
+        """Prévient le client que des analyses de sa session ont été perdues"""
+        self._deliver(session, (kind, {"reason": reason}, time.monotonic(), None))
+
+    @staticmethod
+    def _fail(requests: list[_Request], error: Exception):
+        for request in requests:
+            if request.future is not None and not request.future.done():
+                request.future.set_exception(error)
+
+    def _lost(self, requests: list[_Request]) -> list[LiveSession]:
+        """Compte les analyses d'un lot perdu, retourne leurs sessions"""
+        lost = [request.session for request in requests if request.op == "analyze"]
+        self.lost_analyses += len(lost)
+        return lost
+
+    def _enqueue(self, request: _Request):
+        slot = self._slots[request.session.slot]
+        if slot.waiting_since is None:
+            slot.waiting_since = time.monotonic()
+        slot.requests.append(request)
+        slot.wakeup.set()
+
+    async def _control(self, session: LiveSession, op: str):
+        """Opération sur l'analyzer de la session, après les chunks déjà reçus"""
+        if not self._slots:
+            raise RuntimeError("Live analysis pool is not started")
+        # Les chunks suivants ne doivent pas être fusionnés avec l'analyse
+        # d'avant cette opération
+        self._slots[session.slot].analyses.pop(session.key, None)
+        future = asyncio.get_running_loop().create_future()
+        self._enqueue(_Request(session, op, future=future))
+        return await future
+
+    def open(self, session_id: str) -> LiveSession:
+        """Ouvre une session sur le slot le moins chargé"""
+        if not self._slots:
+            raise RuntimeError("Live analysis pool is not started")
+        load = [0] * self.workers
+        for session in self._sessions.values():
+            load[session.slot] += 1
+        slot = load.index(min(load))
+
+        session = LiveSession(
+            session_id=session_id,
+            slot=slot,
+            ring=SharedAudioRing(self.ring_capacity),
+            updates=asyncio.Queue(maxsize=self.max_pending_updates),
+        )
+        self._sessions[session.key] = session
+        self.opened += 1
+        return session
+
+    def submit(self, session: LiveSession, chunk: np.ndarray):
+        """
+        Copie le chunk dans le ring de la session et planifie son analyse
+
+        Non bloquant. Les analyses produites arrivent dans l'ordre via
+        `next_update` ; si la session a déjà une analyse en attente du
+        prochain lot, elle est simplement étendue à ce chunk.
+        """
+        stop = session.ring.write(chunk)
+        session.arrivals.append((stop, time.monotonic()))
+        session.chunks += 1
+        self.chunks += 1
+
+        slot = self._slots[session.slot]
+        request = slot.analyses.get(session.key)
+        if request is not None:
+            request.stop = stop
+            return
+        request = _Request(session, "analyze", stop=stop)
+        slot.analyses[session.key] = request
+        self._enqueue(request)
+
+    async def next_update(self, session: LiveSession) -> dict:
+        """
+        Prochain message pour le client de la session
+
+        - `emotion_update` : analyse, avec `lag_ms` (réception du chunk qui a
+          complété la fenêtre → maintenant) et `hop_sec` (cadence courante)
+        - `analysis_reset` : worker relancé, l'état de l'analyse est perdu
+          (prochaine analyse après une fenêtre complète)
+        - `analysis_error` : un lot a échoué, des analyses manquent
+        """
+        kind, content, received_at, hop = await session.updates.get()
+        if kind != "emotion_update":
+            return {"type": kind, **content}
+        return {
+            "type": kind, **content,
+            "lag_ms": round((time.monotonic() - received_at) * 1000), "hop_sec": hop,
+        }
+
+    async def summary(self, session: LiveSession) -> dict:
+        return await self._control(session, "summary") or {}
+
+    async def reset(self, session: LiveSession):
+        await self._control(session, "reset")
+
+    async def close(self, session: LiveSession) -> dict:
+        """Ferme la session : résumé final, libération du worker puis du ring"""
+        try:
+            return await self._control(session, "close") or {}
+        finally:
+            self._release(session)
+
+    def _release(self, session: LiveSession):
+        if self._sessions.pop(session.key, None) is not None:
+            session.ring.close()
+
+    def stats(self) -> dict:
+        load = [0] * self.workers
+        for session in self._sessions.values():
+            load[session.slot] += 1
+        return {
+            "workers": self.workers,
+            "sessions": len(self._sessions),
+            "sessions_per_worker": load,
+            "lag_ms_per_worker": [round(slot.lag * 1000) for slot in self._slots],
+            "hop_sec_per_worker": [LIVE_HOP_SECONDS * slot.hop_factor for slot in self._slots],
+            "opened": self.opened,
+            "chunks": self.chunks,
+            "batches": self.batches,
+            "avg_batch_size": round(self.batched_sessions / self.batches, 1) if self.batches else 0.0,
+            "dropped_samples": self.dropped_samples,
+            "skipped_samples": self.skipped_samples,
+            "stale_updates": self.stale_updates,
+            "restarts": self.restarts,
+            "lost_analyses": self.lost_analyses,
+            "reset_sessions": self.reset_sessions,
+        }
+
+
+# Instance unique pour le process
+live_pool = LiveAnalysisPool()
@@ -11,6 +11,10 @@ import logging
 import os
 
 from api.routers import health, upload, sessions, reports, orchestration, live_prosody
+from api.clients import registry
+from api.jobs import job_queue
+from api.live_analysis import live_pool
+from api import gcs
 
 # =============================================================================
 # Configuration
@@ -104,6 +108,18 @@ async def startup_event():
     logger.info(f"📍 Project: {PROJECT_ID}")
     logger.info(f"🌍 Region: {REGION}")
     logger.info(f"📚 Docs: http://localhost:8080/docs")
+    await job_queue.start()
+    await live_pool.start()
+
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Stop ingest and live analysis workers, then close shared GCP client connections and the storage I/O pool"""
+    await job_queue.stop()
+    await live_pool.stop()
+    gcs.shutdown()
+    registry.close()
+    logger.info("👋 Mental Journal API stopped")
 
 # =============================================================================
 # Root Endpoint
@@ -0,0 +1,150 @@
+"""
+Week Purges
+Suppression des données d'une semaine, synchrone ou en tâche de fond
+
+Les trois buckets (audio brut, analytics, rapports) sont purgés en
+parallèle, par requêtes batch de `GCS_BATCH_SIZE` objets. En mode
+background, la progression est consultable via `GET /v1/purges/{purge_id}`.
+"""
+
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from datetime import datetime
+from google.cloud import storage
+import asyncio
+import logging
+import os
+import uuid
+
+from api.cache import response_cache
+from api import gcs
+
+logger = logging.getLogger(__name__)
+
+BUCKET_RAW = os.environ.get("BUCKET_RAW", "pz-audio-raw-build-unicorn25par-4813")
+BUCKET_ANALYTICS = os.environ.get("BUCKET_ANALYTICS", "pz-analytics-build-unicorn25par-4813")
+BUCKET_REPORTS = os.environ.get("BUCKET_REPORTS", "pz-reports-build-unicorn25par-4813")
+
+# Nombre de purges conservées pour consultation (les plus anciennes sont oubliées)
+PURGE_HISTORY_SIZE = int(os.environ.get("PURGE_HISTORY_SIZE", "100"))
+
+
+@dataclass
+class BucketProgress:
+    listed: int = 0
+    deleted: int = 0
+    failed: int = 0
+    done: bool = False
+
+
+@dataclass
+class Purge:
+    week: str
+    purge_id: str = field(default_factory=lambda: uuid.uuid4().hex[:12])
+    status: str = "pending"  # pending → running → done | failed
+    buckets: dict = field(default_factory=dict)
+    error: str | None = None
+    started_at: str | None = None
+    finished_at: str | None = None
+
+    @property
+    def deleted(self) -> int:
+        return sum(b.deleted for b in self.buckets.values())
+
+    @property
+    def failed(self) -> int:
+        return sum(b.failed for b in self.buckets.values())
+
+    def to_dict(self) -> dict:
+        listed = sum(b.listed for b in self.buckets.values())
+        return {
+            "purge_id": self.purge_id,
+            "week": self.week,
+            "status": self.status,
+            "deleted": self.deleted,
+            "failed": self.failed,
+            "listed": listed,
+            "progress": round((self.deleted + self.failed) / listed, 3) if listed else (1.0 if self.status == "done" else 0.0),
+            "buckets": {name: vars(b) for name, b in self.buckets.items()},
+            "error": self.error,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+        }
+
+
+class PurgeRegistry:
+    """Purges récentes de l'instance (en mémoire, bornées à `PURGE_HISTORY_SIZE`)"""
+
+    def __init__(self, max_entries: int = PURGE_HISTORY_SIZE):
+        self.max_entries = max_entries
+        self._purges: "OrderedDict[str, Purge]" = OrderedDict()
+        # Références fortes sur les tasks en cours (sinon collectables par le GC)
+        self._tasks: set[asyncio.Task] = set()
+
+    def get(self, purge_id: str) -> Purge | None:
+        return self._purges.get(purge_id)
+
+    def add(self, purge: Purge):
+        self._purges[purge.purge_id] = purge
+        while len(self._purges) > self.max_entries:
+            self._purges.popitem(last=False)
+
+    def start(self, storage_client: storage.Client, week: str) -> Purge:
+        """Lance la purge en tâche de fond et rend la main immédiatement"""
+        purge = Purge(week=week)
+        self.add(purge)
+        task = asyncio.create_task(purge_week(storage_client, purge))
+        self._tasks.add(task)
+        task.add_done_callback(self._forget)
+        return purge
+
+    def _forget(self, task: asyncio.Task):
+        self._tasks.discard(task)
+        # L'erreur est déjà loggée et exposée dans `Purge.error`
+        if not task.cancelled():
+            task.exception()
+
+
+# Instance unique pour le process
+purges = PurgeRegistry()
+
+
+async def _purge_bucket(storage_client: storage.Client, bucket_name: str, week: str, progress: BucketProgress):
+    bucket = storage_client.bucket(bucket_name)
+    blobs = await gcs.list_blobs(bucket, prefix=f"{week}/")
+    progress.listed = len(blobs)
+
+    def on_progress(ok: int, ko: int):
+        progress.deleted += ok
+        progress.failed += ko
+
+    await gcs.delete_blobs(storage_client, blobs, on_progress=on_progress)
+    progress.done = True
+
+
+async def purge_week(storage_client: storage.Client, purge: Purge) -> Purge:
+    """Purge les trois buckets en parallèle en mettant à jour `purge` au fil de l'eau"""
+    purge.status = "running"
+    purge.started_at = datetime.utcnow().isoformat() + "Z"
+    purge.buckets = {
+        name: BucketProgress() for name in (BUCKET_RAW, BUCKET_ANALYTICS, BUCKET_REPORTS)
+    }
+
+    try:
+        await asyncio.gather(*[
+            _purge_bucket(storage_client, name, purge.week, progress)
+            for name, progress in purge.buckets.items()
+        ])
+        purge.status = "done"
+        logger.info(f"🗑️ Week {purge.week} purged: {purge.deleted} deleted, {purge.failed} failed")
+    except Exception as e:
+        purge.status = "failed"
+        purge.error = str(e)
+        logger.error(f"❌ Purge of week {purge.week} failed: {e}", exc_info=True)
+        raise
+    finally:
+        purge.finished_at = datetime.utcnow().isoformat() + "Z"
+        # Drop cached responses that may reference this week
+        response_cache.invalidate()
+
+    return purge
@@ -7,6 +7,11 @@ from fastapi import APIRouter
 import os
 from datetime import datetime
 
+from api.cache import response_cache
+from api.singleflight import request_coalescer
+from api.jobs import job_queue
+from api.live_analysis import live_pool
+
 router = APIRouter()
 
 PROJECT_ID = os.environ.get("PROJECT_ID", "build-unicorn25par-4813")
@@ -43,6 +48,43 @@ async def healthz():
         "status": "healthy",
         "service": "pizza-api",
     }
+
+
+@router.get("/stats")
+async def get_stats():
+    """
+    **Métriques internes de l'instance**
+    
+    - `response_cache`: hits / revalidations / misses / 304 du cache de réponses
+    - `coalescing`: requêtes identiques concurrentes fusionnées (single-flight)
+    - `jobs`: file de traitement des sessions (en attente, en cours, dédupliqués)
+    - `live`: workers d'analyse prosodique live (sessions, retard et hop par worker, taille moyenne des lots, audio et analyses abandonnés, analyses perdues sur crash de worker)
+    
+    **Exemple de réponse:**
+    ```json
+    {
+      "response_cache": {"entries": 12, "hits": 340, "revalidated": 25, "misses": 12, "not_modified": 290},
+      "coalescing": {
+        "calls": 380,
+        "backend_fetches": 41,
+        "coalesced": 339,
+        "coalesced_ratio": 0.892,
+        "in_flight": 0,
+        "coalesced_by_route": {"/v1/weeks/2025-W42/report": 310}
+      },
+      "jobs": {"workers": 2, "store": "MemoryJobStore", "queued": 3, "running": 2, "submitted": 18, "deduplicated": 4, "succeeded": 13, "failed": 0},
+      "live": {"workers": 3, "sessions": 5, "sessions_per_worker": [2, 2, 1], "lag_ms_per_worker": [12, 9, 7], "hop_sec_per_worker": [1.0, 1.0, 1.0], "opened": 41, "chunks": 12000, "batches": 2400, "avg_batch_size": 2.5, "dropped_samples": 0, "skipped_samples": 0, "stale_updates": 0, "restarts": 0, "lost_analyses": 0, "reset_sessions": 0}
+    }
+    ```
+    """
+    return {
+        "response_cache": response_cache.stats(),
+        "coalescing": request_coalescer.stats(),
+        "jobs": job_queue.stats(),
+        "live": live_pool.stats(),
+    }
+
+
 @router.get("/config")
 async def get_config():
     """
@@ -1,26 +1,50 @@
 """
 Live Prosody Analysis WebSocket Endpoint
 Pour l'intégration avec Gemini Live API en temps réel
+
+L'analyse tourne dans les processus de `api.live_analysis` : le handler ne
+fait que recevoir les chunks, les copier dans le ring partagé de la session
+et renvoyer les résultats au fil de l'eau.
 """
 
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect
-from typing import Dict
+from typing import Dict, Optional
 import numpy as np
+import asyncio
 import json
 import base64
 import logging
 
-# Import le module d'analyse prosodique
-import sys
-import os
-sys.path.append(os.path.join(os.path.dirname(__file__), '../../pipeline'))
-from prosody_emotion_analyzer import StreamingProsodyAnalyzer
+from api.live_analysis import LiveSession, live_pool
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
 
-# Store active analyzers per session
-active_sessions: Dict[str, StreamingProsodyAnalyzer] = {}
+# Sessions live actives (WebSocket ouvert) sur cette instance
+active_sessions: Dict[str, LiveSession] = {}
+
+
+def _decode_audio(data: dict) -> Optional[np.ndarray]:
+    """Chunk float32 d'un message WebSocket (JSON base64 ou binaire brut)"""
+    if data.get("text") is not None:
+        message = json.loads(data["text"])
+        if "audio" not in message:
+            return None
+        return np.frombuffer(base64.b64decode(message["audio"]), dtype=np.float32)
+    if data.get("bytes") is not None:
+        return np.frombuffer(data["bytes"], dtype=np.float32)
+    return None
+
+
+async def _send_updates(websocket: WebSocket, session: LiveSession):
+    """Renvoie les analyses (et pertes d'analyse) de la session à mesure qu'elles arrivent"""
+    while True:
+        update = await live_pool.next_update(session)
+        await websocket.send_json({
+            "type": update["type"],
+            "session_id": session.session_id,
+            **update
+        })
 
 
 @router.websocket("/ws/prosody/{session_id}")
@@ -43,69 +67,67 @@ async def websocket_prosody_endpoint(websocket: WebSocket, session_id: str):
         "dominant_emotion": "stress",
         "confidence": 0.85,
         "top_emotions": [...],
-        "vocal_characteristics": {...}
+        "vocal_characteristics": {...},
+        "lag_ms": 42,     // réception du chunk qui complète la fenêtre → envoi
+        "hop_sec": 1.0    // cadence courante (étirée si l'instance sature)
+    }
+    
+    Client lent ou instance saturée : les analyses en retard sont abandonnées
+    au profit des plus récentes (voir `LiveAnalysisPool`)
+    
+    Analyses perdues (le WebSocket reste ouvert):
+    {
+        "type": "analysis_reset",   // worker relancé : état de l'analyse perdu
+        "reason": "worker_restarted"
+    }
+    {
+        "type": "analysis_error",   // lot d'analyse en échec
+        "reason": "..."
     }
     """
     await websocket.accept()
     logger.info(f"🎙️ WebSocket connection established for session {session_id}")
     
-    # Create analyzer for this session
-    analyzer = StreamingProsodyAnalyzer(sample_rate=16000)
-    active_sessions[session_id] = analyzer
+    # Session attachée à un worker d'analyse
+    session = live_pool.open(session_id)
+    active_sessions[session_id] = session
+    sender = asyncio.create_task(_send_updates(websocket, session))
     
     try:
         while True:
             # Receive audio chunk
             data = await websocket.receive()
+            if data["type"] == "websocket.disconnect":
+                raise WebSocketDisconnect(data.get("code", 1000))
             
-            # Handle text (JSON) messages
-            if "text" in data:
-                message = json.loads(data["text"])
-                
-                # Decode base64 audio if present
-                if "audio" in message:
-                    audio_bytes = base64.b64decode(message["audio"])
-                    audio_array = np.frombuffer(audio_bytes, dtype=np.float32)
-                    
-                    # Process the chunk
-                    result = analyzer.process_chunk(audio_array)
-                    
-                    # Send result if available (every 2 seconds)
-                    if result:
-                        await websocket.send_json({
-                            "type": "emotion_update",
-                            "session_id": session_id,
-                            **result
-                        })
+            audio_array = _decode_audio(data)
+            if audio_array is not None and audio_array.size:
+                # Copie dans le ring partagé ; l'analyse se fait dans le worker
+                live_pool.submit(session, audio_array)
             
-            # Handle binary messages (raw audio bytes)
-            elif "bytes" in data:
-                audio_array = np.frombuffer(data["bytes"], dtype=np.float32)
-                
-                # Process the chunk
-                result = analyzer.process_chunk(audio_array)
-                
-                # Send result if available
-                if result:
-                    await websocket.send_json({
-                        "type": "emotion_update",
-                        "session_id": session_id,
-                        **result
-                    })
+            if sender.done():
+                # Envoi impossible (client parti, erreur d'analyse)
+                sender.result()
+                break
     
     except WebSocketDisconnect:
         logger.info(f"🔌 WebSocket disconnected for session {session_id}")
-        # Get final summary
-        if session_id in active_sessions:
-            summary = active_sessions[session_id].get_emotion_summary()
-            logger.info(f"📊 Session summary: {summary}")
-            del active_sessions[session_id]
     
     except Exception as e:
         logger.error(f"❌ WebSocket error for session {session_id}: {e}")
-        if session_id in active_sessions:
+        try:
+            await websocket.close(code=1011, reason=str(e))
+        except RuntimeError:
+            pass  # déjà fermé
+    
+    finally:
+        # Nettoyage avant tout await (le handler peut être annulé ici)
+        if active_sessions.get(session_id) is session:
             del active_sessions[session_id]
-        await websocket.close(code=1011, reason=str(e))
+        sender.cancel()
+        # Get final summary
+        summary = await live_pool.close(session)
+        logger.info(f"📊 Session summary: {summary}")
 
 
 @router.get("/prosody/session/{session_id}/summary")
@@ -132,8 +154,7 @@ async def get_session_summary(session_id: str):
             "session_id": session_id
         }
     
-    analyzer = active_sessions[session_id]
-    summary = analyzer.get_emotion_summary()
+    summary = await live_pool.summary(active_sessions[session_id])
     
     return {
         "session_id": session_id,
@@ -146,12 +167,16 @@ async def reset_session(session_id: str):
     """
     Réinitialise l'analyzer pour une session
     Utile pour démarrer une nouvelle conversation
+    
+    Appliqué dans l'ordre du flux : les chunks déjà reçus sont analysés avant
     """
-    if session_id in active_sessions:
-        del active_sessions[session_id]
+    if session_id not in active_sessions:
+        return {
+            "error": "Session not found or not active",
+            "session_id": session_id
+        }
     
-    # Create new analyzer
-    active_sessions[session_id] = StreamingProsodyAnalyzer(sample_rate=16000)
+    await live_pool.reset(active_sessions[session_id])
     
     return {
         "message": "Session reset successfully",
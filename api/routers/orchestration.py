@@ -3,12 +3,20 @@ Orchestration Routes
 Déclenchement du pipeline hebdomadaire et par session
 """
 
-from fastapi import APIRouter, HTTPException, BackgroundTasks
+from fastapi import APIRouter, HTTPException, BackgroundTasks, Depends
+from fastapi.responses import JSONResponse
 from pydantic import BaseModel
-from google.cloud import run_v2, logging as cloud_logging
+from google.cloud import run_v2, storage, logging as cloud_logging
 import os
 import json
 
+from api.clients import (
+    get_storage_client, get_jobs_client, get_executions_client, get_logging_client,
+)
+from api.ingest import BUCKET_RAW, audio_path
+from api.jobs import PRIORITY_REPROCESS, job_queue
+from api import gcs
+
 router = APIRouter()
 
 from datetime import datetime, timezone
@@ -32,7 +40,10 @@ class RunWeekResponse(BaseModel):
 
 
 @router.post("/run-week", response_model=RunWeekResponse)
-async def run_week(request: RunWeekRequest):
+async def run_week(
+    request: RunWeekRequest,
+    client: run_v2.JobsClient = Depends(get_jobs_client),
+):
     """
     **Exécute la fusion hebdomadaire**
     
@@ -88,14 +99,13 @@ async def run_week(request: RunWeekRequest):
     - Invalider le cache TanStack Query quand terminé
     """
     try:
-        client = run_v2.JobsClient()
-        
         # Create execution request
         request_obj = run_v2.RunJobRequest(
             name=JOB_NAME,
             overrides={
                 "container_overrides": [{
-                    "args": [request.week]
+                    # Fusion only: sessions are processed by /v1/ingest/finish
+                    "args": [request.week, "--fuse-only"]
                 }]
             }
         )
@@ -127,7 +137,10 @@ class RunSessionRequest(BaseModel):
 
 
 @router.post("/run-session")
-async def run_session(request: RunSessionRequest):
+async def run_session(
+    request: RunSessionRequest,
+    storage_client: storage.Client = Depends(get_storage_client),
+):
     """
     **Retraite une session spécifique**
     
@@ -159,17 +172,93 @@ async def run_session(request: RunSessionRequest):
     </Button>
     ```
     
-    **Note:** Cette route appelle `/v1/ingest/finish` en interne.
-    C'est un alias pour plus de clarté sémantique.
+    **Note:** Même traitement que `/v1/ingest/finish`, soumis en priorité
+    batch : les ingests interactifs en attente passent devant. Suivre le job
+    via `GET /v1/jobs/{job_id}`.
+    """
+    bucket = storage_client.bucket(BUCKET_RAW)
+    if await gcs.get_blob(bucket, audio_path(request.week, request.session_id)) is None:
+        raise HTTPException(
+            status_code=404,
+            detail=f"Audio file not found: gs://{BUCKET_RAW}/{audio_path(request.week, request.session_id)}"
+        )
+    
+    job, created = await job_queue.submit(
+        request.week, request.session_id, kind="reprocess", priority=PRIORITY_REPROCESS
+    )
+    
+    return JSONResponse(
+        status_code=202,
+        content={
+            "job_id": job.job_id,
+            "session_id": request.session_id,
+            "week": request.week,
+            "status": job.status,
+            "deduplicated": not created,
+            "status_url": f"/v1/jobs/{job.job_id}",
+        },
+    )
+
+
+@router.get("/jobs/{job_id}")
+async def get_job_status(job_id: str):
+    """
+    **Statut d'un job de traitement de session**
+    
+    Renvoie l'étape en cours (`stt`, `prosody`, `nlu`, `aggregate`), la durée de chaque
+    étape et, une fois terminé, les chemins des artefacts produits.
+    `status` vaut `queued`, `running`, `succeeded` ou `failed`.
+    
+    **Exemple de réponse:**
+    ```json
+    {
+      "job_id": "9b1f3c0e4a5d4e21",
+      "week": "2025-W42",
+      "session_id": "session_001",
+      "kind": "ingest",
+      "priority": 0,
+      "status": "succeeded",
+      "stage": "nlu",
+      "stages": {
+        "stt": {"started_at": "2025-10-19T10:30:01Z", "duration_ms": 41250},
+        "prosody": {"started_at": "2025-10-19T10:30:42Z", "duration_ms": 3120},
+        "nlu": {"started_at": "2025-10-19T10:30:45Z", "duration_ms": 8740},
+        "aggregate": {"started_at": "2025-10-19T10:30:54Z", "duration_ms": 180}
+      },
+      "artifacts": {
+        "transcript": "gs://pz-analytics-build-unicorn25par-4813/2025-W42/session_001/transcript.json",
+        "prosody": "gs://pz-analytics-build-unicorn25par-4813/2025-W42/session_001/prosody_features.json",
+        "nlu": "gs://pz-analytics-build-unicorn25par-4813/2025-W42/session_001/events_emotions.json",
+        "audio_uri": "gs://pz-audio-raw-build-unicorn25par-4813/2025-W42/session_001.wav"
+      },
+      "error": null,
+      "submissions": 1,
+      "created_at": "2025-10-19T10:30:00Z",
+      "started_at": "2025-10-19T10:30:01Z",
+      "finished_at": "2025-10-19T10:30:54Z",
+      "duration_ms": 53110
+    }
+    ```
+    
+    **Cas d'usage frontend:**
+    ```typescript
+    const { data: job } = useQuery({
+      queryKey: ['job', jobId],
+      queryFn: () => fetch(`/v1/jobs/${jobId}`).then(r => r.json()),
+      refetchInterval: (job) => ['queued', 'running'].includes(job?.status) ? 2000 : false
+    });
+    
+    useEffect(() => {
+      if (job?.status === 'succeeded') {
+        queryClient.invalidateQueries(['sessions', job.week]);
+      }
+    }, [job?.status]);
+    ```
     """
-    # Import the ingest_finish function
-    from api.routers.upload import ingest_finish, IngestFinishRequest
-    
-    # Call ingest_finish
-    return await ingest_finish(IngestFinishRequest(
-        week=request.week,
-        session_id=request.session_id
-    ))
+    job = await job_queue.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Job {job_id} not found")
+    return job.to_dict()
 
 
 class ExecutionStatusResponse(BaseModel):
@@ -182,7 +271,10 @@ class ExecutionStatusResponse(BaseModel):
 
 
 @router.get("/pipeline/status/{execution_id}", response_model=ExecutionStatusResponse)
-async def get_execution_status(execution_id: str):
+async def get_execution_status(
+    execution_id: str,
+    client: run_v2.ExecutionsClient = Depends(get_executions_client),
+):
     """
     **Récupère le statut d'une exécution de pipeline**
     
@@ -231,7 +323,6 @@ async def get_execution_status(execution_id: str):
     ```
     """
     try:
-        client = run_v2.ExecutionsClient()
         execution = client.get_execution(name=execution_id)
         
         # Extract status
@@ -265,7 +356,10 @@ class PipelineLogsRequest(BaseModel):
 
 
 @router.post("/pipeline/logs")
-async def get_pipeline_logs(request: PipelineLogsRequest):
+async def get_pipeline_logs(
+    request: PipelineLogsRequest,
+    logging_client: cloud_logging.Client = Depends(get_logging_client),
+):
     """
     **Récupère les logs du pipeline**
     
@@ -321,8 +415,6 @@ async def get_pipeline_logs(request: PipelineLogsRequest):
     );
     ```
     """
-    logging_client = cloud_logging.Client()
-    
     # Build filter
     filter_parts = [
         'resource.type="cloud_run_job"',
@@ -3,13 +3,18 @@ Reports Routes
 Récupération des rapports hebdomadaires (JSON et PDF)
 """
 
-from fastapi import APIRouter, HTTPException
-from fastapi.responses import StreamingResponse
+from fastapi import APIRouter, HTTPException, Depends, Request
 from google.cloud import storage
 from datetime import timedelta
-import json
+import asyncio
 import os
 
+from api.clients import get_storage_client
+from api.cache import cached_response, cache_key, fingerprint
+from api.singleflight import request_coalescer
+from api.streaming import stream_blob
+from api import gcs
+
 router = APIRouter()
 
 BUCKET_REPORTS = os.environ.get("BUCKET_REPORTS", "pz-reports-build-unicorn25par-4813")
@@ -17,7 +22,7 @@ BUCKET_ANALYTICS = os.environ.get("BUCKET_ANALYTICS", "pz-analytics-build-unicor
 
 
 @router.get("/weeks/{week}/report")
-async def get_weekly_report(week: str):
+async def get_weekly_report(week: str, request: Request, storage_client: storage.Client = Depends(get_storage_client)):
     """
     **Récupère le rapport hebdomadaire (JSON)**
     
@@ -63,33 +68,38 @@ async def get_weekly_report(week: str):
     );
     ```
     """
-    storage_client = storage.Client()
-    
-    # Try reports bucket first
-    bucket = storage_client.bucket(BUCKET_REPORTS)
-    blob = bucket.blob(f"{week}/weekly_report.json")
-    
-    # Fallback to analytics bucket
-    if not blob.exists():
-        bucket = storage_client.bucket(BUCKET_ANALYTICS)
-        blob = bucket.blob(f"{week}/weekly_report.json")
-    
-    if not blob.exists():
-        raise HTTPException(
-            status_code=404,
-            detail=f"Report not found for week {week}. Run /v1/run-week first."
+    # Reports bucket first, analytics bucket as fallback
+    # (metadata only, both buckets concurrently — no download on cache hit)
+    async def revalidate():
+        blob_reports, blob_analytics = await asyncio.gather(
+            gcs.get_blob(storage_client.bucket(BUCKET_REPORTS), f"{week}/weekly_report.json"),
+            gcs.get_blob(storage_client.bucket(BUCKET_ANALYTICS), f"{week}/weekly_report.json"),
         )
+        blob = blob_reports or blob_analytics
+        
+        if blob is None:
+            raise HTTPException(
+                status_code=404,
+                detail=f"Report not found for week {week}. Run /v1/run-week first."
+            )
+        
+        validation = fingerprint([blob])
+        validation.context = blob
+        return validation
     
-    report_data = json.loads(blob.download_as_text())
-    return report_data
+    async def build(validation):
+        return await gcs.download_json(validation.context)
+    
+    return await cached_response(request, revalidate, build)
 
 
 @router.get("/weeks/{week}/report/pdf")
-async def get_weekly_pdf(week: str):
+async def get_weekly_pdf(week: str, request: Request, storage_client: storage.Client = Depends(get_storage_client)):
     """
     **Télécharge le PDF du rapport hebdomadaire**
     
-    Retourne le fichier PDF généré par WeasyPrint.
+    Retourne le fichier PDF généré par WeasyPrint, streamé par chunks depuis GCS.
+    Supporte l'en-tête `Range` (206 Partial Content) pour les viewers PDF.
     
     **Cas d'usage frontend:**
     ```typescript
@@ -103,20 +113,18 @@ async def get_weekly_pdf(week: str):
     </Button>
     ```
     """
-    storage_client = storage.Client()
     bucket = storage_client.bucket(BUCKET_REPORTS)
-    blob = bucket.blob(f"{week}/weekly_report.pdf")
+    blob = await gcs.get_blob(bucket, f"{week}/weekly_report.pdf")
     
-    if not blob.exists():
+    if blob is None:
         raise HTTPException(
             status_code=404,
             detail=f"PDF report not found for week {week}. Run /v1/run-week first."
         )
     
-    pdf_bytes = blob.download_as_bytes()
-    
-    return StreamingResponse(
-        iter([pdf_bytes]),
+    return stream_blob(
+        request,
+        blob,
         media_type="application/pdf",
         headers={
             "Content-Disposition": f"attachment; filename=mental_journal_{week}.pdf"
@@ -125,7 +133,7 @@ async def get_weekly_pdf(week: str):
 
 
 @router.get("/weeks/{week}/report/signed")
-async def get_signed_pdf_url(week: str):
+async def get_signed_pdf_url(week: str, storage_client: storage.Client = Depends(get_storage_client)):
     """
     **Génère une URL signée pour le PDF**
     
@@ -158,18 +166,18 @@ async def get_signed_pdf_url(week: str):
     );
     ```
     """
-    storage_client = storage.Client()
     bucket = storage_client.bucket(BUCKET_REPORTS)
     blob = bucket.blob(f"{week}/weekly_report.pdf")
     
-    if not blob.exists():
+    if not await gcs.blob_exists(blob):
         raise HTTPException(
             status_code=404,
             detail=f"PDF report not found for week {week}"
         )
     
     # Generate signed URL valid for 1 hour
-    url = blob.generate_signed_url(
+    url = await gcs.run_blocking(
+        blob.generate_signed_url,
         version="v4",
         expiration=timedelta(hours=1),
         method="GET",
@@ -183,7 +191,7 @@ async def get_signed_pdf_url(week: str):
 
 
 @router.get("/reports/history")
-async def get_reports_history(limit: int = 10):
+async def get_reports_history(request: Request, limit: int = 10, storage_client: storage.Client = Depends(get_storage_client)):
     """
     **Liste l'historique des rapports disponibles**
     
@@ -235,40 +243,38 @@ async def get_reports_history(limit: int = 10):
     );
     ```
     """
-    storage_client = storage.Client()
     bucket = storage_client.bucket(BUCKET_REPORTS)
     
-    # List all blobs and extract weeks
-    blobs = bucket.list_blobs()
-    weeks = set()
-    
-    for blob in blobs:
-        parts = blob.name.split("/")
-        if len(parts) > 0 and parts[0].startswith("20"):
-            weeks.add(parts[0])
-    
-    # Sort in reverse chronological order
-    weeks_sorted = sorted(list(weeks), reverse=True)[:limit]
-    
-    # Check if PDF exists for each week
-    reports = []
-    for week in weeks_sorted:
-        pdf_blob = bucket.blob(f"{week}/weekly_report.pdf")
-        reports.append({
-            "week": week,
-            "json_url": f"/v1/weeks/{week}/report",
-            "pdf_url": f"/v1/weeks/{week}/report/pdf",
-            "has_pdf": pdf_blob.exists(),
-        })
+    async def load_history():
+        # List week prefixes only (delimiter listing), reverse chronological order
+        weeks_sorted = (await gcs.list_weeks(bucket))[:limit]
+        
+        # Check if PDF exists for each week (bounded parallelism)
+        has_pdf = await gcs.gather_bounded([
+            gcs.blob_exists(bucket.blob(f"{week}/weekly_report.pdf"))
+            for week in weeks_sorted
+        ])
+        
+        reports = []
+        for week, pdf_exists in zip(weeks_sorted, has_pdf):
+            reports.append({
+                "week": week,
+                "json_url": f"/v1/weeks/{week}/report",
+                "pdf_url": f"/v1/weeks/{week}/report/pdf",
+                "has_pdf": pdf_exists,
+            })
+        
+        return {
+            "reports": reports,
+            "total": len(reports),
+        }
     
-    return {
-        "reports": reports,
-        "total": len(reports),
-    }
+    # Concurrent identical requests share one listing + PDF checks
+    return await request_coalescer.do(cache_key(request), load_history)
 
 
 @router.get("/reports/trends")
-async def get_trends(weeks: int = 4):
+async def get_trends(request: Request, weeks: int = 4, storage_client: storage.Client = Depends(get_storage_client)):
     """
     **Calcule les tendances sur plusieurs semaines**
     
@@ -317,33 +323,49 @@ async def get_trends(weeks: int = 4):
     );
     ```
     """
-    storage_client = storage.Client()
     bucket = storage_client.bucket(BUCKET_ANALYTICS)
     
-    # List all blobs and extract weeks
-    blobs = bucket.list_blobs()
-    weeks_set = set()
-    
-    for blob in blobs:
-        parts = blob.name.split("/")
-        if len(parts) > 0 and parts[0].startswith("20"):
-            weeks_set.add(parts[0])
-    
-    # Sort and take last N weeks
-    weeks_sorted = sorted(list(weeks_set), reverse=True)[:weeks]
-    
-    # Fetch weekly reports
-    trends = []
-    for week in weeks_sorted:
-        blob = bucket.blob(f"{week}/weekly_report.json")
-        if blob.exists():
-            data = json.loads(blob.download_as_text())
-            trends.append({
-                "week": week,
-                "emotion_index": data.get("emotion_index", 50),
-                "num_sessions": data.get("sessions", 0),
-            })
+    async def revalidate():
+        # List week prefixes only (delimiter listing) and take last N weeks
+        weeks_sorted = (await gcs.list_weeks(bucket))[:weeks]
+        
+        # Report metadata for each selected week (bounded parallelism, no download)
+        blobs = await gcs.gather_bounded([
+            gcs.get_blob(bucket, f"{week}/weekly_report.json") for week in weeks_sorted
+        ])
+        report_blobs = {w: b for w, b in zip(weeks_sorted, blobs) if b is not None}
+        
+        # Validator: generations of the selected reports + the week window
+        validation = fingerprint(report_blobs.values())
+        validation.validator += "|" + ",".join(weeks_sorted)
+        validation.context = (weeks_sorted, report_blobs)
+        return validation
+    
+    async def build(validation):
+        weeks_sorted, report_blobs = validation.context
+        
+        # Fetch weekly reports concurrently: latency ≈ slowest fetch, not N × fetch
+        weeks_with_report = [w for w in weeks_sorted if w in report_blobs]
+        reports = await gcs.gather_bounded([
+            gcs.download_json_or_none(report_blobs[w]) for w in weeks_with_report
+        ])
+        
+        trends = []
+        for week, data in zip(weeks_with_report, reports):
+            if data is not None:
+                trends.append({
+                    "week": week,
+                    "emotion_index": data.get("emotion_index", 50),
+                    "num_sessions": data.get("sessions_count", data.get("sessions", 0)),
+                })
+        
+        return _summarize_trends(trends)
     
+    return await cached_response(request, revalidate, build)
+
+
+def _summarize_trends(trends: list) -> dict:
+    """Calcule l'index moyen et la direction de tendance"""
     # Calculate average and trend direction
     if trends:
         avg_index = sum(t["emotion_index"] for t in trends) / len(trends)
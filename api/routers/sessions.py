@@ -3,18 +3,26 @@ Sessions Routes
 Listing et lecture des sessions et semaines
 """
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Depends, Request
+from fastapi.responses import JSONResponse
 from google.cloud import storage
-import json
+import asyncio
 import os
 
+from api.clients import get_storage_client
+from api.cache import cached_response, fingerprint
+from api.purges import Purge, purges, purge_week
+from api.streaming import stream_blob
+from api import gcs
+
 router = APIRouter()
 
 BUCKET_ANALYTICS = os.environ.get("BUCKET_ANALYTICS", "pz-analytics-build-unicorn25par-4813")
+BUCKET_RAW = os.environ.get("BUCKET_RAW", "pz-audio-raw-build-unicorn25par-4813")
 
 
 @router.get("/weeks")
-async def list_weeks():
+async def list_weeks(storage_client: storage.Client = Depends(get_storage_client)):
     """
     **Liste toutes les semaines disponibles**
     
@@ -50,21 +58,10 @@ async def list_weeks():
     );
     ```
     """
-    storage_client = storage.Client()
     bucket = storage_client.bucket(BUCKET_ANALYTICS)
     
-    # List all blobs and extract unique week prefixes
-    blobs = bucket.list_blobs()
-    weeks = set()
-    
-    for blob in blobs:
-        # Extract week from path: "2025-W42/session_001/transcript.json" → "2025-W42"
-        parts = blob.name.split("/")
-        if len(parts) > 0 and parts[0].startswith("20"):  # Basic year check
-            weeks.add(parts[0])
-    
-    # Sort in reverse chronological order
-    weeks_sorted = sorted(list(weeks), reverse=True)
+    # List week prefixes only (delimiter listing), reverse chronological order
+    weeks_sorted = await gcs.list_weeks(bucket)
     
     return {
         "weeks": weeks_sorted,
@@ -73,7 +70,7 @@ async def list_weeks():
 
 
 @router.get("/weeks/{week}/sessions")
-async def list_sessions(week: str):
+async def list_sessions(week: str, request: Request, storage_client: storage.Client = Depends(get_storage_client)):
     """
     **Liste toutes les sessions d'une semaine**
     
@@ -128,13 +125,23 @@ async def list_sessions(week: str):
     );
     ```
     """
-    storage_client = storage.Client()
     bucket = storage_client.bucket(BUCKET_ANALYTICS)
     
-    # List all blobs under week prefix
-    prefix = f"{week}/"
-    blobs = bucket.list_blobs(prefix=prefix)
+    async def revalidate():
+        # List all blobs under week prefix (the listing carries generations)
+        blobs = await gcs.list_blobs(bucket, prefix=f"{week}/")
+        validation = fingerprint(blobs)
+        validation.context = blobs
+        return validation
+    
+    async def build(validation):
+        return _sessions_from_blobs(week, validation.context)
     
+    return await cached_response(request, revalidate, build)
+
+
+def _sessions_from_blobs(week: str, blobs) -> dict:
+    """Regroupe les artefacts listés sous `{week}/` par session_id"""
     # Extract session IDs and check which artifacts exist
     sessions_dict = {}
     
@@ -189,7 +196,7 @@ async def list_sessions(week: str):
 
 
 @router.get("/weeks/{week}/sessions/{session_id}")
-async def get_session(week: str, session_id: str):
+async def get_session(week: str, session_id: str, storage_client: storage.Client = Depends(get_storage_client)):
     """
     **Récupère toutes les données d'une session**
     
@@ -241,21 +248,16 @@ async def get_session(week: str, session_id: str):
     );
     ```
     """
-    storage_client = storage.Client()
     bucket = storage_client.bucket(BUCKET_ANALYTICS)
     
-    # Helper to download and parse JSON
-    def get_json(path: str):
-        blob = bucket.blob(path)
-        if not blob.exists():
-            return None
-        return json.loads(blob.download_as_text())
-    
-    # Fetch all artifacts
+    # Fetch all artifacts concurrently: one GET each, 404 → None
+    # (one session view ≈ one GCS round-trip)
     base_path = f"{week}/{session_id}"
-    transcript = get_json(f"{base_path}/transcript.json")
-    prosody = get_json(f"{base_path}/prosody_features.json")
-    nlu = get_json(f"{base_path}/events_emotions.json")
+    transcript, prosody, nlu = await asyncio.gather(
+        gcs.download_json_or_none(bucket.blob(f"{base_path}/transcript.json")),
+        gcs.download_json_or_none(bucket.blob(f"{base_path}/prosody_features.json")),
+        gcs.download_json_or_none(bucket.blob(f"{base_path}/events_emotions.json")),
+    )
     
     # Check if at least one artifact exists
     if not any([transcript, prosody, nlu]):
@@ -273,23 +275,87 @@ async def get_session(week: str, session_id: str):
     }
 
 
+@router.get("/weeks/{week}/sessions/{session_id}/audio")
+async def get_session_audio(week: str, session_id: str, request: Request, storage_client: storage.Client = Depends(get_storage_client)):
+    """
+    **Lecture de l'audio brut d'une session**
+    
+    Streame `<week>/<session_id>.wav` depuis le bucket `pz-audio-raw` par chunks.
+    Supporte l'en-tête `Range` (206 Partial Content) : le lecteur audio du
+    navigateur peut se positionner n'importe où sans télécharger le fichier.
+    
+    **Cas d'usage frontend:**
+    ```typescript
+    // Lecteur audio dans la page de détail d'une session
+    <audio
+      controls
+      preload="metadata"
+      src={`/v1/weeks/${week}/sessions/${sessionId}/audio`}
+    />
+    ```
+    """
+    bucket = storage_client.bucket(BUCKET_RAW)
+    blob = await gcs.get_blob(bucket, f"{week}/{session_id}.wav")
+    
+    if blob is None:
+        raise HTTPException(
+            status_code=404,
+            detail=f"Audio not found for session {session_id} in week {week}"
+        )
+    
+    return stream_blob(
+        request,
+        blob,
+        media_type=blob.content_type or "audio/wav",
+        headers={
+            "Content-Disposition": f"inline; filename={session_id}.wav"
+        }
+    )
+
+
 @router.delete("/weeks/{week}")
-async def delete_week(week: str):
+async def delete_week(
+    week: str,
+    background: bool = False,
+    storage_client: storage.Client = Depends(get_storage_client),
+):
     """
     **Supprime toutes les données d'une semaine**
     
     Supprime tous les fichiers audio, transcripts, prosody et NLU d'une semaine.
     Cette action est irréversible.
     
+    Les trois buckets sont purgés en parallèle, par requêtes batch. Si des
+    fichiers n'ont pas pu être supprimés, la réponse est un 500 avec le
+    même contenu (`failed` > 0) : relancer la purge les reprend. Avec
+    `?background=true`, la réponse est immédiate (202) et la progression se
+    suit via `GET /v1/purges/{purge_id}`.
+    
     **Exemple de réponse:**
     ```json
     {
       "week": "2025-W42",
       "deleted": 15,
+      "failed": 0,
+      "buckets": {
+        "pz-audio-raw-build-unicorn25par-4813": {"listed": 5, "deleted": 5, "failed": 0, "done": true},
+        "pz-analytics-build-unicorn25par-4813": {"listed": 8, "deleted": 8, "failed": 0, "done": true},
+        "pz-reports-build-unicorn25par-4813": {"listed": 2, "deleted": 2, "failed": 0, "done": true}
+      },
       "message": "Week 2025-W42 purged successfully"
     }
     ```
     
+    **Exemple de réponse (`?background=true`):**
+    ```json
+    {
+      "purge_id": "3f9c2a71b0de",
+      "week": "2025-W42",
+      "status": "running",
+      "status_url": "/v1/purges/3f9c2a71b0de"
+    }
+    ```
+    
     **Cas d'usage frontend:**
     ```typescript
     const purgeWeek = useMutation({
@@ -302,40 +368,78 @@ async def delete_week(week: str):
     });
     ```
     """
-    storage_client = storage.Client()
-    
-    # Delete from analytics bucket
-    bucket_analytics = storage_client.bucket(BUCKET_ANALYTICS)
-    prefix_analytics = f"{week}/"
-    blobs_analytics = list(bucket_analytics.list_blobs(prefix=prefix_analytics))
-    
-    deleted_count = 0
-    for blob in blobs_analytics:
-        blob.delete()
-        deleted_count += 1
-    
-    # Delete from raw audio bucket
-    BUCKET_RAW = os.environ.get("BUCKET_RAW", "pz-audio-raw-build-unicorn25par-4813")
-    bucket_raw = storage_client.bucket(BUCKET_RAW)
-    prefix_raw = f"{week}/"
-    blobs_raw = list(bucket_raw.list_blobs(prefix=prefix_raw))
-    
-    for blob in blobs_raw:
-        blob.delete()
-        deleted_count += 1
-    
-    # Delete from reports bucket
-    BUCKET_REPORTS = os.environ.get("BUCKET_REPORTS", "pz-reports-build-unicorn25par-4813")
-    bucket_reports = storage_client.bucket(BUCKET_REPORTS)
-    prefix_reports = f"{week}/"
-    blobs_reports = list(bucket_reports.list_blobs(prefix=prefix_reports))
-    
-    for blob in blobs_reports:
-        blob.delete()
-        deleted_count += 1
+    if background:
+        purge = purges.start(storage_client, week)
+        return JSONResponse(
+            status_code=202,
+            content={
+                "purge_id": purge.purge_id,
+                "week": week,
+                "status": purge.status,
+                "status_url": f"/v1/purges/{purge.purge_id}",
+            },
+        )
     
-    return {
+    purge = Purge(week=week)
+    purges.add(purge)
+    await purge_week(storage_client, purge)
+    
+    result = purge.to_dict()
+    content = {
         "week": week,
-        "deleted": deleted_count,
-        "message": f"Week {week} purged successfully"
+        "deleted": result["deleted"],
+        "failed": result["failed"],
+        "buckets": result["buckets"],
+        "message": f"Week {week} purged successfully",
     }
+    if result["failed"]:
+        # Purge partielle : relancer la suppression termine le travail
+        content["message"] = f"Week {week} partially purged: {result['failed']} files could not be deleted, retry the purge"
+        return JSONResponse(status_code=500, content=content)
+    return content
+
+
+@router.get("/purges/{purge_id}")
+async def get_purge_status(purge_id: str):
+    """
+    **Progression d'une purge de semaine**
+    
+    Renvoie l'état d'une purge lancée avec `DELETE /v1/weeks/{week}?background=true`.
+    `status` vaut `pending`, `running`, `done` ou `failed`.
+    
+    **Exemple de réponse:**
+    ```json
+    {
+      "purge_id": "3f9c2a71b0de",
+      "week": "2025-W42",
+      "status": "running",
+      "deleted": 300,
+      "failed": 0,
+      "listed": 812,
+      "progress": 0.369,
+      "buckets": {
+        "pz-audio-raw-build-unicorn25par-4813": {"listed": 200, "deleted": 200, "failed": 0, "done": true},
+        "pz-analytics-build-unicorn25par-4813": {"listed": 600, "deleted": 100, "failed": 0, "done": false},
+        "pz-reports-build-unicorn25par-4813": {"listed": 12, "deleted": 0, "failed": 0, "done": false}
+      },
+      "error": null,
+      "started_at": "2025-10-19T10:30:00Z",
+      "finished_at": null
+    }
+    ```
+    
+    **Cas d'usage frontend:**
+    ```typescript
+    const { data: purge } = useQuery({
+      queryKey: ['purge', purgeId],
+      queryFn: () => fetch(`/v1/purges/${purgeId}`).then(r => r.json()),
+      refetchInterval: (data) => data?.status === 'running' ? 1000 : false
+    });
+    
+    <Progress value={purge.progress * 100} />
+    ```
+    """
+    purge = purges.get(purge_id)
+    if purge is None:
+        raise HTTPException(status_code=404, detail=f"Purge {purge_id} not found")
+    return purge.to_dict()
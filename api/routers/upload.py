@@ -3,21 +3,31 @@ Upload Routes
 Génération d'URLs signées pour upload direct vers GCS
 """
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Depends, Request
 from pydantic import BaseModel
 from google.cloud import storage
-import google.auth
-from google.auth import compute_engine, iam
-from google.auth.transport import requests as google_requests
-from datetime import timedelta, datetime
-import os
-import base64
-import hashlib
+from typing import List, Optional
 from urllib.parse import quote
+import os
+
+from api.clients import ClientRegistry, get_registry, get_storage_client
+from api.signing import sign_put_url
+from api.ingest import audio_path
+from api.jobs import PRIORITY_INGEST, job_queue
+from api import gcs
 
 router = APIRouter()
 
 BUCKET_RAW = os.environ.get("BUCKET_RAW", "pz-audio-raw-build-unicorn25par-4813")
+# Durée de validité des URLs d'upload signées
+SIGNED_URL_TTL = int(os.environ.get("SIGNED_URL_TTL", "3600"))
+# Nombre max de sessions par appel à /v1/sign-upload/bulk
+SIGN_UPLOAD_BULK_MAX = int(os.environ.get("SIGN_UPLOAD_BULK_MAX", "500"))
+
+# Resumable uploads: chunks multiples de 256 KiB (contrainte GCS), 8 MiB conseillés
+RESUMABLE_CHUNK_MULTIPLE = 256 * 1024
+RESUMABLE_RECOMMENDED_CHUNK = int(os.environ.get("RESUMABLE_RECOMMENDED_CHUNK", str(8 * 1024 * 1024)))
+RESUMABLE_UPLOAD_PREFIX = "https://storage.googleapis.com/upload/storage/v1/b/"
 
 
 class SignUploadRequest(BaseModel):
@@ -36,7 +46,11 @@ class SignUploadResponse(BaseModel):
 
 
 @router.post("/sign-upload", response_model=SignUploadResponse)
-async def sign_upload(request: SignUploadRequest):
+async def sign_upload(
+    request: SignUploadRequest,
+    storage_client: storage.Client = Depends(get_storage_client),
+    registry: ClientRegistry = Depends(get_registry),
+):
     """
     **Génère une URL signée pour upload direct GCS**
     
@@ -103,173 +117,432 @@ async def sign_upload(request: SignUploadRequest):
     - ✅ Bande passante économisée sur l'API
     - ✅ Validation côté client avant upload
     """
-    # Validate week format (basic check)
-    if not request.week or len(request.week.split("-")) != 2:
+    object_path = _object_path(request)
+    
+    try:
+        url = await gcs.run_blocking(
+            sign_put_url, registry, storage_client, BUCKET_RAW, object_path, request.content_type, SIGNED_URL_TTL
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Failed to generate signed URL: {str(e)}"
+        )
+    
+    return SignUploadResponse(
+        upload_url=url,
+        object_path=object_path,
+        bucket=BUCKET_RAW,
+        expires_in_seconds=SIGNED_URL_TTL,
+    )
+
+
+class SignUploadBulkRequest(BaseModel):
+    """Request body pour signer plusieurs uploads en un appel"""
+    uploads: List[SignUploadRequest]
+
+
+class SignUploadBulkResponse(BaseModel):
+    """Une URL signée par session, dans l'ordre de la requête"""
+    uploads: List[SignUploadResponse]
+    count: int
+
+
+@router.post("/sign-upload/bulk", response_model=SignUploadBulkResponse)
+async def sign_upload_bulk(
+    request: SignUploadBulkRequest,
+    storage_client: storage.Client = Depends(get_storage_client),
+    registry: ClientRegistry = Depends(get_registry),
+):
+    """
+    **Génère des URLs signées pour plusieurs sessions en un appel**
+    
+    Même résultat que `/v1/sign-upload` pour chaque `(week, session_id)`,
+    mais les signatures sont calculées en parallèle : uploader un backlog de
+    N sessions coûte un aller-retour au lieu de N.
+    Limité à `SIGN_UPLOAD_BULK_MAX` sessions par appel (500 par défaut).
+    
+    **Exemple de requête:**
+    ```json
+    {
+      "uploads": [
+        {"week": "2025-W42", "session_id": "session_001", "content_type": "audio/wav"},
+        {"week": "2025-W42", "session_id": "session_002", "content_type": "audio/wav"}
+      ]
+    }
+    ```
+    
+    **Exemple de réponse:**
+    ```json
+    {
+      "uploads": [
+        {
+          "upload_url": "https://storage.googleapis.com/pz-audio-raw-build-unicorn25par-4813/2025-W42/session_001.wav?X-Goog-Algorithm=...",
+          "object_path": "2025-W42/session_001.wav",
+          "bucket": "pz-audio-raw-build-unicorn25par-4813",
+          "expires_in_seconds": 3600
+        },
+        ...
+      ],
+      "count": 2
+    }
+    ```
+    
+    **Cas d'usage frontend:**
+    ```typescript
+    // Upload d'un backlog d'enregistrements
+    const { uploads } = await fetch('/v1/sign-upload/bulk', {
+      method: 'POST',
+      body: JSON.stringify({
+        uploads: files.map(f => ({ week: f.week, session_id: f.sessionId, content_type: f.type }))
+      })
+    }).then(r => r.json());
+    
+    await Promise.all(uploads.map((u, i) =>
+      fetch(u.upload_url, { method: 'PUT', body: files[i].blob, headers: { 'Content-Type': files[i].type } })
+    ));
+    ```
+    """
+    if not request.uploads:
+        raise HTTPException(status_code=400, detail="No uploads to sign")
+    if len(request.uploads) > SIGN_UPLOAD_BULK_MAX:
         raise HTTPException(
             status_code=400,
-            detail="Invalid week format. Expected format: YYYY-Www (e.g., 2025-W42)"
+            detail=f"Too many uploads ({len(request.uploads)}), max {SIGN_UPLOAD_BULK_MAX} per call"
         )
     
-    # Generate object path
-    # Format: <week>/<session_id>.wav
-    file_extension = request.content_type.split("/")[-1]
-    object_path = f"{request.week}/{request.session_id}.{file_extension}"
+    object_paths = [_object_path(item) for item in request.uploads]
     
     try:
-        # Get credentials
-        credentials, project = google.auth.default()
-        
-        # For Compute Engine credentials (Cloud Run), manually build signed URL using IAM API
-        if isinstance(credentials, compute_engine.Credentials):
-            # Get the actual service account email from metadata server
-            import requests
-            from collections import OrderedDict
-            
-            metadata_url = "http://metadata.google.internal/computeMetadata/v1/instance/service-accounts/default/email"
-            metadata_headers = {"Metadata-Flavor": "Google"}
-            response = requests.get(metadata_url, headers=metadata_headers)
-            service_account_email = response.text.strip()
-            
-            # Build the canonical request for signed URL v4 (follow exact GCS spec)
-            now = datetime.utcnow()
-            
-            # Timestamps
-            timestamp = now.strftime("%Y%m%dT%H%M%SZ")
-            datestamp = now.strftime("%Y%m%d")
-            credential_scope = f"{datestamp}/auto/storage/goog4_request"
-            
-            # Path: encode object name but preserve slashes in path structure
-            escaped_object_path = quote(object_path.encode('utf-8'), safe="/~")
-            canonical_uri = f"/{BUCKET_RAW}/{escaped_object_path}"
-            
-            # Headers: use lowercase, sort by name
-            headers = OrderedDict(sorted({
-                "content-type": request.content_type.lower(),
-                "host": "storage.googleapis.com",
-            }.items()))
-            
-            canonical_headers = "".join(f"{k}:{v}\n" for k, v in headers.items())
-            signed_headers = ";".join(headers.keys())
-            
-            # Query parameters: RAW values (NOT pre-encoded)
-            # Will be encoded once during canonical_qs construction
-            query_params = {
-                "X-Goog-Algorithm": "GOOG4-RSA-SHA256",
-                "X-Goog-Credential": f"{service_account_email}/{credential_scope}",  # RAW (contains /)
-                "X-Goog-Date": timestamp,
-                "X-Goog-Expires": "3600",
-                "X-Goog-SignedHeaders": signed_headers,
-            }
-            
-            # Build canonical query string: encode each key=value pair ONCE
-            # This exact string will be reused in the final URL
-            ordered_params = OrderedDict(sorted(query_params.items()))
-            canonical_query_string = "&".join(
-                f"{quote(str(k), safe='')}"      # Encode key
-                f"={quote(str(v), safe='')}"     # Encode value (/ becomes %2F)
-                for k, v in ordered_params.items()
-            )
-            
-            # Canonical request (newline-separated components)
-            canonical_request = "\n".join([
-                "PUT",
-                canonical_uri,
-                canonical_query_string,
-                canonical_headers,
-                signed_headers,
-                "UNSIGNED-PAYLOAD",
-            ])
-            
-            # String to sign
-            canonical_request_hash = hashlib.sha256(canonical_request.encode()).hexdigest()
-            string_to_sign = f"GOOG4-RSA-SHA256\n{timestamp}\n{credential_scope}\n{canonical_request_hash}"
-            
-            # Sign with IAM API
-            from google.cloud import iam_credentials_v1
-            
-            iam_client = iam_credentials_v1.IAMCredentialsClient(credentials=credentials)
-            service_account_path = f"projects/-/serviceAccounts/{service_account_email}"
-            
-            sign_response = iam_client.sign_blob(
-                name=service_account_path,
-                payload=string_to_sign.encode()
-            )
-            
-            # Signature is returned as bytes, convert to hex string
-            signature_hex = sign_response.signed_blob.hex()
-            
-            # Build final URL: REUSE canonical_query_string exactly as-is
-            url = f"https://storage.googleapis.com{canonical_uri}?{canonical_query_string}&X-Goog-Signature={signature_hex}"
-            
-        else:
-            # For service account credentials with private key
-            storage_client = storage.Client()
-            bucket = storage_client.bucket(BUCKET_RAW)
-            blob = bucket.blob(object_path)
-            
-            url = blob.generate_signed_url(
-                version="v4",
-                expiration=timedelta(hours=1),
-                method="PUT",
-                content_type=request.content_type,
+        urls = await gcs.gather_bounded([
+            gcs.run_blocking(
+                sign_put_url, registry, storage_client, BUCKET_RAW, object_path, item.content_type, SIGNED_URL_TTL
             )
-        
-        return SignUploadResponse(
+            for item, object_path in zip(request.uploads, object_paths)
+        ])
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Failed to generate signed URLs: {str(e)}"
+        )
+    
+    uploads = [
+        SignUploadResponse(
             upload_url=url,
             object_path=object_path,
             bucket=BUCKET_RAW,
-            expires_in_seconds=3600,
+            expires_in_seconds=SIGNED_URL_TTL,
         )
+        for url, object_path in zip(urls, object_paths)
+    ]
+    return SignUploadBulkResponse(uploads=uploads, count=len(uploads))
+
+
+def _object_path(request: SignUploadRequest) -> str:
+    """Valide la semaine et construit `<week>/<session_id>.<ext>`"""
+    # Validate week format (basic check)
+    if not request.week or len(request.week.split("-")) != 2:
+        raise HTTPException(
+            status_code=400,
+            detail="Invalid week format. Expected format: YYYY-Www (e.g., 2025-W42)"
+        )
+    
+    # Format: <week>/<session_id>.wav
+    file_extension = request.content_type.split("/")[-1]
+    return f"{request.week}/{request.session_id}.{file_extension}"
+
+
+# =============================================================================
+# Resumable uploads (gros fichiers / réseau mobile instable)
+# =============================================================================
+class ResumableUploadRequest(BaseModel):
+    """Request body pour ouvrir une session d'upload résumable"""
+    week: str
+    session_id: str
+    content_type: str = "audio/wav"
+    size: Optional[int] = None  # Taille totale en octets (si connue)
+    md5_hash: Optional[str] = None  # MD5 base64 du fichier: vérifié par GCS à la finalisation
+    crc32c: Optional[str] = None  # CRC32C base64 (big-endian): vérifié par GCS à la finalisation
+
+
+class ResumableUploadResponse(BaseModel):
+    """Session résumable + consignes de découpage"""
+    session_uri: str
+    object_path: str
+    bucket: str
+    chunk_size_multiple: int
+    recommended_chunk_size: int
+    status_url: str
+
+
+@router.post("/uploads/resumable", response_model=ResumableUploadResponse)
+async def start_resumable_upload(
+    request: ResumableUploadRequest,
+    http_request: Request,
+    storage_client: storage.Client = Depends(get_storage_client),
+):
+    """
+    **Ouvre une session d'upload résumable GCS**
+    
+    Pour les enregistrements lourds ou les connexions instables : le fichier
+    est envoyé par chunks sur `session_uri`, et une coupure ne fait perdre que
+    le chunk en cours. La session reste valide une semaine.
+    
+    **Règles d'upload (API GCS):**
+    - Chaque chunk sauf le dernier doit faire un multiple de `chunk_size_multiple` (256 KiB)
+    - `PUT session_uri` avec `Content-Range: bytes {start}-{end}/{total}` (ou `*` si total inconnu)
+    - Réponse `308` = chunk accepté (en-tête `Range` = octets persistés), `200/201` = terminé
+    - Après une coupure: `GET /v1/uploads/resumable/status` puis reprise à `next_offset`
+    
+    Si `md5_hash` / `crc32c` sont fournis, GCS rejette la finalisation en cas de
+    fichier corrompu.
+    
+    **Exemple de requête:**
+    ```json
+    {
+      "week": "2025-W42",
+      "session_id": "session_001",
+      "content_type": "audio/wav",
+      "size": 209715200,
+      "md5_hash": "1B2M2Y8AsgTpgAmY7PhCfg=="
+    }
+    ```
+    
+    **Exemple de réponse:**
+    ```json
+    {
+      "session_uri": "https://storage.googleapis.com/upload/storage/v1/b/pz-audio-raw-build-unicorn25par-4813/o?uploadType=resumable&upload_id=...",
+      "object_path": "2025-W42/session_001.wav",
+      "bucket": "pz-audio-raw-build-unicorn25par-4813",
+      "chunk_size_multiple": 262144,
+      "recommended_chunk_size": 8388608,
+      "status_url": "/v1/uploads/resumable/status?session_uri=https%3A%2F%2Fstorage.googleapis.com%2F..."
+    }
+    ```
+    
+    **Cas d'usage frontend:**
+    ```typescript
+    const { session_uri, recommended_chunk_size } = await fetch('/v1/uploads/resumable', {
+      method: 'POST',
+      body: JSON.stringify({ week, session_id, content_type: file.type, size: file.size })
+    }).then(r => r.json());
+    
+    let offset = 0;
+    while (offset < file.size) {
+      const end = Math.min(offset + recommended_chunk_size, file.size);
+      const res = await fetch(session_uri, {
+        method: 'PUT',
+        headers: { 'Content-Range': `bytes ${offset}-${end - 1}/${file.size}` },
+        body: file.slice(offset, end)
+      });
+      // 308 → chunk persisté, 200/201 → upload terminé
+      offset = end;
+    }
+    ```
+    """
+    object_path = _object_path(request)
+    
+    blob = storage_client.bucket(BUCKET_RAW).blob(object_path)
+    if request.md5_hash:
+        blob.md5_hash = request.md5_hash
+    if request.crc32c:
+        blob.crc32c = request.crc32c
     
+    try:
+        session_uri = await gcs.run_blocking(
+            blob.create_resumable_upload_session,
+            content_type=request.content_type,
+            size=request.size,
+            # Session liée à l'origine du navigateur (CORS sur les PUT de chunks)
+            origin=http_request.headers.get("origin"),
+            checksum=None,
+        )
     except Exception as e:
         raise HTTPException(
             status_code=500,
-            detail=f"Failed to generate signed URL: {str(e)}"
+            detail=f"Failed to start resumable upload: {str(e)}"
         )
+    
+    return ResumableUploadResponse(
+        session_uri=session_uri,
+        object_path=object_path,
+        bucket=BUCKET_RAW,
+        chunk_size_multiple=RESUMABLE_CHUNK_MULTIPLE,
+        recommended_chunk_size=RESUMABLE_RECOMMENDED_CHUNK,
+        status_url=f"/v1/uploads/resumable/status?session_uri={quote(session_uri, safe='')}",
+    )
+
+
+def _query_resumable_status(http, session_uri: str) -> dict:
+    """Interroge GCS sur une session résumable (`PUT` vide, `Content-Range: bytes */*`)"""
+    response = http.put(
+        session_uri,
+        headers={"Content-Range": "bytes */*", "Content-Length": "0"},
+        timeout=30,
+    )
+    
+    if response.status_code in (200, 201):
+        resource = response.json()
+        size = int(resource.get("size", 0))
+        return {
+            "complete": True,
+            "committed_bytes": size,
+            "next_offset": size,
+            "object": {
+                "name": resource.get("name"),
+                "size": size,
+                "md5_hash": resource.get("md5Hash"),
+                "crc32c": resource.get("crc32c"),
+                "generation": resource.get("generation"),
+            },
+        }
+    
+    if response.status_code == 308:
+        # `Range: bytes=0-N` → N+1 octets persistés (absent = rien encore)
+        committed = 0
+        range_header = response.headers.get("Range")
+        if range_header:
+            committed = int(range_header.rsplit("-", 1)[-1]) + 1
+        return {"complete": False, "committed_bytes": committed, "next_offset": committed, "object": None}
+    
+    if response.status_code in (404, 410):
+        raise HTTPException(status_code=410, detail="Upload session expired or cancelled, start a new one")
+    
+    raise HTTPException(
+        status_code=502,
+        detail=f"Unexpected status from GCS: {response.status_code} {response.text[:200]}"
+    )
+
+
+@router.get("/uploads/resumable/status")
+async def get_resumable_upload_status(
+    session_uri: str,
+    storage_client: storage.Client = Depends(get_storage_client),
+):
+    """
+    **État d'une session d'upload résumable**
+    
+    Renvoie le nombre d'octets déjà persistés par GCS : le client reprend
+    l'envoi à `next_offset` après une coupure réseau.
+    
+    **Exemple de réponse (en cours):**
+    ```json
+    {
+      "complete": false,
+      "committed_bytes": 83886080,
+      "next_offset": 83886080,
+      "object": null
+    }
+    ```
+    
+    **Exemple de réponse (terminé):**
+    ```json
+    {
+      "complete": true,
+      "committed_bytes": 209715200,
+      "next_offset": 209715200,
+      "object": {
+        "name": "2025-W42/session_001.wav",
+        "size": 209715200,
+        "md5_hash": "1B2M2Y8AsgTpgAmY7PhCfg==",
+        "crc32c": "AAAAAA==",
+        "generation": "1729500000000000"
+      }
+    }
+    ```
+    
+    **Cas d'usage frontend:**
+    ```typescript
+    // Reprise après coupure
+    const { next_offset, complete } = await fetch(
+      `/v1/uploads/resumable/status?session_uri=${encodeURIComponent(sessionUri)}`
+    ).then(r => r.json());
+    if (!complete) await uploadFrom(next_offset);
+    ```
+    """
+    # Only GCS upload sessions on the raw audio bucket (no open proxy)
+    if not session_uri.startswith(f"{RESUMABLE_UPLOAD_PREFIX}{BUCKET_RAW}/"):
+        raise HTTPException(status_code=400, detail="Invalid session_uri for this bucket")
+    
+    return await gcs.run_blocking(_query_resumable_status, storage_client._http, session_uri)
 
 
 class IngestFinishRequest(BaseModel):
     """Request body pour déclencher le traitement d'une session"""
     week: str
     session_id: str
+    size: Optional[int] = None  # Taille attendue: upload incomplet → 422
+    md5_hash: Optional[str] = None  # MD5 base64 attendu
+    crc32c: Optional[str] = None  # CRC32C base64 attendu
 
 
 class IngestFinishResponse(BaseModel):
-    """Response avec les chemins des artefacts créés"""
+    """Response avec le job de traitement (à suivre via `status_url`)"""
+    job_id: str
     session_id: str
     week: str
-    artifacts: dict
+    status: str
+    deduplicated: bool
+    status_url: str
+
 
+def _verify_upload(blob: storage.Blob, request: IngestFinishRequest):
+    """Compare l'objet final aux taille/hashes annoncés par le client"""
+    mismatches = []
+    if request.size is not None and blob.size != request.size:
+        mismatches.append(f"size {blob.size} != expected {request.size}")
+    if request.md5_hash and blob.md5_hash and blob.md5_hash != request.md5_hash:
+        mismatches.append(f"md5 {blob.md5_hash} != expected {request.md5_hash}")
+    if request.crc32c and blob.crc32c != request.crc32c:
+        mismatches.append(f"crc32c {blob.crc32c} != expected {request.crc32c}")
+    
+    if mismatches:
+        raise HTTPException(
+            status_code=422,
+            detail=f"Uploaded audio does not match: {', '.join(mismatches)}"
+        )
 
-@router.post("/ingest/finish", response_model=IngestFinishResponse)
-async def ingest_finish(request: IngestFinishRequest):
+
+@router.post("/ingest/finish", response_model=IngestFinishResponse, status_code=202)
+async def ingest_finish(
+    request: IngestFinishRequest,
+    storage_client: storage.Client = Depends(get_storage_client),
+):
     """
     **Traite une session audio après upload**
     
-    Exécute le pipeline complet pour UNE session:
+    Soumet un job qui exécute le pipeline complet pour UNE session:
     1. **STT** (Speech-to-Text v2) → transcript.json
     2. **Prosody Analysis** (librosa) → prosody_features.json
     3. **NLU** (Gemini) → events_emotions.json
     
+    La réponse est immédiate (202) : le traitement (30-120 secondes) tourne
+    dans la file de jobs, avec priorité sur les retraitements batch. Un second
+    appel pour la même session pendant le traitement renvoie le même job.
+    
+    Si `size`, `md5_hash` ou `crc32c` sont fournis, ils sont comparés à
+    l'objet final dans GCS avant tout traitement (upload tronqué ou corrompu
+    → 422, le client peut reprendre son upload résumable).
+    
     **Exemple de requête:**
     ```json
     {
       "week": "2025-W42",
-      "session_id": "session_001"
+      "session_id": "session_001",
+      "size": 209715200,
+      "md5_hash": "1B2M2Y8AsgTpgAmY7PhCfg=="
     }
     ```
     
     **Exemple de réponse:**
     ```json
     {
+      "job_id": "9b1f3c0e4a5d4e21",
       "session_id": "session_001",
       "week": "2025-W42",
-      "artifacts": {
-        "transcript": "gs://pz-analytics-build-unicorn25par-4813/2025-W42/session_001/transcript.json",
-        "prosody": "gs://pz-analytics-build-unicorn25par-4813/2025-W42/session_001/prosody_features.json",
-        "nlu": "gs://pz-analytics-build-unicorn25par-4813/2025-W42/session_001/events_emotions.json",
-        "audio_uri": "gs://pz-audio-raw-build-unicorn25par-4813/2025-W42/session_001.wav"
-      }
+      "status": "queued",
+      "deduplicated": false,
+      "status_url": "/v1/jobs/9b1f3c0e4a5d4e21"
     }
     ```
     
@@ -284,82 +557,35 @@ async def ingest_finish(request: IngestFinishRequest):
         return response.json();
       },
       onSuccess: (data) => {
-        toast.success(`Session ${data.session_id} traitée !`);
-        queryClient.invalidateQueries(['sessions', data.week]);
+        // Suivre le job jusqu'à status === 'succeeded'
+        setJobId(data.job_id);
       }
     });
     ```
-    
-    **Note de production:**
-    Cette route peut prendre **30-120 secondes** (STT + Gemini).
-    En prod, préfère:
-    - Cloud Tasks (async) + webhook de callback
-    - Polling sur `/v1/sessions/{week}/{session_id}` pour vérifier l'existence des artefacts
     """
-    # Import pipeline functions
-    import sys
-    sys.path.append("/app")  # Adjust path for Cloud Run
-    
-    from pipeline.main import (
-        stt_transcribe, download_to_tmp, extract_prosody,
-        nlu_events_emotions, upload_json
-    )
-    
-    BUCKET_ANALYTICS = os.environ.get("BUCKET_ANALYTICS", "pz-analytics-build-unicorn25par-4813")
-    
-    # Construct audio URI
-    audio_uri = f"gs://{BUCKET_RAW}/{request.week}/{request.session_id}.wav"
+    audio_uri = f"gs://{BUCKET_RAW}/{audio_path(request.week, request.session_id)}"
     
-    # Verify audio exists
-    storage_client = storage.Client()
+    # Verify audio exists (metadata only: size + hashes of the final object)
     bucket = storage_client.bucket(BUCKET_RAW)
-    blob = bucket.blob(f"{request.week}/{request.session_id}.wav")
+    blob = await gcs.get_blob(bucket, audio_path(request.week, request.session_id))
     
-    if not blob.exists():
+    if blob is None:
         raise HTTPException(
             status_code=404,
             detail=f"Audio file not found: {audio_uri}"
         )
     
-    try:
-        # 1. Speech-to-Text
-        text, words = stt_transcribe(audio_uri)
-        transcript_obj = {
-            "session_id": request.session_id,
-            "audio_uri": audio_uri,
-            "language_code": "fr-FR",
-            "transcript": text,
-            "words": words,
-        }
-        transcript_path = f"{request.week}/{request.session_id}/transcript.json"
-        upload_json(BUCKET_ANALYTICS, transcript_path, transcript_obj)
-        
-        # 2. Prosody Analysis
-        local_audio = download_to_tmp(audio_uri)
-        prosody = extract_prosody(local_audio)
-        prosody["session_id"] = request.session_id
-        prosody_path = f"{request.week}/{request.session_id}/prosody_features.json"
-        upload_json(BUCKET_ANALYTICS, prosody_path, prosody)
-        
-        # 3. NLU - Events & Emotions
-        nlu = nlu_events_emotions(text)
-        nlu["session_id"] = request.session_id
-        nlu_path = f"{request.week}/{request.session_id}/events_emotions.json"
-        upload_json(BUCKET_ANALYTICS, nlu_path, nlu)
-        
-        return IngestFinishResponse(
-            session_id=request.session_id,
-            week=request.week,
-            artifacts={
-                "transcript": f"gs://{BUCKET_ANALYTICS}/{transcript_path}",
-                "prosody": f"gs://{BUCKET_ANALYTICS}/{prosody_path}",
-                "nlu": f"gs://{BUCKET_ANALYTICS}/{nlu_path}",
-                "audio_uri": audio_uri,
-            }
-        )
+    _verify_upload(blob, request)
     
-    except Exception as e:
-        raise HTTPException(
-            status_code=500,
-            detail=f"Processing failed: {str(e)}"
-        )
+    job, created = await job_queue.submit(
+        request.week, request.session_id, kind="ingest", priority=PRIORITY_INGEST
+    )
+    
+    return IngestFinishResponse(
+        job_id=job.job_id,
+        session_id=request.session_id,
+        week=request.week,
+        status=job.status,
+        deduplicated=not created,
+        status_url=f"/v1/jobs/{job.job_id}",
+    )
@@ -0,0 +1,117 @@
+"""
+Signed URLs
+Génération d'URLs signées V4 pour l'upload direct vers GCS
+
+Deux cas selon les credentials de l'instance :
+- Clé de compte de service locale → `blob.generate_signed_url()` (signature RSA locale)
+- Credentials Compute Engine (Cloud Run) → URL V4 construite à la main et
+  signée par l'API IAM `signBlob`, avec l'email du compte de service et le
+  client IAM mis en cache dans le registre (aucun appel metadata par URL)
+
+Les fonctions sont synchrones : les routes les exécutent via `gcs.run_blocking`.
+"""
+
+from collections import OrderedDict
+from datetime import timedelta, datetime
+from google.cloud import storage
+from urllib.parse import quote
+import hashlib
+
+from api.clients import ClientRegistry
+
+
+def _sign_with_iam(registry: ClientRegistry, bucket_name: str, object_path: str, content_type: str, expires_in: int) -> str:
+    """Construit une URL V4 (PUT) et la signe via IAM signBlob"""
+    service_account_email = registry.service_account_email
+
+    # Build the canonical request for signed URL v4 (follow exact GCS spec)
+    now = datetime.utcnow()
+
+    # Timestamps
+    timestamp = now.strftime("%Y%m%dT%H%M%SZ")
+    datestamp = now.strftime("%Y%m%d")
+    credential_scope = f"{datestamp}/auto/storage/goog4_request"
+
+    # Path: encode object name but preserve slashes in path structure
+    escaped_object_path = quote(object_path.encode('utf-8'), safe="/~")
+    canonical_uri = f"/{bucket_name}/{escaped_object_path}"
+
+    # Headers: use lowercase, sort by name
+    headers = OrderedDict(sorted({
+        "content-type": content_type.lower(),
+        "host": "storage.googleapis.com",
+    }.items()))
+
+    canonical_headers = "".join(f"{k}:{v}\n" for k, v in headers.items())
+    signed_headers = ";".join(headers.keys())
+
+    # Query parameters: RAW values (NOT pre-encoded)
+    # Will be encoded once during canonical_qs construction
+    query_params = {
+        "X-Goog-Algorithm": "GOOG4-RSA-SHA256",
+        "X-Goog-Credential": f"{service_account_email}/{credential_scope}",  # RAW (contains /)
+        "X-Goog-Date": timestamp,
+        "X-Goog-Expires": str(expires_in),
+        "X-Goog-SignedHeaders": signed_headers,
+    }
+
+    # Build canonical query string: encode each key=value pair ONCE
+    # This exact string will be reused in the final URL
+    ordered_params = OrderedDict(sorted(query_params.items()))
+    canonical_query_string = "&".join(
+        f"{quote(str(k), safe='')}"      # Encode key
+        f"={quote(str(v), safe='')}"     # Encode value (/ becomes %2F)
+        for k, v in ordered_params.items()
+    )
+
+    # Canonical request (newline-separated components)
+    canonical_request = "\n".join([
+        "PUT",
+        canonical_uri,
+        canonical_query_string,
+        canonical_headers,
+        signed_headers,
+        "UNSIGNED-PAYLOAD",
+    ])
+
+    # String to sign
+    canonical_request_hash = hashlib.sha256(canonical_request.encode()).hexdigest()
+    string_to_sign = f"GOOG4-RSA-SHA256\n{timestamp}\n{credential_scope}\n{canonical_request_hash}"
+
+    # Sign with IAM API (shared client, one remote call per URL)
+    sign_response = registry.iam_credentials.sign_blob(
+        name=f"projects/-/serviceAccounts/{service_account_email}",
+        payload=string_to_sign.encode()
+    )
+
+    # Signature is returned as bytes, convert to hex string
+    signature_hex = sign_response.signed_blob.hex()
+
+    # Build final URL: REUSE canonical_query_string exactly as-is
+    return f"https://storage.googleapis.com{canonical_uri}?{canonical_query_string}&X-Goog-Signature={signature_hex}"
+
+
+def sign_put_url(
+    registry: ClientRegistry,
+    storage_client: storage.Client,
+    bucket_name: str,
+    object_path: str,
+    content_type: str,
+    expires_in: int = 3600,
+) -> str:
+    """
+    URL signée V4 autorisant un PUT de `object_path` avec ce `content_type`
+
+    Bloquant (appel IAM ou signature RSA locale) : à exécuter hors event loop.
+    """
+    if registry.uses_metadata_credentials:
+        return _sign_with_iam(registry, bucket_name, object_path, content_type, expires_in)
+
+    # For service account credentials with private key
+    blob = storage_client.bucket(bucket_name).blob(object_path)
+    return blob.generate_signed_url(
+        version="v4",
+        expiration=timedelta(seconds=expires_in),
+        method="PUT",
+        content_type=content_type,
+    )
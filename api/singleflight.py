@@ -0,0 +1,66 @@
+"""
+Single-Flight
+Coalescence des lectures identiques concurrentes
+
+Quand plusieurs requêtes demandent la même ressource au même moment (ex:
+publication d'un rapport hebdo, tous les dashboards rafraîchissent), une
+seule récupération backend est lancée ; les autres requêtes attendent son
+résultat au lieu de refaire le listing et les téléchargements.
+"""
+
+from collections import Counter
+from typing import Any, Awaitable, Callable, Dict
+import asyncio
+
+
+class SingleFlight:
+    """
+    Partage un appel async en vol entre tous les appelants d'une même clé
+
+    L'appel est exécuté dans une task indépendante : si le premier client se
+    déconnecte (annulation), les autres continuent d'attendre le même résultat.
+    Les exceptions (ex: HTTPException 404) sont propagées à tous les appelants.
+    """
+
+    def __init__(self):
+        self._inflight: Dict[str, asyncio.Task] = {}
+        self.calls = 0
+        self.executions = 0
+        self.coalesced = 0
+        self.coalesced_by_route: Counter = Counter()
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[Any]]) -> Any:
+        self.calls += 1
+        task = self._inflight.get(key)
+
+        if task is None:
+            self.executions += 1
+            task = asyncio.ensure_future(fn())
+            self._inflight[key] = task
+            task.add_done_callback(lambda t, k=key: self._forget(k, t))
+        else:
+            self.coalesced += 1
+            self.coalesced_by_route[key.split("?", 1)[0]] += 1
+
+        return await asyncio.shield(task)
+
+    def _forget(self, key: str, task: asyncio.Task):
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        # Marque l'exception comme lue si plus personne n'attend la task
+        if not task.cancelled():
+            task.exception()
+
+    def stats(self) -> dict:
+        return {
+            "calls": self.calls,
+            "backend_fetches": self.executions,
+            "coalesced": self.coalesced,
+            "coalesced_ratio": round(self.coalesced / self.calls, 3) if self.calls else 0.0,
+            "in_flight": len(self._inflight),
+            "coalesced_by_route": dict(self.coalesced_by_route),
+        }
+
+
+# Instance unique pour le process
+request_coalescer = SingleFlight()
@@ -0,0 +1,135 @@
+"""
+Streaming Downloads
+Proxy de téléchargement GCS → client par chunks, avec support HTTP Range
+
+Le fichier n'est jamais chargé entièrement en mémoire : chaque chunk est
+lu par un GET GCS ranged (`STREAM_CHUNK_SIZE`) et envoyé dès réception,
+avec au plus un chunk pré-chargé d'avance. Les requêtes `Range: bytes=...`
+sont servies en 206 Partial Content, ce qui permet le seek instantané dans
+un lecteur audio ou un viewer PDF.
+"""
+
+from fastapi import HTTPException, Request
+from fastapi.responses import StreamingResponse
+from google.cloud import storage
+import asyncio
+import os
+
+from api import gcs
+
+# Taille d'un chunk lu depuis GCS (mémoire max par téléchargement ≈ 2 chunks)
+STREAM_CHUNK_SIZE = int(os.environ.get("STREAM_CHUNK_SIZE", str(1024 * 1024)))
+
+
+def parse_range(range_header: str | None, size: int) -> tuple[int, int] | None:
+    """
+    Parse un en-tête `Range: bytes=start-end` (une seule plage)
+
+    Returns:
+        (start, end) inclusifs, ou None si pas de Range exploitable
+        (absent, invalide ou multiple : le fichier complet est servi en 200)
+
+    Raises:
+        HTTPException 416 si la plage commence après la fin du fichier
+    """
+    if not range_header or not range_header.startswith("bytes="):
+        return None
+
+    spec = range_header[len("bytes="):].strip()
+    if "," in spec:
+        # Plusieurs plages: on renvoie le fichier complet (autorisé par la RFC 7233)
+        return None
+
+    first, _, last = spec.partition("-")
+    try:
+        if first == "":
+            # Suffix range: les N derniers octets
+            length = int(last)
+            if length <= 0:
+                raise ValueError
+            start, end = max(0, size - length), size - 1
+        else:
+            start = int(first)
+            end = int(last) if last else size - 1
+            if end < start:
+                # byte-range-spec invalide: l'en-tête est ignoré (RFC 7233 §2.1)
+                return None
+            end = min(end, size - 1)
+    except ValueError:
+        return None
+
+    if start >= size:
+        raise HTTPException(
+            status_code=416,
+            detail=f"Requested range not satisfiable (size {size})",
+            headers={"Content-Range": f"bytes */{size}"},
+        )
+    return start, end
+
+
+async def _iter_chunks(blob: storage.Blob, start: int, end: int, chunk_size: int):
+    """Lit [start, end] par GET ranged successifs, en pré-chargeant le chunk suivant"""
+
+    def fetch(offset: int):
+        last = min(offset + chunk_size, end + 1) - 1
+        return gcs.run_blocking(
+            blob.download_as_bytes,
+            start=offset,
+            end=last,
+            raw_download=True,
+            checksum=None,
+        )
+
+    offset = start
+    pending = asyncio.ensure_future(fetch(offset))
+    try:
+        while pending is not None:
+            data = await pending
+            offset += len(data)
+            pending = asyncio.ensure_future(fetch(offset)) if data and offset <= end else None
+            yield data
+    finally:
+        # Client déconnecté en cours de route: on abandonne le chunk en vol
+        if pending is not None:
+            pending.cancel()
+
+
+def stream_blob(
+    request: Request,
+    blob: storage.Blob,
+    media_type: str | None = None,
+    headers: dict | None = None,
+    chunk_size: int = STREAM_CHUNK_SIZE,
+) -> StreamingResponse:
+    """
+    Renvoie un objet GCS en streaming (200 complet ou 206 partiel)
+
+    `blob` doit porter ses métadonnées (`gcs.get_blob` ou listing) : sa
+    generation est figée pour tous les chunks, afin qu'un objet réécrit
+    pendant le téléchargement ne mélange pas deux versions.
+    """
+    size = blob.size or 0
+    byte_range = parse_range(request.headers.get("range"), size) if size else None
+
+    response_headers = {
+        "Accept-Ranges": "bytes",
+        "ETag": f'"{blob.generation}"',
+        **(headers or {}),
+    }
+
+    if byte_range is None:
+        start, end, status_code = 0, size - 1, 200
+    else:
+        start, end = byte_range
+        status_code = 206
+        response_headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+    response_headers["Content-Length"] = str(end - start + 1)
+
+    body = _iter_chunks(blob, start, end, chunk_size) if size else iter([b""])
+
+    return StreamingResponse(
+        body,
+        status_code=status_code,
+        media_type=media_type or blob.content_type or "application/octet-stream",
+        headers=response_headers,
+    )
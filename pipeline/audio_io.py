@@ -0,0 +1,243 @@
+#!/usr/bin/env python3
+"""
+Audio Loading
+Decode session audio to float32 mono at the analysis rate (16 kHz)
+
+Uploads and live captures are normalized to 16 kHz mono PCM: for those the
+samples are read straight into float32 by soundfile, with no resampling and
+no generic loader overhead. Other rates are resampled with soxr (HQ, the
+quality librosa uses by default), and formats libsndfile cannot read (mp3
+on old builds, webm) go through librosa.load as before.
+
+Long PCM WAV files can also be opened as a read-only `np.memmap` (see
+`open_pcm_wav`) and converted to float32 block by block: pages are read on
+demand and shared through the page cache by every worker reading the file.
+The mapping reads the file in place, so it has to be a private download.
+"""
+
+import struct
+
+import numpy as np
+import soundfile as sf
+
+try:
+    import soxr
+except ImportError:  # librosa ships soxr since 0.10, kept optional here
+    soxr = None
+
+TARGET_SR = 16000
+
+# Frames per block in blockwise analysis (~8 s at 16 kHz): bounds YIN's
+# per-block working set to ~10 MB whatever the file length
+FRAME_BLOCK_HOPS = 256
+
+
+def probe(path: str):
+    """Header info (samplerate, channels, frames, format, subtype), None if libsndfile can't read it."""
+    try:
+        return sf.info(path)
+    except RuntimeError:  # LibsndfileError on soundfile >= 0.11
+        return None
+
+
+def resample(y: np.ndarray, orig_sr: int, sr: int) -> np.ndarray:
+    """High-quality resampling of a mono float32 signal."""
+    if soxr is not None:
+        return soxr.resample(y, orig_sr, sr, quality="HQ").astype(np.float32, copy=False)
+    import librosa
+    return librosa.resample(y, orig_sr=orig_sr, target_sr=sr).astype(np.float32, copy=False)
+
+
+def load_audio(path: str, sr: int = TARGET_SR, mono: bool = True):
+    """
+    Drop-in replacement for `librosa.load(path, sr=sr, mono=mono)`.
+
+    Returns:
+        (y, sr) with y float32, shape (n,) when mono else (channels, n)
+    """
+    info = probe(path)
+    if info is None:
+        import librosa
+        y, sr = librosa.load(path, sr=sr, mono=mono, dtype=np.float32)
+        return y, sr
+
+    # Fast path: straight decode to float32 (no copy when already mono)
+    y, native_sr = sf.read(path, dtype="float32", always_2d=False)
+    if y.ndim > 1:
+        y = y.mean(axis=1, dtype=np.float32) if mono else np.ascontiguousarray(y.T)
+
+    if native_sr != sr:
+        y = resample(y, native_sr, sr) if y.ndim == 1 else np.stack([resample(ch, native_sr, sr) for ch in y])
+
+    return y, sr
+
+
+# =============================================================================
+# Memory-mapped PCM WAV
+# =============================================================================
+WAVE_FORMAT_PCM = 0x0001
+WAVE_FORMAT_IEEE_FLOAT = 0x0003
+WAVE_FORMAT_EXTENSIBLE = 0xFFFE
+
+# (format tag, bits per sample) → (sample dtype, scale to [-1, 1))
+_PCM_DTYPES = {
+    (WAVE_FORMAT_PCM, 16): (np.dtype("<i2"), 1 / 32768),
+    (WAVE_FORMAT_PCM, 32): (np.dtype("<i4"), 1 / 2147483648),
+    (WAVE_FORMAT_IEEE_FLOAT, 32): (np.dtype("<f4"), 1.0),
+}
+
+
+class PCMView:
+    """Read-only view of the samples of a PCM WAV file, shape (frames, channels)."""
+
+    def __init__(self, samples: np.memmap, samplerate: int, scale: float):
+        self.samples = samples
+        self.samplerate = samplerate
+        self.scale = scale
+
+    @property
+    def frames(self) -> int:
+        return self.samples.shape[0]
+
+    @property
+    def channels(self) -> int:
+        return self.samples.shape[1]
+
+    @property
+    def duration(self) -> float:
+        return self.frames / self.samplerate
+
+    def read_into(self, out: np.ndarray, start: int, stop: int) -> np.ndarray:
+        """Convert frames [start, stop) to float32 mono into `out[:stop - start]`."""
+        block = self.samples[start:stop]
+        n = stop - start
+        if self.channels == 1:
+            np.multiply(block[:, 0], self.scale, out=out[:n], dtype=np.float32, casting="unsafe")
+        else:
+            np.mean(block, axis=1, out=out[:n], dtype=np.float32)
+            out[:n] *= self.scale
+        return out[:n]
+
+
+def open_pcm_wav(path: str):
+    """
+    Memory-map the data chunk of a PCM16/PCM32/float32 WAV file.
+
+    The file is mapped in place, not copied: it must be private to the
+    caller (e.g. a `download_to_tmp` file) and not rewritten while the view
+    is in use, or the analysis reads the new bytes.
+
+    Returns:
+        PCMView, or None for anything else (compressed, 24-bit, big-endian RIFX,
+        truncated...): callers fall back to `load_audio`.
+    """
+    try:
+        with open(path, "rb") as f:
+            riff, _, wave = struct.unpack("<4sI4s", f.read(12))
+            if riff != b"RIFF" or wave != b"WAVE":
+                return None
+
+            fmt = None
+            while True:
+                header = f.read(8)
+                if len(header) < 8:
+                    return None
+                chunk_id, chunk_size = struct.unpack("<4sI", header)
+                if chunk_id == b"fmt ":
+                    body = f.read(chunk_size + (chunk_size & 1))
+                    tag, channels, samplerate, _, block_align, bits = struct.unpack("<HHIIHH", body[:16])
+                    if tag == WAVE_FORMAT_EXTENSIBLE and len(body) >= 26:
+                        tag = struct.unpack("<H", body[24:26])[0]  # first bytes of the SubFormat GUID
+                    fmt = (tag, channels, samplerate, block_align, bits)
+                elif chunk_id == b"data":
+                    offset = f.tell()
+                    break
+                else:
+                    f.seek(chunk_size + (chunk_size & 1), 1)
+            file_size = f.seek(0, 2)
+    except (OSError, struct.error):
+        return None
+
+    if fmt is None:
+        return None
+    tag, channels, samplerate, block_align, bits = fmt
+    dtype, scale = _PCM_DTYPES.get((tag, bits), (None, None))
+    if dtype is None or channels < 1 or block_align != channels * dtype.itemsize:
+        return None
+
+    # Streaming writers leave chunk_size at 0 or 0xFFFFFFFF: trust the file size
+    data_size = min(chunk_size, file_size - offset) if chunk_size not in (0, 0xFFFFFFFF) else file_size - offset
+    frames = data_size // block_align
+    if frames <= 0:
+        return None
+
+    samples = np.memmap(path, dtype=dtype, mode="r", offset=offset, shape=(frames, channels))
+    return PCMView(samples, samplerate, scale)
+
+
+def iter_frame_blocks(view: PCMView, frame_length: int = 2048, hop_length: int = 512, block_hops: int = FRAME_BLOCK_HOPS):
+    """
+    Float32 mono blocks covering `view` for frame-wise analysis with center=False.
+
+    The signal is virtually zero-padded by frame_length // 2 on both sides
+    (what librosa does with center=True) and consecutive blocks overlap by
+    frame_length - hop_length, so per-block frame features concatenate into
+    exactly the centered full-signal result. One buffer is reused: consume
+    each block before asking for the next.
+    """
+    pad = frame_length // 2
+    padded_length = view.frames + 2 * pad
+    n_frames = 1 + (padded_length - frame_length) // hop_length if padded_length >= frame_length else 0
+    buffer = np.empty((block_hops - 1) * hop_length + frame_length, dtype=np.float32)
+
+    for first in range(0, n_frames, block_hops):
+        count = min(block_hops, n_frames - first)
+        start = first * hop_length  # in padded coordinates
+        length = (count - 1) * hop_length + frame_length
+        out = buffer[:length]
+
+        src_start = max(0, start - pad)
+        src_stop = min(view.frames, start + length - pad)
+        left = src_start - (start - pad)
+        out[:left] = 0.0
+        view.read_into(out[left:], src_start, src_stop)
+        out[left + src_stop - src_start:] = 0.0
+        yield out
+
+
+# =============================================================================
+# Frame features
+# =============================================================================
+def frame_features(local_path: str, sr: int = TARGET_SR):
+    """
+    Pitch (YIN) and RMS energy per frame as float32, plus the duration in seconds.
+
+    16 kHz PCM WAV files are memory-mapped and analyzed block by block:
+    only one block is converted to float32 at a time and the samples stay
+    in the shared page cache. Anything else is decoded with `load_audio`.
+    Frames are written into the worker's reusable workspace: the returned
+    arrays are only valid until its next session.
+    """
+    import librosa
+    from prosody_emotion_analyzer import frame_workspace
+
+    workspace = frame_workspace()
+    view = open_pcm_wav(local_path)
+    if view is None or view.samplerate != sr:
+        y, sr = load_audio(local_path, sr=sr, mono=True)
+        f0_full = librosa.yin(y, fmin=50, fmax=400)
+        f0, rms = workspace.frames(f0_full.size)
+        f0[:] = f0_full
+        rms[:] = librosa.feature.rms(y=y)[0]
+        return f0, rms, librosa.get_duration(y=y, sr=sr)
+
+    # center=True framing of the whole file: one frame per hop, plus one
+    n_frames = 1 + view.frames // 512
+    f0, rms = workspace.frames(n_frames)
+    filled = 0
+    for block in iter_frame_blocks(view, frame_length=2048, hop_length=512):
+        block_f0 = librosa.yin(block, fmin=50, fmax=400, frame_length=2048, hop_length=512, center=False)
+        f0[filled:filled + block_f0.size] = block_f0
+        rms[filled:filled + block_f0.size] = librosa.feature.rms(y=block, frame_length=2048, hop_length=512, center=False)[0]
+        filled += block_f0.size
+    return f0[:filled], rms[:filled], view.duration
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Benchmark: audio decode throughput per format
+Compares `librosa.load(sr=16000, mono=True)` (previous behaviour) with
+`audio_io.load_audio` on synthetic recordings in the formats we receive:
+normalized uploads (16 kHz mono PCM16 WAV / FLAC) and raw device captures
+(44.1/48 kHz stereo) that still need resampling.
+
+Usage:
+    python pipeline/bench_audio_load.py --seconds 300 -n 5
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+import numpy as np
+import soundfile as sf
+
+sys.path.append(os.path.dirname(__file__))
+
+import librosa
+from audio_io import load_audio
+
+FORMATS = [
+    # label, extension, samplerate, channels, subtype
+    ("wav 16k mono pcm16", "wav", 16000, 1, "PCM_16"),
+    ("wav 16k mono float", "wav", 16000, 1, "FLOAT"),
+    ("flac 16k mono", "flac", 16000, 1, "PCM_16"),
+    ("wav 44.1k stereo", "wav", 44100, 2, "PCM_16"),
+    ("wav 48k mono", "wav", 48000, 1, "PCM_16"),
+]
+
+
+def synth(path: str, seconds: float, sr: int, channels: int, subtype: str):
+    """Speech-like signal: a gliding harmonic tone with syllable-rate amplitude modulation."""
+    t = np.arange(int(seconds * sr), dtype=np.float32) / sr
+    f0 = 140 + 30 * np.sin(2 * np.pi * 0.3 * t)
+    phase = 2 * np.pi * np.cumsum(f0) / sr
+    y = sum(np.sin(k * phase) / k for k in range(1, 5)) * (0.5 + 0.5 * np.sin(2 * np.pi * 4 * t)) * 0.2
+    data = np.stack([y] * channels, axis=1) if channels > 1 else y
+    sf.write(path, data, sr, subtype=subtype)
+
+
+def timed(fn, path: str, n: int):
+    samples = []
+    for _ in range(n):
+        start = time.perf_counter()
+        y, _ = fn(path)
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples), y
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--seconds", type=float, default=300, help="Duration of each synthetic file")
+    parser.add_argument("-n", type=int, default=5, help="Runs per format (median reported)")
+    args = parser.parse_args()
+
+    print(f"🏁 {args.seconds:.0f}s files, median of {args.n} runs\n")
+    print(f"  {'format':<20s} {'size':>8s} {'librosa':>10s} {'audio_io':>10s} {'speedup':>8s} {'x realtime':>11s}  max |Δ|")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for label, ext, sr, channels, subtype in FORMATS:
+            path = os.path.join(tmp, f"{label.replace(' ', '_')}.{ext}")
+            synth(path, args.seconds, sr, channels, subtype)
+            size_mb = os.path.getsize(path) / 1e6
+
+            # Warm-up (imports, resampler filters)
+            librosa.load(path, sr=16000, mono=True)
+            load_audio(path)
+
+            before, y_before = timed(lambda p: librosa.load(p, sr=16000, mono=True), path, args.n)
+            after, y_after = timed(load_audio, path, args.n)
+            n = min(len(y_before), len(y_after))
+            delta = float(np.max(np.abs(y_before[:n] - y_after[:n])))
+
+            print(
+                f"  {label:<20s} {size_mb:6.1f}MB {before * 1000:8.1f}ms {after * 1000:8.1f}ms "
+                f"{before / after:7.1f}x {args.seconds / after:10.0f}x  {delta:.1e}"
+            )
+
+
+if __name__ == "__main__":
+    main()
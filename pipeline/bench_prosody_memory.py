@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Benchmark: allocations and peak memory of prosody extraction
+Runs the per-session feature path several times in one worker thread, as
+`process_sessions` does, and reports tracemalloc peak / allocated bytes for:
+
+- before: librosa.load + full-signal YIN/RMS + np.mean/np.std/np.percentile
+- after:  audio_io.frame_features (memmap, blockwise) + frame_stats (float32,
+          reused FrameWorkspace)
+
+`--max-peak-mb` turns it into a regression guard (exit code 1 when the
+steady-state peak of the new path exceeds the budget).
+
+Usage:
+    python pipeline/bench_prosody_memory.py --seconds 600 --sessions 3 --max-peak-mb 16
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+import soundfile as sf
+
+sys.path.append(os.path.dirname(__file__))
+
+import librosa
+from audio_io import frame_features
+from prosody_emotion_analyzer import frame_stats
+
+MB = 1024 * 1024
+
+
+def synth(path: str, seconds: float, sr: int = 16000):
+    """Speech-like 16 kHz mono PCM16 recording (voiced syllables separated by silences)."""
+    rng = np.random.default_rng(0)
+    t = np.arange(int(seconds * sr), dtype=np.float32) / sr
+    f0 = 140 + 30 * np.sin(2 * np.pi * 0.3 * t)
+    y = np.sin(2 * np.pi * np.cumsum(f0) / sr) * np.clip(np.sin(2 * np.pi * 2.5 * t), 0, None) * 0.3
+    y += 0.005 * rng.standard_normal(t.size).astype(np.float32)
+    sf.write(path, y, sr, subtype="PCM_16")
+
+
+def before(path: str) -> dict:
+    y, sr = librosa.load(path, sr=16000, mono=True)
+    f0 = librosa.yin(y, fmin=50, fmax=400)
+    rms = librosa.feature.rms(y=y)[0]
+    f0 = f0[~np.isnan(f0)]
+    threshold = np.percentile(rms, 20)
+    pauses = rms < threshold
+    return {
+        "pitch_mean": float(np.mean(f0)),
+        "pitch_std": float(np.std(f0)),
+        "energy_mean": float(np.mean(rms)),
+        "energy_std": float(np.std(rms)),
+        "pause_count": int(np.sum((~pauses[:-1] & pauses[1:]))),
+    }
+
+
+def after(path: str) -> dict:
+    f0, rms, _ = frame_features(path)
+    return frame_stats(f0, rms)
+
+
+def measure(fn, path: str, sessions: int):
+    """Peak / allocated bytes per session (tracemalloc), and wall time."""
+    runs = []
+    for _ in range(sessions):
+        tracemalloc.start()
+        start = time.perf_counter()
+        result = fn(path)
+        elapsed = time.perf_counter() - start
+        _, peak = tracemalloc.get_traced_memory()
+        snapshot = tracemalloc.take_snapshot()
+        tracemalloc.stop()
+        retained = sum(stat.size for stat in snapshot.statistics("filename"))
+        runs.append((peak, retained, elapsed, result))
+    return runs
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--seconds", type=float, default=600, help="Duration of the synthetic session")
+    parser.add_argument("--sessions", type=int, default=3, help="Sessions analyzed in a row by the same worker")
+    parser.add_argument("--max-peak-mb", type=float, default=None, help="Fail if the new path's steady-state peak exceeds this")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "session.wav")
+        synth(path, args.seconds)
+        size_mb = os.path.getsize(path) / MB
+        print(f"🏁 {args.seconds:.0f}s session ({size_mb:.1f} MB PCM16), {args.sessions} sessions per worker\n")
+
+        # Warm-up outside measurements (imports, numba JIT caches)
+        before(path)
+
+        results = {"before": measure(before, path, args.sessions), "after": measure(after, path, args.sessions)}
+
+    print(f"  {'path':<8s} {'session':>7s} {'peak':>10s} {'retained':>10s} {'time':>9s}")
+    for label, runs in results.items():
+        for i, (peak, retained, elapsed, _) in enumerate(runs, 1):
+            print(f"  {label:<8s} {i:>7d} {peak / MB:8.1f}MB {retained / MB:8.2f}MB {elapsed * 1000:7.0f}ms")
+
+    ref, new = results["before"][-1][3], results["after"][-1][3]
+    drift = max(abs(ref[k] - new[k]) / max(abs(ref[k]), 1e-9) for k in ref)
+    steady_peak = max(peak for peak, *_ in results["after"][1:]) if args.sessions > 1 else results["after"][0][0]
+    print(f"\n📉 Steady-state peak: {results['before'][-1][0] / MB:.1f}MB → {steady_peak / MB:.1f}MB, max relative drift {drift:.1e}")
+
+    if args.max_peak_mb is not None and steady_peak / MB > args.max_peak_mb:
+        print(f"❌ Peak {steady_peak / MB:.1f}MB exceeds budget {args.max_peak_mb:.1f}MB")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
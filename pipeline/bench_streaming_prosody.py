@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Benchmark: live prosody cost per chunk and per analysis
+Feeds 20 ms chunks (the WebSocket packet size) and measures:
+
+- buffering, for many concurrent live sessions: the previous np.concatenate
+  + slice on every chunk vs `AudioRingBuffer` (fixed capacity, zero-copy
+  windows)
+- analysis CPU per emitted update for one session: YIN/RMS over the whole
+  3 s window every 1 s hop (previous) vs `StreamingProsodyAnalyzer`
+  (frames computed once, rolling window statistics)
+
+Usage:
+    python pipeline/bench_streaming_prosody.py --sessions 200 --seconds 30
+"""
+
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+sys.path.append(os.path.dirname(__file__))
+
+from prosody_emotion_analyzer import AudioRingBuffer, StreamingProsodyAnalyzer, extract_prosody_with_emotions
+
+SR = 16000
+WINDOW = 3 * SR
+HOP = 1 * SR
+CHUNK = SR // 50  # 20 ms
+
+
+class ConcatBuffer:
+    """Previous StreamingProsodyAnalyzer buffering"""
+
+    def __init__(self):
+        self.buffer = np.array([], dtype=np.float32)
+
+    def feed(self, chunk: np.ndarray) -> bool:
+        self.buffer = np.concatenate([self.buffer, chunk])
+        if len(self.buffer) >= WINDOW:
+            window = self.buffer[:WINDOW]
+            self.buffer = self.buffer[HOP:]
+            return window is not None
+        return False
+
+
+class RingBuffer:
+    def __init__(self):
+        self.buffer = AudioRingBuffer(WINDOW + 2 * SR)
+
+    def feed(self, chunk: np.ndarray) -> bool:
+        self.buffer.write(chunk)
+        if len(self.buffer) >= WINDOW:
+            window = self.buffer.window(WINDOW)
+            self.buffer.consume(HOP)
+            return window is not None
+        return False
+
+
+def run(factory, sessions: int, seconds: float, chunk: np.ndarray, trace: bool):
+    buffers = [factory() for _ in range(sessions)]
+    n_chunks = int(seconds * SR / CHUNK)
+
+    if trace:
+        tracemalloc.start()
+    start = time.perf_counter()
+    windows = 0
+    for _ in range(n_chunks):
+        # Interleaved like concurrent WebSockets on one instance
+        for buffer in buffers:
+            windows += buffer.feed(chunk)
+    elapsed = time.perf_counter() - start
+    if trace:
+        allocated = sum(stat.size for stat in tracemalloc.take_snapshot().statistics("filename"))
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        return peak, allocated
+
+    return elapsed / (n_chunks * sessions) * 1e6, windows
+
+
+def speech(seconds: float) -> np.ndarray:
+    rng = np.random.default_rng(0)
+    t = np.arange(int(seconds * SR), dtype=np.float32) / SR
+    f0 = 140 + 30 * np.sin(2 * np.pi * 0.3 * t)
+    y = np.sin(2 * np.pi * np.cumsum(f0) / SR) * np.clip(np.sin(2 * np.pi * 2.5 * t), 0, None) * 0.3
+    return (y + 0.005 * rng.standard_normal(t.size)).astype(np.float32)
+
+
+def analysis_cost(y: np.ndarray):
+    """CPU ms per emitted update, full-window (previous) vs incremental."""
+    extract_prosody_with_emotions(y[:WINDOW], SR)  # warm-up (lazy imports, caches)
+    start = time.process_time()
+    updates = 0
+    for end in range(WINDOW, y.size + 1, HOP):
+        extract_prosody_with_emotions(y[end - WINDOW:end], SR)
+        updates += 1
+    full = (time.process_time() - start) / updates * 1000
+
+    analyzer = StreamingProsodyAnalyzer(sample_rate=SR)
+    start = time.process_time()
+    emitted = 0
+    for offset in range(0, y.size, CHUNK):
+        emitted += analyzer.add_audio_chunk(y[offset:offset + CHUNK]) is not None
+    incremental = (time.process_time() - start) / emitted * 1000
+    return full, incremental, updates
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sessions", type=int, default=200, help="Concurrent live sessions")
+    parser.add_argument("--seconds", type=float, default=30, help="Audio streamed per session")
+    args = parser.parse_args()
+
+    chunk = np.random.default_rng(0).standard_normal(CHUNK).astype(np.float32) * 0.1
+    print(f"🏁 {args.sessions} sessions × {args.seconds:.0f}s of 20 ms chunks\n")
+
+    for label, factory in (("concatenate", ConcatBuffer), ("ring buffer", RingBuffer)):
+        per_chunk_us, windows = run(factory, args.sessions, args.seconds, chunk, trace=False)
+        # Second pass under tracemalloc (slower): allocations made while streaming
+        peak, live = run(factory, args.sessions, args.seconds, chunk, trace=True)
+        print(
+            f"  {label:<12s} {per_chunk_us:6.2f}µs/chunk  allocated while streaming: "
+            f"peak {peak / 1e6:6.1f}MB, live {live / 1e6:6.1f}MB  ({windows} windows)"
+        )
+
+    full, incremental, updates = analysis_cost(speech(args.seconds))
+    print(f"\n🎭 Analysis ({updates} updates): full window {full:.2f}ms/update, incremental {incremental:.2f}ms/update (x{full / incremental:.1f})")
+
+
+if __name__ == "__main__":
+    main()
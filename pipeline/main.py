@@ -6,12 +6,17 @@ Orchestrates Speech-to-Text, Prosody Analysis, NLU, and Report Generation
 
 import os
 import json
+import argparse
 import datetime as dt
-import sys
+import random
+import tempfile
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from google.api_core.exceptions import NotFound, PreconditionFailed
 from google.cloud import storage, speech_v2
 from google.cloud import aiplatform
 from google.cloud import logging as cloud_logging
-import librosa
 import numpy as np
 import soundfile as sf
 from jinja2 import Environment, FileSystemLoader
@@ -34,6 +39,27 @@ USER_TZ = os.environ.get("USER_TZ", "Europe/Paris")
 GEMINI_MODEL = os.environ.get("GEMINI_MODEL", "gemini-2.0-flash-exp")
 GEMINI_LOCATION = os.environ.get("GOOGLE_CLOUD_LOCATION", "global")  # Global required for Gemini 2.5
 
+# Parallel GCS reads when loading existing session artifacts (--fuse-only)
+FUSE_READ_CONCURRENCY = int(os.environ.get("FUSE_READ_CONCURRENCY", "16"))
+
+# Optimistic-concurrency retries on the weekly aggregate (generation preconditions)
+AGGREGATE_MAX_RETRIES = int(os.environ.get("AGGREGATE_MAX_RETRIES", "8"))
+TOP_HIGHLIGHTS = 6
+
+# Debounced fusion: per-week request marker + lease (shared with trigger/main.py)
+FUSION_PREFIX = os.environ.get("FUSION_PREFIX", "_fusion/")
+FUSION_LEASE_TTL = int(os.environ.get("FUSION_LEASE_TTL", "900"))
+
+# Sharded runs: one Cloud Run job task per shard, set by Cloud Run
+TASK_INDEX = int(os.environ.get("CLOUD_RUN_TASK_INDEX", "0"))
+TASK_COUNT = int(os.environ.get("CLOUD_RUN_TASK_COUNT", "1"))
+# Retries of a task keep the execution name; outside Cloud Run each run gets its own id
+RUN_ID = os.environ.get("CLOUD_RUN_EXECUTION")
+SHARDS_PREFIX = os.environ.get("SHARDS_PREFIX", "_shards/")
+
+# Sessions processed concurrently by one task (STT and Gemini calls mostly wait)
+SESSION_WORKERS = int(os.environ.get("SESSION_WORKERS", "4"))
+
 # =============================================================================
 # Initialize clients
 # =============================================================================
@@ -49,16 +75,21 @@ aiplatform.init(project=PROJECT_ID, location=GEMINI_LOCATION)
 # =============================================================================
 # Audio listing
 # =============================================================================
-def list_week_audio(prefix: str):
-    """List all audio files for a given week prefix."""
+def list_week_audio_sizes(prefix: str):
+    """List all audio files for a given week prefix as (uri, size in bytes) pairs."""
     bucket = client_storage.bucket(BUCKET_RAW)
     blobs = bucket.list_blobs(prefix=prefix)
-    uris = []
+    items = []
     for blob in blobs:
         if blob.name.endswith((".wav", ".mp3", ".flac")):
             uri = f"gs://{BUCKET_RAW}/{blob.name}"
-            uris.append(uri)
-    return uris
+            items.append((uri, blob.size or 0))
+    return items
+
+
+def list_week_audio(prefix: str):
+    """List all audio files for a given week prefix."""
+    return [uri for uri, _ in list_week_audio_sizes(prefix)]
 
 
 # =============================================================================
@@ -177,7 +208,12 @@ def stt_transcribe(gcs_uri: str, language_code="auto"):
 # File download helper
 # =============================================================================
 def download_to_tmp(gcs_uri: str) -> str:
-    """Download GCS file to /tmp and return local path."""
+    """
+    Download GCS file to a private temp file and return local path.
+    
+    The name is unique per call: session ids repeat across weeks and
+    sessions are processed concurrently. The caller removes the file.
+    """
     assert gcs_uri.startswith("gs://"), f"Invalid GCS URI: {gcs_uri}"
     
     # Parse gs://bucket/path
@@ -185,8 +221,14 @@ def download_to_tmp(gcs_uri: str) -> str:
     bucket_name = parts[0]
     blob_path = parts[1]
     
-    local = f"/tmp/{os.path.basename(blob_path)}"
-    client_storage.bucket(bucket_name).blob(blob_path).download_to_filename(local)
+    stem, ext = os.path.splitext(os.path.basename(blob_path))
+    fd, local = tempfile.mkstemp(prefix=f"{stem}-", suffix=ext)
+    os.close(fd)
+    try:
+        client_storage.bucket(bucket_name).blob(blob_path).download_to_filename(local)
+    except BaseException:
+        os.remove(local)
+        raise
     
     return local
 
@@ -202,46 +244,29 @@ def extract_prosody(local_path: str, word_count: int = 0):
     - Pauses
     - Emotional state from prosody
     """
-    from prosody_emotion_analyzer import ProsodyEmotionAnalyzer
-    
-    # Load audio
-    y, sr = librosa.load(local_path, sr=16000, mono=True)
-    duration = librosa.get_duration(y=y, sr=sr)
-    
-    # Extract pitch using YIN algorithm
-    f0 = librosa.yin(y, fmin=50, fmax=400)
-    
-    # Extract energy (RMS)
-    rms = librosa.feature.rms(y=y)[0]
-    energy_mean = float(np.mean(rms))
-    energy_std = float(np.std(rms))
-    
-    # Pitch statistics (remove NaN values)
-    f0 = f0[~np.isnan(f0)]
-    pitch_mean = float(np.mean(f0)) if f0.size > 0 else 0.0
-    pitch_std = float(np.std(f0)) if f0.size > 0 else 0.0
+    from prosody_emotion_analyzer import ProsodyEmotionAnalyzer, features_from_frames, frame_stats
+    from audio_io import frame_features
     
-    # Detect pauses (segments where RMS is below threshold)
-    threshold = np.percentile(rms, 20)
-    pauses = rms < threshold
+    sr = 16000
+    f0, rms, duration = frame_features(local_path, sr=sr)
     
-    # Count pause groups (transitions from non-pause to pause)
-    pause_count = int(np.sum((~pauses[:-1] & pauses[1:])))
-    pause_total = float(np.sum(pauses) / sr)
+    # Pitch / energy / pause statistics, float32 in the worker's buffers
+    stats = frame_stats(f0, rms)
+    voiced = stats["voiced_frames"] > 0
     
     # Emotion analysis from prosody
     analyzer = ProsodyEmotionAnalyzer()
-    emotion_result = analyzer.analyze_audio(y, sr, word_count=word_count)
+    emotion_result = analyzer.analyze_features(features_from_frames(f0, rms, duration, word_count, stats=stats))
     
     return {
         "sr": sr,
         "duration_sec": duration,
-        "pitch_mean": pitch_mean,
-        "pitch_std": pitch_std,
-        "energy_mean": energy_mean,
-        "energy_std": energy_std,
-        "pause_count": pause_count,
-        "pause_total_sec": pause_total,
+        "pitch_mean": stats["pitch_mean"] if voiced else 0.0,
+        "pitch_std": stats["pitch_std"] if voiced else 0.0,
+        "energy_mean": stats["energy_mean"],
+        "energy_std": stats["energy_std"],
+        "pause_count": stats["pause_count"],
+        "pause_total_sec": float(stats["pause_frames"] / sr),
         # Add emotion analysis
         "prosody_emotion": emotion_result["dominant_emotion"],
         "prosody_confidence": emotion_result["confidence"],
@@ -320,6 +345,272 @@ def upload_json(bucket_name, path, obj):
     )
 
 
+def read_json(bucket_name, path):
+    """Download and parse a JSON object from GCS, None if it does not exist."""
+    try:
+        return json.loads(client_storage.bucket(bucket_name).blob(path).download_as_text())
+    except NotFound:
+        return None
+
+
+# =============================================================================
+# Incremental Weekly Aggregate
+# =============================================================================
+# `<week>/weekly_aggregate.json` holds running sums plus each session's
+# contribution, so re-processing a session replaces its numbers instead of
+# counting it twice. Every update is a read-modify-write guarded by the
+# object generation (`if_generation_match`): concurrent writers retry.
+def session_contribution(nlu, prosody) -> dict:
+    """What one session adds to the weekly aggregate (NLU and/or prosody)."""
+    contribution = {}
+    if nlu is not None:
+        # Longest events first; a session never contributes more than TOP_HIGHLIGHTS
+        highlights = sorted(
+            ([len(event.split()), event] for event in nlu.get("events", [])),
+            reverse=True, key=lambda h: h[0],
+        )
+        contribution.update({
+            "emotion_index": nlu.get("emotion_index", 50.0),
+            "events": nlu.get("events", [])[:3],  # Top 3 events
+            "emotions": nlu.get("emotions", [])[:5],  # Top 5 emotions
+            "highlights": highlights[:TOP_HIGHLIGHTS],
+        })
+    if prosody is not None:
+        contribution["prosody"] = {
+            key: float(prosody.get(key, 0))
+            for key in ("pitch_mean", "energy_mean", "pause_count", "duration_sec")
+        }
+    return contribution
+
+
+def empty_aggregate(week_key: str) -> dict:
+    return {
+        "week": week_key,
+        "sessions": {},
+        "emotion": {"count": 0, "sum": 0.0},
+        "prosody": {"count": 0, "pitch_sum": 0.0, "energy_sum": 0.0, "pause_count_sum": 0.0, "duration_sum": 0.0},
+        "highlights": [],
+        "failed": {},  # dead letter: session_id → {stage, error, attempts, failed_at}
+    }
+
+
+def _apply_contribution(agg: dict, contribution: dict, sign: int):
+    if "emotion_index" in contribution:
+        agg["emotion"]["count"] += sign
+        agg["emotion"]["sum"] += sign * contribution["emotion_index"]
+    if "prosody" in contribution:
+        p = contribution["prosody"]
+        sums = agg["prosody"]
+        sums["count"] += sign
+        sums["pitch_sum"] += sign * p["pitch_mean"]
+        sums["energy_sum"] += sign * p["energy_mean"]
+        sums["pause_count_sum"] += sign * p["pause_count"]
+        sums["duration_sum"] += sign * p["duration_sec"]
+
+
+def aggregate_add(agg: dict, session_id: str, contribution: dict):
+    """Add (or replace) one session's contribution in O(1)."""
+    previous = agg["sessions"].get(session_id)
+    if previous is not None:
+        _apply_contribution(agg, previous, -1)
+    agg.setdefault("failed", {}).pop(session_id, None)
+    agg["sessions"][session_id] = contribution
+    _apply_contribution(agg, contribution, +1)
+    
+    if previous is not None and previous.get("highlights"):
+        # Replaced highlights may be in the current top-K: recompute from sessions
+        candidates = [h for c in agg["sessions"].values() for h in c.get("highlights", [])]
+    else:
+        candidates = agg["highlights"] + contribution.get("highlights", [])
+    candidates.sort(reverse=True, key=lambda h: h[0])
+    agg["highlights"] = candidates[:TOP_HIGHLIGHTS]
+
+
+def weekly_from_aggregate(agg: dict) -> dict:
+    """Weekly report object (same shape as the full fusion) from the running sums."""
+    emotion = agg["emotion"]
+    sums = agg["prosody"]
+    n_prosody = sums["count"]
+    
+    session_summaries = [
+        {
+            "session_id": session_id,
+            "emotion_index": c.get("emotion_index", 50.0),
+            "events": c.get("events", []),
+            "emotions": c.get("emotions", []),
+        }
+        for session_id, c in agg["sessions"].items()
+        if "emotion_index" in c
+    ]
+    
+    return {
+        "week": agg["week"],
+        "user_tz": USER_TZ,
+        "sessions_count": len(agg["sessions"]),
+        "emotion_index": round(emotion["sum"] / emotion["count"], 1) if emotion["count"] else 50.0,
+        # TODO: Compare with last week to determine trend
+        "trend": "flat",
+        "session_summaries": session_summaries,
+        "highlights": [h[1] for h in agg["highlights"]],
+        # Sessions left out of this report (see their checkpoint.json to resume)
+        "failed_sessions": [{"session_id": sid, **failure} for sid, failure in agg.get("failed", {}).items()],
+        "prosody_summary": {
+            "pitch_mean": sums["pitch_sum"] / n_prosody if n_prosody else 0,
+            "energy_mean": sums["energy_sum"] / n_prosody if n_prosody else 0,
+            "pause_rate": (sums["pause_count_sum"] / n_prosody) / max(1, sums["duration_sum"]) if n_prosody else 0,
+        },
+    }
+
+
+def _backoff(attempt: int):
+    time.sleep(random.uniform(0, min(2.0, 0.05 * 2 ** attempt)))
+
+
+def _update_aggregate(week_key: str, mutate):
+    """
+    Read-modify-write `weekly_aggregate.json` with generation preconditions.
+    
+    Returns:
+        (aggregate, generation written)
+    """
+    bucket = client_storage.bucket(BUCKET_ANALYTICS)
+    path = f"{week_key}/weekly_aggregate.json"
+    
+    for attempt in range(AGGREGATE_MAX_RETRIES):
+        current = bucket.get_blob(path)
+        try:
+            if current is None:
+                agg, generation = empty_aggregate(week_key), 0  # 0 = must not exist yet
+            else:
+                agg, generation = json.loads(current.download_as_text()), current.generation
+            
+            mutate(agg)
+            agg["updated_at"] = dt.datetime.now(dt.timezone.utc).isoformat()
+            
+            blob = bucket.blob(path)
+            blob.upload_from_string(
+                json.dumps(agg, ensure_ascii=False),
+                content_type="application/json",
+                if_generation_match=generation,
+            )
+            return agg, blob.generation
+        except (PreconditionFailed, NotFound):
+            # Another writer got there first: reload and re-apply
+            _backoff(attempt)
+    
+    raise RuntimeError(f"Weekly aggregate for {week_key} still contended after {AGGREGATE_MAX_RETRIES} attempts")
+
+
+def _publish_weekly_report(week_key: str, weekly: dict, aggregate_generation: int):
+    """
+    Write `weekly_report.json` unless a newer aggregate already produced it.
+    
+    The report carries the aggregate generation it was built from, so two
+    writers finishing out of order cannot leave a stale report behind.
+    """
+    bucket = client_storage.bucket(BUCKET_ANALYTICS)
+    path = f"{week_key}/weekly_report.json"
+    
+    for attempt in range(AGGREGATE_MAX_RETRIES):
+        current = bucket.get_blob(path)
+        published = int((current.metadata or {}).get("aggregate_generation", 0)) if current else 0
+        if published > aggregate_generation:
+            return
+        
+        blob = bucket.blob(path)
+        blob.metadata = {"aggregate_generation": str(aggregate_generation)}
+        try:
+            blob.upload_from_string(
+                json.dumps(weekly, ensure_ascii=False, indent=2),
+                content_type="application/json",
+                if_generation_match=current.generation if current else 0,
+            )
+            return
+        except PreconditionFailed:
+            _backoff(attempt)
+    
+    print(f"    ⚠️  weekly_report.json for {week_key} not refreshed (contended), next update will rewrite it")
+
+
+def update_weekly_aggregate(week_key: str, session_id: str, nlu=None, prosody=None) -> dict:
+    """
+    Fold one finished session into the week's aggregate and refresh the report JSON.
+    
+    Constant number of GCS calls per session, whatever the size of the week.
+    """
+    contribution = session_contribution(nlu, prosody)
+    agg, generation = _update_aggregate(
+        week_key, lambda agg: aggregate_add(agg, session_id, contribution)
+    )
+    weekly = weekly_from_aggregate(agg)
+    _publish_weekly_report(week_key, weekly, generation)
+    return weekly
+
+
+def record_session_failure(week_key: str, session_id: str, audio_uri: str, stage: str, error: str) -> dict:
+    """Put a failed session on the week's dead-letter list (kept until it succeeds)."""
+    def mutate(agg):
+        failures = agg.setdefault("failed", {})
+        previous = failures.get(session_id, {})
+        failures[session_id] = {
+            "audio_uri": audio_uri,
+            "stage": stage,
+            "error": error[:500],
+            "attempts": previous.get("attempts", 0) + 1,
+            "failed_at": dt.datetime.now(dt.timezone.utc).isoformat(),
+        }
+    
+    agg, generation = _update_aggregate(week_key, mutate)
+    weekly = weekly_from_aggregate(agg)
+    _publish_weekly_report(week_key, weekly, generation)
+    return weekly
+
+
+# =============================================================================
+# Existing session artifacts (fusion-only mode)
+# =============================================================================
+def load_session_artifacts(week_key: str):
+    """
+    Read the NLU and prosody artifacts already written for every session of a week.
+    
+    One listing of `<week>/` in the analytics bucket, then all
+    `events_emotions.json` / `prosody_features.json` are downloaded concurrently.
+    
+    Returns:
+        (session_ids, emotions, prosodies) sorted by session id
+    """
+    bucket = client_storage.bucket(BUCKET_ANALYTICS)
+    wanted = ("events_emotions.json", "prosody_features.json")
+    
+    paths = []
+    session_ids = set()
+    for blob in bucket.list_blobs(prefix=f"{week_key}/"):
+        parts = blob.name.split("/")
+        # <week>/<session_id>/<artifact>.json (skip weekly_report.json & co)
+        if len(parts) == 3 and parts[2] in wanted:
+            paths.append(blob.name)
+            session_ids.add(parts[1])
+    
+    with ThreadPoolExecutor(max_workers=FUSE_READ_CONCURRENCY) as pool:
+        docs = list(pool.map(lambda path: read_json(BUCKET_ANALYTICS, path), paths))
+    
+    emotions = []
+    prosodies = []
+    for path, doc in sorted(zip(paths, docs), key=lambda item: item[0]):
+        if doc is None:
+            continue
+        doc.setdefault("session_id", path.split("/")[1])
+        if path.endswith("events_emotions.json"):
+            # Artifacts written by /v1/ingest/finish have no score yet
+            if "emotion_index" not in doc:
+                doc["emotion_index"] = round(compute_index(doc.get("emotions", [])), 1)
+            emotions.append(doc)
+        else:
+            prosodies.append(doc)
+    
+    return sorted(session_ids), emotions, prosodies
+
+
 # =============================================================================
 # Report Generation
 # =============================================================================
@@ -350,141 +641,47 @@ def render_weekly_report(week_key: str, sessions, emotion_index, trend, prosody_
 
 
 # =============================================================================
-# Main Pipeline
+# Fusion & Weekly Report
 # =============================================================================
-def main():
+def fuse_week(week_key: str, emotions, prosodies):
     """
-    Main orchestration function.
-    Accepts week key as argument (e.g., 2025-W41).
-    """
-    # Parse week key from command line
-    week_key = sys.argv[1] if len(sys.argv) > 1 else dt.date.today().strftime("%G-W%V")
-    
-    print(f"🚀 Starting Mental Journal Pipeline for week: {week_key}")
-    print(f"📍 Project: {PROJECT_ID}, Region: {REGION}")
-    
-    # List audio files for the week
-    prefix = f"{week_key}/"
-    uris = list_week_audio(prefix)
-    print(f"🎵 Found {len(uris)} audio files under {prefix}")
+    Aggregate per-session NLU and prosody results into the weekly report.
     
-    if len(uris) == 0:
-        print("⚠️  No audio files found. Exiting.")
-        return
-    
-    # Process each audio file
-    transcripts = []
-    prosodies = []
-    emotions = []
-    
-    for i, uri in enumerate(uris, 1):
-        print(f"\n📝 Processing file {i}/{len(uris)}: {uri}")
-        
-        # Extract session ID from filename
-        sid = os.path.splitext(os.path.basename(uri))[0]
-        
-        # 1. Speech-to-Text
-        print(f"  🎤 Transcribing...")
-        text, words = stt_transcribe(uri)
-        transcript_obj = {
-            "session_id": sid,
-            "audio_uri": uri,
-            "language_code": "fr-FR",
-            "created_at": dt.datetime.now(dt.timezone.utc).isoformat(),
-            "transcript": text,
-            "words": words,
-        }
-        transcripts.append(transcript_obj)
-        upload_json(BUCKET_ANALYTICS, f"{week_key}/{sid}/transcript.json", transcript_obj)
-        print(f"  ✅ Transcript: {len(text)} chars, {len(words)} words")
-        
-        # 2. Prosody Analysis
-        print(f"  🎵 Analyzing prosody...")
-        local = download_to_tmp(uri)
-        pf = extract_prosody(local, word_count=len(words))
-        pf.update({
-            "session_id": sid,
-            "created_at": dt.datetime.now(dt.timezone.utc).isoformat()
-        })
-        prosodies.append(pf)
-        upload_json(BUCKET_ANALYTICS, f"{week_key}/{sid}/prosody_features.json", pf)
-        print(f"  ✅ Prosody: pitch={pf['pitch_mean']:.1f}Hz, energy={pf['energy_mean']:.4f}, emotion={pf['prosody_emotion']} ({pf['prosody_confidence']:.2f})")
-        
-        # 3. NLU - Events & Emotions
-        print(f"  🧠 Extracting events & emotions...")
-        nlu = nlu_events_emotions(text)
-        
-        # Calculate emotion index for this session
-        session_score = compute_index(nlu.get("emotions", []))
-        
-        nlu.update({
-            "session_id": sid,
-            "created_at": dt.datetime.now(dt.timezone.utc).isoformat(),
-            "emotion_index": round(session_score, 1)  # Add score to each session
-        })
-        emotions.append(nlu)
-        upload_json(BUCKET_ANALYTICS, f"{week_key}/{sid}/events_emotions.json", nlu)
-        print(f"  ✅ Events: {len(nlu.get('events', []))}, Emotions: {len(nlu.get('emotions', []))}, Score: {session_score:.1f}/100")
-    
-    # =============================================================================
-    # Fusion & Weekly Report
-    # =============================================================================
+    Rebuilds the weekly aggregate from these sessions (sessions completed
+    since the snapshot are kept), uploads `weekly_report.json` and renders
+    the HTML/PDF.
+    """
     print(f"\n📊 Generating weekly report...")
     
-    # Compute emotion index for the week (average of all session scores)
-    all_scores = [e.get("emotion_index", 50.0) for e in emotions if "emotion_index" in e]
-    emotion_index = float(np.mean(all_scores)) if all_scores else 50.0
-    
-    # Collect individual session summaries with their scores
-    session_summaries = []
-    for i, nlu in enumerate(emotions):
-        session_summary = {
-            "session_id": nlu.get("session_id", f"session_{i+1}"),
-            "emotion_index": nlu.get("emotion_index", 50.0),
-            "events": nlu.get("events", [])[:3],  # Top 3 events
-            "emotions": nlu.get("emotions", [])[:5],  # Top 5 emotions
-        }
-        session_summaries.append(session_summary)
-    
-    # TODO: Compare with last week to determine trend
-    trend = "flat"
-    
-    # Aggregate prosody features
-    prosody_agg = {
-        "pitch_mean": float(np.mean([p["pitch_mean"] for p in prosodies])) if prosodies else 0,
-        "energy_mean": float(np.mean([p["energy_mean"] for p in prosodies])) if prosodies else 0,
-        "pause_rate": (
-            float(np.mean([p["pause_count"] for p in prosodies])) /
-            max(1, float(np.sum([p["duration_sec"] for p in prosodies])))
-        ) if prosodies else 0
+    nlu_by_session = {nlu.get("session_id", f"session_{i+1}"): nlu for i, nlu in enumerate(emotions)}
+    prosody_by_session = {p.get("session_id"): p for p in prosodies}
+    snapshot = {
+        session_id: session_contribution(nlu_by_session.get(session_id), prosody_by_session.get(session_id))
+        for session_id in list(nlu_by_session) + [sid for sid in prosody_by_session if sid not in nlu_by_session]
     }
     
-    # Collect and prioritize highlights (limit to 6 most important)
-    all_highlights = []
-    for session_data in emotions:
-        for event in session_data.get("events", []):
-            # Score events by length and content (longer, more detailed events are prioritized)
-            score = len(event.split())
-            all_highlights.append((score, event))
-    
-    # Sort by score (descending) and take top 6
-    all_highlights.sort(reverse=True, key=lambda x: x[0])
-    top_highlights = [h[1] for h in all_highlights[:6]]
+    def rebuild(agg):
+        newer = {sid: c for sid, c in agg["sessions"].items() if sid not in snapshot}
+        # Dead letters are only cleared by a successful run of the session:
+        # partial artifacts of a failed session stay out of the report
+        failed = agg.get("failed", {})
+        previous = set(agg["sessions"])
+        agg.clear()
+        agg.update(empty_aggregate(week_key))
+        for session_id, contribution in {**snapshot, **newer}.items():
+            if session_id in failed and session_id not in previous:
+                continue
+            aggregate_add(agg, session_id, contribution)
+        agg["failed"] = failed
     
-    # Create weekly report object
-    weekly = {
-        "week": week_key,
-        "user_tz": USER_TZ,
-        "sessions_count": len(uris),
-        "emotion_index": round(emotion_index, 1),
-        "trend": trend,
-        "session_summaries": session_summaries,  # Individual session details with scores
-        "highlights": top_highlights,
-        "prosody_summary": prosody_agg,
-    }
+    agg, generation = _update_aggregate(week_key, rebuild)
+    weekly = weekly_from_aggregate(agg)
+    trend = weekly["trend"]
+    prosody_agg = weekly["prosody_summary"]
+    session_summaries = weekly["session_summaries"]
     
     # Upload weekly report JSON
-    upload_json(BUCKET_ANALYTICS, f"{week_key}/weekly_report.json", weekly)
+    _publish_weekly_report(week_key, weekly, generation)
     
     # Generate HTML/PDF reports
     html_path, pdf_path = render_weekly_report(
@@ -508,7 +705,526 @@ def main():
     for summary in session_summaries:
         print(f"   • {summary['session_id']}: {summary['emotion_index']}/100")
     print(f"📊 Sessions Processed: {weekly['sessions_count']}")
+    for failure in weekly["failed_sessions"]:
+        print(f"   ⚠️  {failure['session_id']} left out: failed at {failure['stage']} ({failure['error']})")
     print(f"📄 Reports uploaded to: gs://{BUCKET_REPORTS}/{week_key}/")
+    
+    return weekly
+
+
+# =============================================================================
+# Single session
+# =============================================================================
+class SessionFailed(Exception):
+    """A session failed at one stage; its completed stages stay checkpointed."""
+    
+    def __init__(self, session_id: str, stage: str, error: Exception):
+        super().__init__(f"{session_id} failed at {stage}: {error}")
+        self.session_id = session_id
+        self.stage = stage
+        self.error = error
+
+
+def session_id_from_uri(uri: str) -> str:
+    return os.path.splitext(os.path.basename(uri))[0]
+
+
+def load_checkpoint(week_key: str, sid: str) -> dict:
+    return read_json(BUCKET_ANALYTICS, f"{week_key}/{sid}/checkpoint.json") or {"session_id": sid, "stages": {}}
+
+
+def save_checkpoint(week_key: str, checkpoint: dict):
+    upload_json(BUCKET_ANALYTICS, f"{week_key}/{checkpoint['session_id']}/checkpoint.json", checkpoint)
+
+
+def process_audio(week_key: str, uri: str):
+    """
+    Run STT, prosody and NLU for one audio file and write its artifacts.
+    
+    `<week>/<sid>/checkpoint.json` is written after each completed stage;
+    a rerun reuses the artifacts of completed stages and resumes at the
+    first missing one. The audio generation is checkpointed too: a
+    re-uploaded file starts over.
+    
+    Returns:
+        (transcript, prosody, nlu) objects as uploaded
+    
+    Raises:
+        SessionFailed: with the stage that failed
+    """
+    # Extract session ID from filename
+    sid = session_id_from_uri(uri)
+    bucket_name, blob_path = uri[5:].split("/", 1)
+    audio = client_storage.bucket(bucket_name).get_blob(blob_path)
+    
+    checkpoint = load_checkpoint(week_key, sid)
+    if audio is not None and checkpoint.get("audio_generation") not in (None, audio.generation):
+        print(f"  ♻️  Audio re-uploaded since last run, starting over")
+        checkpoint["stages"] = {}
+    checkpoint.update({"audio_uri": uri, "audio_generation": audio.generation if audio else None})
+    checkpoint.pop("error", None)
+    
+    def done(stage: str, artifact: str):
+        """Artifact of a checkpointed stage, None if the stage has to run."""
+        if stage not in checkpoint["stages"]:
+            return None
+        obj = read_json(BUCKET_ANALYTICS, f"{week_key}/{sid}/{artifact}")
+        if obj is not None:
+            print(f"  ⏭️  {stage}: reusing checkpointed {artifact}")
+        return obj
+    
+    def complete(stage: str):
+        checkpoint["stages"][stage] = dt.datetime.now(dt.timezone.utc).isoformat()
+        save_checkpoint(week_key, checkpoint)
+    
+    stage = "stt"
+    try:
+        # 1. Speech-to-Text
+        transcript_obj = done("stt", "transcript.json")
+        if transcript_obj is None:
+            print(f"  🎤 Transcribing...")
+            text, words = stt_transcribe(uri)
+            transcript_obj = {
+                "session_id": sid,
+                "audio_uri": uri,
+                "language_code": "fr-FR",
+                "created_at": dt.datetime.now(dt.timezone.utc).isoformat(),
+                "transcript": text,
+                "words": words,
+            }
+            upload_json(BUCKET_ANALYTICS, f"{week_key}/{sid}/transcript.json", transcript_obj)
+            print(f"  ✅ Transcript: {len(text)} chars, {len(words)} words")
+            complete("stt")
+        text, words = transcript_obj["transcript"], transcript_obj["words"]
+        
+        # 2. Prosody Analysis
+        stage = "prosody"
+        pf = done("prosody", "prosody_features.json")
+        if pf is None:
+            print(f"  🎵 Analyzing prosody...")
+            local = download_to_tmp(uri)
+            try:
+                pf = extract_prosody(local, word_count=len(words))
+            finally:
+                os.remove(local)
+            pf.update({
+                "session_id": sid,
+                "created_at": dt.datetime.now(dt.timezone.utc).isoformat()
+            })
+            upload_json(BUCKET_ANALYTICS, f"{week_key}/{sid}/prosody_features.json", pf)
+            print(f"  ✅ Prosody: pitch={pf['pitch_mean']:.1f}Hz, energy={pf['energy_mean']:.4f}, emotion={pf['prosody_emotion']} ({pf['prosody_confidence']:.2f})")
+            complete("prosody")
+        
+        # 3. NLU - Events & Emotions
+        stage = "nlu"
+        nlu = done("nlu", "events_emotions.json")
+        if nlu is None:
+            print(f"  🧠 Extracting events & emotions...")
+            nlu = nlu_events_emotions(text)
+            
+            # Calculate emotion index for this session
+            session_score = compute_index(nlu.get("emotions", []))
+            
+            nlu.update({
+                "session_id": sid,
+                "created_at": dt.datetime.now(dt.timezone.utc).isoformat(),
+                "emotion_index": round(session_score, 1)  # Add score to each session
+            })
+            upload_json(BUCKET_ANALYTICS, f"{week_key}/{sid}/events_emotions.json", nlu)
+            print(f"  ✅ Events: {len(nlu.get('events', []))}, Emotions: {len(nlu.get('emotions', []))}, Score: {session_score:.1f}/100")
+            complete("nlu")
+        
+        # 4. Running weekly aggregate (dashboard is current after each session)
+        # Always re-applied: replacing a session's contribution is idempotent
+        stage = "aggregate"
+        update_weekly_aggregate(week_key, sid, nlu=nlu, prosody=pf)
+        complete("aggregate")
+    except Exception as e:
+        checkpoint["error"] = {"stage": stage, "message": str(e)[:500]}
+        try:
+            save_checkpoint(week_key, checkpoint)
+        except Exception as checkpoint_error:
+            print(f"  ⚠️  Could not save checkpoint: {checkpoint_error}")
+        raise SessionFailed(sid, stage, e) from e
+    
+    return transcript_obj, pf, nlu
+
+
+def dead_letter(week_key: str, uri: str, failure: SessionFailed):
+    """Log a failed session and put it on the week's dead-letter list."""
+    print(f"  ❌ {failure}")
+    try:
+        record_session_failure(week_key, failure.session_id, uri, failure.stage, str(failure.error))
+    except Exception as e:
+        print(f"  ⚠️  Could not record failure of {failure.session_id}: {e}")
+
+
+# =============================================================================
+# Session scheduling (longest first across workers)
+# =============================================================================
+def process_sessions(week_key: str, items, workers: int = SESSION_WORKERS):
+    """
+    Process (uri, size) pairs on a pool of `workers`, longest first (LPT).
+    
+    Each worker picks the largest remaining file as soon as it is free, so
+    a long recording never starts last and stretches the run. The makespan
+    LPT predicts (largest worker load × observed seconds per byte) is logged
+    next to the actual one.
+    
+    Returns:
+        (results, failures): (transcript, prosody, nlu) per successful session
+        in dispatch order, and the SessionFailed of the others
+    """
+    ordered = sorted(items, key=lambda item: (-item[1], item[0]))
+    workers = max(1, min(workers, len(ordered)))
+    _, loads = partition_sessions(ordered, workers)
+    
+    def run(i, uri):
+        print(f"\n📝 Processing file {i}/{len(ordered)}: {uri}")
+        started = time.monotonic()
+        try:
+            return process_audio(week_key, uri), time.monotonic() - started
+        except SessionFailed as failure:
+            # One bad session (STT timeout, unparsable Gemini output...) must not sink the week
+            dead_letter(week_key, uri, failure)
+            return failure, time.monotonic() - started
+    
+    print(f"🗂️  Scheduling {len(ordered)} sessions longest-first on {workers} workers")
+    started = time.monotonic()
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        outcomes = list(pool.map(run, range(1, len(ordered) + 1), [uri for uri, _ in ordered]))
+    makespan = time.monotonic() - started
+    
+    results = [outcome for outcome, _ in outcomes if not isinstance(outcome, SessionFailed)]
+    failures = [outcome for outcome, _ in outcomes if isinstance(outcome, SessionFailed)]
+    
+    total_bytes = sum(size for _, size in ordered)
+    busy = sum(elapsed for _, elapsed in outcomes)
+    if total_bytes and busy:
+        rate = busy / total_bytes
+        print(f"⏱️  Makespan: predicted {max(loads) * rate:.1f}s (LPT), actual {makespan:.1f}s, "
+              f"{busy:.1f}s of work on {workers} workers")
+    
+    return results, failures
+
+
+# =============================================================================
+# Debounced fusion (lease held by the fuse-only job)
+# =============================================================================
+# The upload trigger touches `_fusion/<week>/requested` for every new session
+# and starts one `--fuse-only --debounce N` job per week, guarded by the
+# `_fusion/<week>/lease` object (created with if_generation_match=0). The job
+# waits until no request arrived for N seconds, fuses, then releases the lease.
+def _fusion_paths(week_key: str):
+    return f"{FUSION_PREFIX}{week_key}/requested", f"{FUSION_PREFIX}{week_key}/lease"
+
+
+def request_fusion(week_key: str):
+    """Record a fusion request for the week (restarts the debounce window)."""
+    marker_path, _ = _fusion_paths(week_key)
+    client_storage.bucket(BUCKET_ANALYTICS).blob(marker_path).upload_from_string(
+        dt.datetime.now(dt.timezone.utc).isoformat(), content_type="text/plain"
+    )
+
+
+def _write_lease(blob, generation: int) -> bool:
+    expires = dt.datetime.now(dt.timezone.utc) + dt.timedelta(seconds=FUSION_LEASE_TTL)
+    try:
+        blob.upload_from_string(
+            json.dumps({"holder": os.environ.get("CLOUD_RUN_EXECUTION", "local"), "expires_at": expires.isoformat()}),
+            content_type="application/json",
+            if_generation_match=generation,
+        )
+        return True
+    except PreconditionFailed:
+        return False
+
+
+def acquire_fusion_lease(week_key: str) -> bool:
+    """Take the week's fusion lease if it is free or expired."""
+    _, lease_path = _fusion_paths(week_key)
+    bucket = client_storage.bucket(BUCKET_ANALYTICS)
+    if _write_lease(bucket.blob(lease_path), 0):
+        return True
+    
+    current = bucket.get_blob(lease_path)
+    if current is None:
+        return _write_lease(bucket.blob(lease_path), 0)
+    try:
+        expires_at = dt.datetime.fromisoformat(json.loads(current.download_as_text())["expires_at"])
+    except (NotFound, ValueError, KeyError):
+        expires_at = dt.datetime.min.replace(tzinfo=dt.timezone.utc)
+    if expires_at > dt.datetime.now(dt.timezone.utc):
+        return False
+    # Previous holder crashed: take over its expired lease
+    return _write_lease(bucket.blob(lease_path), current.generation)
+
+
+def renew_fusion_lease(week_key: str) -> bool:
+    _, lease_path = _fusion_paths(week_key)
+    current = client_storage.bucket(BUCKET_ANALYTICS).get_blob(lease_path)
+    return current is not None and _write_lease(current, current.generation)
+
+
+def release_fusion_lease(week_key: str):
+    _, lease_path = _fusion_paths(week_key)
+    try:
+        client_storage.bucket(BUCKET_ANALYTICS).blob(lease_path).delete()
+    except NotFound:
+        pass
+
+
+def _last_fusion_request(week_key: str):
+    marker_path, _ = _fusion_paths(week_key)
+    marker = client_storage.bucket(BUCKET_ANALYTICS).get_blob(marker_path)
+    return marker.updated if marker is not None else None
+
+
+def debounced_fuse(week_key: str, debounce: int):
+    """
+    Fuse once no fusion request arrived for `debounce` seconds (lease holder only).
+    
+    Requests that land while fusing or right after the lease is released
+    trigger another round instead of being lost.
+    """
+    while True:
+        # Wait for a quiet window
+        while True:
+            last = _last_fusion_request(week_key)
+            quiet = (dt.datetime.now(dt.timezone.utc) - last).total_seconds() if last else debounce
+            if quiet >= debounce:
+                break
+            if not renew_fusion_lease(week_key):
+                print("⚠️  Fusion lease lost, another job took over. Exiting.")
+                return
+            wait = debounce - quiet
+            print(f"⏳ Last fusion request {quiet:.0f}s ago, waiting {wait:.0f}s...")
+            time.sleep(wait)
+        
+        started = dt.datetime.now(dt.timezone.utc)
+        fuse_only(week_key)
+        release_fusion_lease(week_key)
+        
+        last = _last_fusion_request(week_key)
+        if last is None or last <= started:
+            return
+        # New sessions arrived meanwhile: run another round if nobody else will
+        if not acquire_fusion_lease(week_key):
+            return
+        print(f"🔁 New fusion request for {week_key} since {started.isoformat()}, fusing again")
+
+
+# =============================================================================
+# Sharding (one Cloud Run job task per shard)
+# =============================================================================
+def partition_sessions(items, count: int):
+    """
+    Split (uri, size) pairs into `count` shards of similar total size.
+    
+    Deterministic: every task computes the same partition from the same
+    listing (largest file first, ties broken by uri, to the lightest shard).
+    Audio size stands in for duration (same encoding for every upload).
+    """
+    shards = [[] for _ in range(count)]
+    loads = [0] * count
+    for uri, size in sorted(items, key=lambda item: (-item[1], item[0])):
+        target = min(range(count), key=lambda i: (loads[i], i))
+        shards[target].append(uri)
+        loads[target] += size
+    return shards, loads
+
+
+def _shards_prefix(week_key: str, run_id: str) -> str:
+    return f"{SHARDS_PREFIX}{week_key}/{run_id}/"
+
+
+def mark_shard_done(week_key: str, run_id: str, index: int, session_ids):
+    """Record that this shard's artifacts are written."""
+    upload_json(BUCKET_ANALYTICS, f"{_shards_prefix(week_key, run_id)}{index}.json", {
+        "task_index": index,
+        "session_ids": session_ids,
+        "finished_at": dt.datetime.now(dt.timezone.utc).isoformat(),
+    })
+
+
+def claim_reduce(week_key: str, run_id: str, count: int, index: int) -> bool:
+    """
+    True for exactly one task, once all `count` shards are done.
+    
+    Every task checks after marking itself done; the last one to finish
+    sees all markers, and the `reduce` object (if_generation_match=0)
+    keeps two tasks finishing together from both fusing. The object holds
+    the claiming task: a retry of that task (crashed while fusing) claims
+    it again.
+    """
+    prefix = _shards_prefix(week_key, run_id)
+    bucket = client_storage.bucket(BUCKET_ANALYTICS)
+    done = [b for b in bucket.list_blobs(prefix=prefix) if b.name.endswith(".json")]
+    if len(done) < count:
+        print(f"⏳ {len(done)}/{count} shards done, fusion left to the last shard")
+        return False
+    owner = f"{run_id}/{index}"
+    blob = bucket.blob(f"{prefix}reduce")
+    try:
+        blob.upload_from_string(owner, content_type="text/plain", if_generation_match=0)
+        return True
+    except PreconditionFailed:
+        try:
+            return blob.download_as_text() == owner
+        except NotFound:
+            return False
+
+
+# =============================================================================
+# Main Pipeline
+# =============================================================================
+def main():
+    """
+    Main orchestration function.
+    Accepts week key as argument (e.g., 2025-W41), and `--fuse-only` to skip
+    per-session processing and rebuild the report from existing artifacts
+    (`--debounce N` when started by the upload trigger), or `--audio URI` to
+    process a single session. Runs with several tasks each process one shard
+    of the week; the last shard to finish runs the fusion.
+    """
+    args = parse_args()
+    week_key = args.week
+    
+    if args.audio:
+        # Single session (upload trigger): fusion is requested, not run here
+        print(f"🚀 Processing single session for week {week_key}: {args.audio}")
+        try:
+            process_audio(week_key, args.audio)
+        except SessionFailed as failure:
+            dead_letter(week_key, args.audio, failure)
+            raise
+        request_fusion(week_key)
+        # No fusion pending (it finished while this session was processed): run it here
+        if acquire_fusion_lease(week_key):
+            debounced_fuse(week_key, args.debounce)
+        return
+    
+    if args.fuse_only:
+        if args.debounce:
+            debounced_fuse(week_key, args.debounce)
+        else:
+            fuse_only(week_key)
+        return
+    
+    print(f"🚀 Starting Mental Journal Pipeline for week: {week_key}")
+    print(f"📍 Project: {PROJECT_ID}, Region: {REGION}")
+    
+    # List audio files for the week
+    prefix = f"{week_key}/"
+    items = list_week_audio_sizes(prefix)
+    print(f"🎵 Found {len(items)} audio files under {prefix}")
+    
+    if len(items) == 0:
+        print("⚠️  No audio files found. Exiting.")
+        return
+    
+    sharded = args.task_count > 1
+    if sharded:
+        shards, loads = partition_sessions(items, args.task_count)
+        shard = set(shards[args.task_index])
+        items = [item for item in items if item[0] in shard]
+        print(f"🧩 Shard {args.task_index + 1}/{args.task_count}: {len(items)} files, {loads[args.task_index] / 1e6:.1f} MB")
+    
+    # Process each audio file
+    results, failures = process_sessions(week_key, items, args.workers)
+    transcripts = [transcript_obj for transcript_obj, _, _ in results]
+    prosodies = [pf for _, pf, _ in results]
+    emotions = [nlu for _, _, nlu in results]
+    
+    if failures:
+        print(f"\n⚠️  {len(failures)}/{len(items)} sessions failed, rerun the week to resume them:")
+        for failure in failures:
+            print(f"   • {failure}")
+    
+    if sharded:
+        # Reduce: the last shard to finish fuses from the artifacts in GCS
+        mark_shard_done(week_key, args.run_id, args.task_index, [t["session_id"] for t in transcripts])
+        if claim_reduce(week_key, args.run_id, args.task_count, args.task_index):
+            print(f"\n🧮 All {args.task_count} shards done, fusing week {week_key}")
+            fuse_only(week_key)
+        return
+    
+    # =============================================================================
+    # Fusion & Weekly Report
+    # =============================================================================
+    fuse_week(week_key, emotions, prosodies)
+
+
+def fuse_only(week_key: str):
+    """Rebuild the weekly report from existing session artifacts (no STT, Gemini or audio)."""
+    print(f"🚀 Fusion-only run for week: {week_key}")
+    
+    session_ids, emotions, prosodies = load_session_artifacts(week_key)
+    print(f"📂 Loaded {len(emotions)} NLU + {len(prosodies)} prosody artifacts for {len(session_ids)} sessions")
+    
+    if not session_ids:
+        print("⚠️  No processed sessions found. Exiting.")
+        return
+    
+    fuse_week(week_key, emotions, prosodies)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Mental Journal weekly pipeline")
+    parser.add_argument(
+        "week",
+        nargs="?",
+        default=dt.date.today().strftime("%G-W%V"),
+        help="Week key, e.g. 2025-W41 (default: current ISO week)",
+    )
+    parser.add_argument(
+        "--fuse-only",
+        action="store_true",
+        help="Only aggregate existing per-session artifacts and render the report",
+    )
+    parser.add_argument(
+        "--debounce",
+        type=int,
+        default=0,
+        help="Hold the week's fusion lease and wait for N quiet seconds before fusing",
+    )
+    parser.add_argument(
+        "--audio",
+        help="Process only this audio file (gs://...) then request a debounced fusion",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=SESSION_WORKERS,
+        help="Sessions processed concurrently, longest first (default: SESSION_WORKERS)",
+    )
+    parser.add_argument(
+        "--task-index",
+        type=int,
+        default=TASK_INDEX,
+        help="Shard processed by this task (default: CLOUD_RUN_TASK_INDEX)",
+    )
+    parser.add_argument(
+        "--task-count",
+        type=int,
+        default=TASK_COUNT,
+        help="Number of shards of the week (default: CLOUD_RUN_TASK_COUNT)",
+    )
+    parser.add_argument(
+        "--run-id",
+        default=RUN_ID,
+        help="Identifier shared by the shards of one run (default: CLOUD_RUN_EXECUTION, "
+        "required for sharded runs outside Cloud Run)",
+    )
+    args = parser.parse_args(argv)
+    if not 0 <= args.task_index < max(args.task_count, 1):
+        parser.error(f"--task-index must be in [0, {args.task_count})")
+    if args.run_id is None:
+        # Shard markers of an earlier run must not count for this one
+        if args.task_count > 1:
+            parser.error("--run-id is required for sharded runs outside Cloud Run (same value for every shard)")
+        args.run_id = f"local-{uuid.uuid4().hex[:12]}"
+    return args
 
 
 if __name__ == "__main__":
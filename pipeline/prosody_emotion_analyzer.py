@@ -12,7 +12,10 @@ Basé sur la recherche en phonétique affective:
 """
 
 import numpy as np
-from typing import Dict, List, Tuple, Optional
+import math
+import threading
+from collections import deque
+from typing import Dict, List, Tuple, Optional, Sequence
 from dataclasses import dataclass
 from enum import Enum
 
@@ -106,6 +109,131 @@ class ProsodyEmotionAnalyzer:
         self.baseline_pitch = baseline_pitch
         self.baseline_energy = baseline_energy
     
+    # Colonnes de `emotion_scores` (à égalité de score, la première l'emporte)
+    EMOTIONS = (
+        EmotionLabel.JOY, EmotionLabel.SADNESS, EmotionLabel.ANGER, EmotionLabel.STRESS,
+        EmotionLabel.CALM, EmotionLabel.FEAR, EmotionLabel.EXCITEMENT, EmotionLabel.NEUTRAL
+    )
+    
+    def emotion_scores(
+        self,
+        features: Sequence[ProsodyFeatures],
+        baseline_pitch: Optional[np.ndarray] = None
+    ) -> np.ndarray:
+        """
+        Scores normalisés de chaque émotion pour un lot de features
+        
+        Les règles sont évaluées en une passe vectorisée sur tout le lot
+        (une ligne par fenêtre), ce qui partage le coût Python entre les
+        sessions live analysées ensemble.
+        
+        Args:
+            features: Features prosodiques extraites
+            baseline_pitch: Pitch de référence par ligne (défaut: self.baseline_pitch)
+            
+        Returns:
+            Matrice (len(features), len(EMOTIONS))
+        """
+        def column(name: str) -> np.ndarray:
+            return np.array([getattr(f, name) for f in features], dtype=np.float64)
+        
+        def points(*rules) -> np.ndarray:
+            score = np.zeros(len(features))
+            for condition, weight in rules:
+                score += np.where(condition, weight, 0.0)
+            return score
+        
+        # Calcul des ratios normalisés
+        baseline = self.baseline_pitch if baseline_pitch is None else baseline_pitch
+        pitch_ratio = column("pitch_mean") / baseline
+        pitch_var_ratio = column("pitch_std") / self.BASELINE_PITCH_STD
+        energy_ratio = column("energy_mean") / self.baseline_energy
+        pause_ratio = column("pause_ratio")
+        pitch_range = column("pitch_range")
+        pause_count = column("pause_count")
+        duration = column("duration_sec")
+        speaking_rate = np.array([f.speaking_rate or 0.0 for f in features], dtype=np.float64)
+        
+        scores = np.stack([
+            # === JOIE ===
+            # Pitch moyen-haut, variation élevée, énergie haute, pauses courtes
+            points(
+                (pitch_ratio > 1.1, 0.3),       # Pitch 10% au-dessus baseline
+                (pitch_var_ratio > 1.3, 0.3),   # Variation importante
+                (energy_ratio > 1.2, 0.25),     # Énergie élevée
+                (pause_ratio < 0.12, 0.15),     # Peu de pauses
+            ),
+            # === TRISTESSE ===
+            # Pitch bas, variation faible, énergie basse, pauses longues
+            points(
+                (pitch_ratio < 0.9, 0.35),      # Pitch bas
+                (pitch_var_ratio < 0.7, 0.25),  # Variation faible
+                (energy_ratio < 0.8, 0.25),     # Énergie basse
+                (pause_ratio > 0.20, 0.15),     # Pauses longues
+            ),
+            # === COLÈRE ===
+            # Pitch très élevé, variation haute, énergie très haute, rythme rapide
+            points(
+                (pitch_ratio > 1.25, 0.3),      # Pitch très haut
+                (pitch_range > 100, 0.25),      # Grande amplitude
+                (energy_ratio > 1.5, 0.3),      # Énergie très élevée
+                (pause_ratio < 0.10, 0.15),     # Très peu de pauses (parle vite)
+            ),
+            # === STRESS/ANXIÉTÉ ===
+            # Pitch élevé, variation haute, rythme irrégulier, pauses courtes
+            points(
+                (pitch_ratio > 1.15, 0.25),                 # Pitch élevé
+                (pitch_var_ratio > 1.4, 0.35),              # Variation très haute (voix tremblante)
+                (pause_count > duration * 0.8, 0.25),       # Pauses fréquentes
+                (energy_ratio > 1.1, 0.15),                 # Énergie légèrement élevée
+            ),
+            # === CALME ===
+            # Pitch stable, variation faible, énergie modérée, pauses régulières
+            points(
+                ((0.95 < pitch_ratio) & (pitch_ratio < 1.05), 0.3),      # Pitch proche baseline
+                (pitch_var_ratio < 1.0, 0.3),                           # Variation faible
+                ((0.85 < energy_ratio) & (energy_ratio < 1.15), 0.25),   # Énergie modérée
+                ((0.12 < pause_ratio) & (pause_ratio < 0.18), 0.15),     # Pauses normales
+            ),
+            # === PEUR ===
+            # Pitch élevé, variation haute, énergie moyenne-haute, pauses irrégulières
+            points(
+                (pitch_ratio > 1.2, 0.3),                   # Pitch élevé
+                (pitch_var_ratio > 1.3, 0.25),              # Variation haute
+                (energy_ratio > 1.0, 0.2),                  # Énergie élevée
+                (pause_count > duration * 0.6, 0.25),       # Pauses fréquentes
+            ),
+            # === EXCITATION ===
+            # Pitch moyen-haut, variation haute, énergie très haute, rythme rapide
+            points(
+                (pitch_ratio > 1.1, 0.25),      # Pitch élevé
+                (pitch_var_ratio > 1.2, 0.25),  # Variation haute
+                (energy_ratio > 1.4, 0.35),     # Énergie très haute
+                (speaking_rate > 150, 0.15),    # Parle vite
+            ),
+            # === NEUTRE ===
+            # Tous les indicateurs proches de la baseline
+            points(
+                ((0.9 < pitch_ratio) & (pitch_ratio < 1.1), 0.3),
+                ((0.8 < pitch_var_ratio) & (pitch_var_ratio < 1.2), 0.3),
+                ((0.9 < energy_ratio) & (energy_ratio < 1.1), 0.25),
+                ((0.10 < pause_ratio) & (pause_ratio < 0.20), 0.15),
+            ),
+        ], axis=1)
+        
+        # Normalisation des scores (softmax-like)
+        total = np.zeros(len(features))
+        for i in range(scores.shape[1]):
+            total += scores[:, i]
+        positive = total > 0
+        scores[positive] /= total[positive, None]
+        return scores
+    
+    def top_emotions(self, scores: np.ndarray, top_n: int = 3) -> List[EmotionScore]:
+        """EmotionScore triés par confiance à partir d'une ligne de `emotion_scores`"""
+        order = np.argsort(-scores, kind="stable")[:top_n]
+        return [EmotionScore(label=self.EMOTIONS[i], confidence=float(scores[i])) for i in order]
+    
     def analyze_emotions(
         self, 
         features: ProsodyFeatures,
@@ -121,145 +249,57 @@ class ProsodyEmotionAnalyzer:
         Returns:
             Liste des émotions détectées avec scores de confiance
         """
-        scores = {}
-        
-        # Calcul des ratios normalisés
-        pitch_ratio = features.pitch_mean / self.baseline_pitch
-        pitch_var_ratio = features.pitch_std / self.BASELINE_PITCH_STD
-        energy_ratio = features.energy_mean / self.baseline_energy
-        pause_ratio = features.pause_ratio
-        
-        # === JOIE ===
-        # Pitch moyen-haut, variation élevée, énergie haute, pauses courtes
-        joy_score = 0.0
-        if pitch_ratio > 1.1:  # Pitch 10% au-dessus baseline
-            joy_score += 0.3
-        if pitch_var_ratio > 1.3:  # Variation importante
-            joy_score += 0.3
-        if energy_ratio > 1.2:  # Énergie élevée
-            joy_score += 0.25
-        if pause_ratio < 0.12:  # Peu de pauses
-            joy_score += 0.15
-        scores[EmotionLabel.JOY] = joy_score
-        
-        # === TRISTESSE ===
-        # Pitch bas, variation faible, énergie basse, pauses longues
-        sadness_score = 0.0
-        if pitch_ratio < 0.9:  # Pitch bas
-            sadness_score += 0.35
-        if pitch_var_ratio < 0.7:  # Variation faible
-            sadness_score += 0.25
-        if energy_ratio < 0.8:  # Énergie basse
-            sadness_score += 0.25
-        if pause_ratio > 0.20:  # Pauses longues
-            sadness_score += 0.15
-        scores[EmotionLabel.SADNESS] = sadness_score
-        
-        # === COLÈRE ===
-        # Pitch très élevé, variation haute, énergie très haute, rythme rapide
-        anger_score = 0.0
-        if pitch_ratio > 1.25:  # Pitch très haut
-            anger_score += 0.3
-        if features.pitch_range > 100:  # Grande amplitude
-            anger_score += 0.25
-        if energy_ratio > 1.5:  # Énergie très élevée
-            anger_score += 0.3
-        if pause_ratio < 0.10:  # Très peu de pauses (parle vite)
-            anger_score += 0.15
-        scores[EmotionLabel.ANGER] = anger_score
-        
-        # === STRESS/ANXIÉTÉ ===
-        # Pitch élevé, variation haute, rythme irrégulier, pauses courtes
-        stress_score = 0.0
-        if pitch_ratio > 1.15:  # Pitch élevé
-            stress_score += 0.25
-        if pitch_var_ratio > 1.4:  # Variation très haute (voix tremblante)
-            stress_score += 0.35
-        if features.pause_count > features.duration_sec * 0.8:  # Pauses fréquentes
-            stress_score += 0.25
-        if energy_ratio > 1.1:  # Énergie légèrement élevée
-            stress_score += 0.15
-        scores[EmotionLabel.STRESS] = stress_score
-        
-        # === CALME ===
-        # Pitch stable, variation faible, énergie modérée, pauses régulières
-        calm_score = 0.0
-        if 0.95 < pitch_ratio < 1.05:  # Pitch proche baseline
-            calm_score += 0.3
-        if pitch_var_ratio < 1.0:  # Variation faible
-            calm_score += 0.3
-        if 0.85 < energy_ratio < 1.15:  # Énergie modérée
-            calm_score += 0.25
-        if 0.12 < pause_ratio < 0.18:  # Pauses normales
-            calm_score += 0.15
-        scores[EmotionLabel.CALM] = calm_score
-        
-        # === PEUR ===
-        # Pitch élevé, variation haute, énergie moyenne-haute, pauses irrégulières
-        fear_score = 0.0
-        if pitch_ratio > 1.2:  # Pitch élevé
-            fear_score += 0.3
-        if pitch_var_ratio > 1.3:  # Variation haute
-            fear_score += 0.25
-        if energy_ratio > 1.0:  # Énergie élevée
-            fear_score += 0.2
-        if features.pause_count > features.duration_sec * 0.6:  # Pauses fréquentes
-            fear_score += 0.25
-        scores[EmotionLabel.FEAR] = fear_score
-        
-        # === EXCITATION ===
-        # Pitch moyen-haut, variation haute, énergie très haute, rythme rapide
-        excitement_score = 0.0
-        if pitch_ratio > 1.1:  # Pitch élevé
-            excitement_score += 0.25
-        if pitch_var_ratio > 1.2:  # Variation haute
-            excitement_score += 0.25
-        if energy_ratio > 1.4:  # Énergie très haute
-            excitement_score += 0.35
-        if features.speaking_rate and features.speaking_rate > 150:  # Parle vite
-            excitement_score += 0.15
-        scores[EmotionLabel.EXCITEMENT] = excitement_score
-        
-        # === NEUTRE ===
-        # Tous les indicateurs proches de la baseline
-        neutral_score = 0.0
-        if 0.9 < pitch_ratio < 1.1:
-            neutral_score += 0.3
-        if 0.8 < pitch_var_ratio < 1.2:
-            neutral_score += 0.3
-        if 0.9 < energy_ratio < 1.1:
-            neutral_score += 0.25
-        if 0.10 < pause_ratio < 0.20:
-            neutral_score += 0.15
-        scores[EmotionLabel.NEUTRAL] = neutral_score
+        return self.top_emotions(self.emotion_scores([features])[0], top_n)
+    
+    def analyze_features(self, features: ProsodyFeatures, top_n: int = 3) -> dict:
+        """
+        Résumé plat utilisé par le pipeline batch (`extract_prosody`)
         
-        # Normalisation des scores (softmax-like)
-        total = sum(scores.values())
-        if total > 0:
-            scores = {k: v/total for k, v in scores.items()}
+        Returns:
+            Dict avec dominant_emotion (label), confidence, top_emotions et
+            vocal_characteristics
+        """
+        summary = self.get_emotional_state_summary(features, top_n=top_n)
+        return {
+            "dominant_emotion": summary["dominant_emotion"]["label"],
+            "confidence": summary["dominant_emotion"]["confidence"],
+            "top_emotions": summary["all_emotions"],
+            "vocal_characteristics": summary["vocal_characteristics"],
+        }
+    
+    def analyze_audio(self, y: np.ndarray, sr: int, word_count: Optional[int] = None) -> dict:
+        """
+        Analyse un signal complet (voir `analyze_features` pour le format)
         
-        # Conversion en EmotionScore et tri par confiance
-        emotion_scores = [
-            EmotionScore(label=label, confidence=score)
-            for label, score in scores.items()
-        ]
-        emotion_scores.sort(key=lambda x: x.confidence, reverse=True)
+        Args:
+            y: Signal audio mono
+            sr: Sample rate
+            word_count: Nombre de mots (optionnel, pour calcul speaking rate)
+        """
+        import librosa
         
-        return emotion_scores[:top_n]
+        f0 = librosa.yin(y, fmin=50, fmax=400)
+        rms = librosa.feature.rms(y=y)[0]
+        features = features_from_frames(f0, rms, len(y) / sr, word_count)
+        return self.analyze_features(features)
     
     def get_dominant_emotion(self, features: ProsodyFeatures) -> EmotionScore:
         """Retourne l'émotion dominante"""
         emotions = self.analyze_emotions(features, top_n=1)
         return emotions[0] if emotions else EmotionScore(EmotionLabel.NEUTRAL, 0.5)
     
-    def get_emotional_state_summary(self, features: ProsodyFeatures) -> dict:
+    def get_emotional_state_summary(self, features: ProsodyFeatures, top_n: int = 3) -> dict:
         """
         Retourne un résumé complet de l'état émotionnel
         
         Returns:
             Dict avec émotions détectées + interprétations des features
         """
-        emotions = self.analyze_emotions(features, top_n=3)
+        return self.summarize(features, self.emotion_scores([features])[0], top_n)
+    
+    def summarize(self, features: ProsodyFeatures, scores: np.ndarray, top_n: int = 3) -> dict:
+        """Résumé de `get_emotional_state_summary` à partir d'une ligne de `emotion_scores`"""
+        emotions = self.top_emotions(scores, top_n)
         dominant = emotions[0]
         
         # Interprétation qualitative des features
@@ -350,6 +390,164 @@ class ProsodyEmotionAnalyzer:
             return "very_fast"
 
 
+# =============================================================================
+# Statistiques par frame (float32, buffers réutilisés)
+# =============================================================================
+class FrameWorkspace:
+    """
+    Buffers float32/bool réutilisés d'une session à l'autre par un worker
+    
+    `f0` et `rms` reçoivent les features par frame, les autres servent de
+    brouillon à `frame_stats`. Ils ne grandissent que si une session a plus
+    de frames que les précédentes : en régime établi, aucune allocation
+    proportionnelle à la durée et aucun passage en float64.
+    """
+    
+    def __init__(self, capacity: int = 0):
+        self.capacity = 0
+        self.reserve(capacity)
+    
+    def reserve(self, n: int):
+        if n <= self.capacity:
+            return
+        self.capacity = max(n, int(self.capacity * 1.5))
+        self.f0 = np.empty(self.capacity, dtype=np.float32)
+        self.rms = np.empty(self.capacity, dtype=np.float32)
+        self.voiced = np.empty(self.capacity, dtype=np.float32)
+        self.scratch = np.empty(self.capacity, dtype=np.float32)
+        self.mask = np.empty(self.capacity, dtype=bool)
+        self.transitions = np.empty(self.capacity, dtype=bool)
+    
+    def frames(self, n: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Vues (f0, rms) de n frames à remplir"""
+        self.reserve(n)
+        return self.f0[:n], self.rms[:n]
+
+
+_local = threading.local()
+
+
+def frame_workspace() -> FrameWorkspace:
+    """Workspace du thread courant (un par worker de `process_sessions`)"""
+    workspace = getattr(_local, "workspace", None)
+    if workspace is None:
+        workspace = _local.workspace = FrameWorkspace()
+    return workspace
+
+
+def _mean_std(x: np.ndarray, scratch: np.ndarray) -> Tuple[float, float]:
+    """Moyenne et écart-type en float32, sans temporaire (deux passes comme np.std)"""
+    mean = x.mean(dtype=np.float32)
+    d = scratch[:x.size]
+    np.subtract(x, mean, out=d)
+    np.multiply(d, d, out=d)
+    return float(mean), float(np.sqrt(d.mean(dtype=np.float32)))
+
+
+def _percentile(x: np.ndarray, q: float, scratch: np.ndarray) -> float:
+    """np.percentile(x, q) (interpolation linéaire) par partition en place dans `scratch`"""
+    a = scratch[:x.size]
+    np.copyto(a, x)
+    index = q / 100 * (x.size - 1)
+    lo = int(index)
+    hi = min(lo + 1, x.size - 1)
+    a.partition([lo, hi] if hi != lo else lo)
+    return float(a[lo] + (a[hi] - a[lo]) * (index - lo))
+
+
+def frame_stats(f0: np.ndarray, rms: np.ndarray, workspace: Optional[FrameWorkspace] = None) -> dict:
+    """
+    Statistiques de pitch, d'énergie et de pauses à partir des features par frame
+    
+    Args:
+        f0: Pitch par frame (YIN, NaN = non voisé)
+        rms: Énergie RMS par frame (non vide)
+        workspace: Buffers de travail (par défaut celui du thread courant)
+    
+    Returns:
+        Dict avec frames, voiced_frames, pitch_* (None sans frame voisée), energy_*,
+        pause_threshold, pause_frames et pause_count
+    """
+    ws = workspace or frame_workspace()
+    ws.reserve(max(f0.size, rms.size))
+    
+    # Pitch: frames voisées uniquement
+    mask = ws.mask[:f0.size]
+    np.isnan(f0, out=mask)
+    np.logical_not(mask, out=mask)
+    voiced = ws.voiced[:int(np.count_nonzero(mask))]
+    np.compress(mask, f0, out=voiced)
+    
+    stats = {"frames": rms.size, "voiced_frames": voiced.size}
+    if voiced.size:
+        stats["pitch_mean"], stats["pitch_std"] = _mean_std(voiced, ws.scratch)
+        stats["pitch_min"], stats["pitch_max"] = float(voiced.min()), float(voiced.max())
+    else:
+        stats.update(pitch_mean=None, pitch_std=None, pitch_min=None, pitch_max=None)
+    
+    # Energy (RMS)
+    stats["energy_mean"], stats["energy_std"] = _mean_std(rms, ws.scratch)
+    stats["energy_max"] = float(rms.max())
+    
+    # Pauses: frames sous le 20e percentile d'énergie, comptées par début de pause
+    threshold = _percentile(rms, 20, ws.scratch)
+    pauses = ws.mask[:rms.size]
+    np.less(rms, threshold, out=pauses)
+    transitions = ws.transitions[:max(rms.size - 1, 0)]
+    np.greater(pauses[1:], pauses[:-1], out=transitions)
+    stats.update(
+        pause_threshold=threshold,
+        pause_frames=int(np.count_nonzero(pauses)),
+        pause_count=int(np.count_nonzero(transitions)),
+    )
+    return stats
+
+
+def features_from_frames(
+    f0: np.ndarray,
+    rms: np.ndarray,
+    duration: float,
+    word_count: Optional[int] = None,
+    stats: Optional[dict] = None
+) -> ProsodyFeatures:
+    """
+    Construit les ProsodyFeatures à partir des features par frame
+    
+    Args:
+        f0: Pitch par frame (YIN, NaN = non voisé)
+        rms: Énergie RMS par frame
+        duration: Durée du signal (secondes)
+        word_count: Nombre de mots (optionnel, pour calcul speaking rate)
+        stats: Résultat de `frame_stats(f0, rms)` s'il est déjà calculé
+    """
+    return features_from_stats(stats or frame_stats(f0, rms), duration, word_count)
+
+
+def features_from_stats(stats: dict, duration: float, word_count: Optional[int] = None) -> ProsodyFeatures:
+    """ProsodyFeatures à partir d'un résultat de `frame_stats` (ou de `RollingFrameStats.stats`)"""
+    pitch_mean = stats["pitch_mean"] if stats["voiced_frames"] else 150.0
+    pitch_std = stats["pitch_std"] if stats["voiced_frames"] else 0.0
+    pitch_range = stats["pitch_max"] - stats["pitch_min"] if stats["voiced_frames"] else 0.0
+    
+    # Speaking rate (if word count available)
+    speaking_rate = None
+    if word_count and duration > 0:
+        speaking_rate = (word_count / duration) * 60  # words per minute
+    
+    return ProsodyFeatures(
+        pitch_mean=pitch_mean,
+        pitch_std=pitch_std,
+        pitch_range=pitch_range,
+        energy_mean=stats["energy_mean"],
+        energy_std=stats["energy_std"],
+        energy_max=stats["energy_max"],
+        duration_sec=duration,
+        speaking_rate=speaking_rate,
+        pause_count=stats["pause_count"],
+        pause_ratio=stats["pause_frames"] / stats["frames"]
+    )
+
+
 def extract_prosody_with_emotions(
     y: np.ndarray,
     sr: int,
@@ -372,84 +570,290 @@ def extract_prosody_with_emotions(
     
     # Extract pitch using YIN algorithm
     f0 = librosa.yin(y, fmin=50, fmax=400)
-    f0_clean = f0[~np.isnan(f0)]
-    
-    pitch_mean = float(np.mean(f0_clean)) if f0_clean.size > 0 else 150.0
-    pitch_std = float(np.std(f0_clean)) if f0_clean.size > 0 else 0.0
-    pitch_min = float(np.min(f0_clean)) if f0_clean.size > 0 else pitch_mean
-    pitch_max = float(np.max(f0_clean)) if f0_clean.size > 0 else pitch_mean
-    pitch_range = pitch_max - pitch_min
     
     # Extract energy (RMS)
     rms = librosa.feature.rms(y=y)[0]
-    energy_mean = float(np.mean(rms))
-    energy_std = float(np.std(rms))
-    energy_max = float(np.max(rms))
     
-    # Detect pauses
-    threshold = np.percentile(rms, 20)
-    pauses = rms < threshold
-    pause_count = int(np.sum((~pauses[:-1] & pauses[1:])))
-    pause_frames = np.sum(pauses)
-    pause_ratio = float(pause_frames / len(rms))
+    features = features_from_frames(f0, rms, duration, word_count)
     
-    # Speaking rate (if word count available)
-    speaking_rate = None
-    if word_count and duration > 0:
-        speaking_rate = (word_count / duration) * 60  # words per minute
-    
-    # Create ProsodyFeatures object
-    features = ProsodyFeatures(
-        pitch_mean=pitch_mean,
-        pitch_std=pitch_std,
-        pitch_range=pitch_range,
-        energy_mean=energy_mean,
-        energy_std=energy_std,
-        energy_max=energy_max,
-        duration_sec=duration,
-        speaking_rate=speaking_rate,
-        pause_count=pause_count,
-        pause_ratio=pause_ratio
-    )
-    
-    # Analyze emotions
-    analyzer = ProsodyEmotionAnalyzer(baseline_pitch=pitch_mean * 0.95)  # Auto-calibration
-    emotional_state = analyzer.get_emotional_state_summary(features)
-    
-    return emotional_state
+    return calibrated_emotional_state(features)
+
+
+def calibrated_emotional_state(features: ProsodyFeatures) -> dict:
+    """Résumé émotionnel avec baseline de pitch auto-calibrée sur le locuteur"""
+    return calibrated_emotional_states([features])[0]
+
+
+def calibrated_emotional_states(features: Sequence[ProsodyFeatures]) -> List[dict]:
+    """`calibrated_emotional_state` d'un lot de fenêtres, scores calculés en une passe"""
+    baselines = [f.pitch_mean * 0.95 for f in features]  # Auto-calibration
+    scores = ProsodyEmotionAnalyzer().emotion_scores(features, baseline_pitch=np.array(baselines, dtype=np.float64))
+    return [
+        ProsodyEmotionAnalyzer(baseline_pitch=baseline).summarize(f, row)
+        for f, baseline, row in zip(features, baselines, scores)
+    ]
 
 
 # =============================================================================
 # Real-time streaming support
 # =============================================================================
+class AudioRingBuffer:
+    """
+    Buffer circulaire float32 de capacité fixe, fenêtres sans copie
+    
+    Chaque échantillon est écrit deux fois (à `i` et `i + capacity`) : toute
+    plage d'au plus `capacity` échantillons est donc contiguë en mémoire et
+    `window()` renvoie une vue, jamais une copie. Un ajout coûte O(chunk) et
+    n'alloue rien.
+    """
+    
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self._data = np.zeros(2 * capacity, dtype=np.float32)
+        self.start = 0    # index absolu du plus ancien échantillon gardé
+        self.end = 0      # index absolu du prochain échantillon écrit
+        self.dropped = 0  # échantillons perdus faute de place (consommateur en retard)
+    
+    def __len__(self) -> int:
+        return self.end - self.start
+    
+    def write(self, chunk: np.ndarray):
+        """Ajoute `chunk` ; au-delà de la capacité, les plus anciens échantillons sont écrasés"""
+        chunk = np.asarray(chunk, dtype=np.float32).reshape(-1)  # no copy for float32 input
+        n = chunk.size
+        if n > self.capacity:
+            self.end += n - self.capacity
+            chunk = chunk[-self.capacity:]
+            n = self.capacity
+        
+        data, capacity = self._data, self.capacity
+        offset = self.end % capacity
+        first = min(n, capacity - offset)
+        data[offset:offset + first] = chunk[:first]
+        data[capacity + offset:capacity + offset + first] = chunk[:first]
+        if first < n:
+            # Passage en fin de buffer: le reste repart au début
+            data[:n - first] = chunk[first:]
+            data[capacity:capacity + n - first] = chunk[first:]
+        self.end += n
+        
+        overflow = len(self) - self.capacity
+        if overflow > 0:
+            self.dropped += overflow
+            self.start += overflow
+    
+    def window(self, size: int) -> np.ndarray:
+        """Vue (lecture seule) sur les `size` plus anciens échantillons gardés"""
+        return self.view(self.start, self.start + size)
+    
+    def view(self, begin: int, stop: int) -> np.ndarray:
+        """Vue (lecture seule) sur les échantillons d'index absolus [begin, stop)"""
+        assert self.start <= begin <= stop <= self.end, "range not buffered"
+        offset = begin % self.capacity
+        view = self._data[offset:offset + stop - begin]
+        view.flags.writeable = False
+        return view
+    
+    def consume(self, n: int):
+        """Oublie les `n` plus anciens échantillons"""
+        self.start = min(self.start + n, self.end)
+    
+    def clear(self):
+        self.start = self.end = 0
+        self.dropped = 0
+
+
+class RollingFrameStats:
+    """
+    Statistiques d'une fenêtre glissante de frames, mises à jour en O(1) amorti
+    
+    Sommes courantes pour moyennes/écarts-types, deques monotones pour les
+    min/max. Les frames entrent par `push` et sortent par `evict_before`
+    dans l'ordre de leur index.
+    """
+    
+    def __init__(self):
+        self.frames = deque()  # (index, f0, rms) des frames de la fenêtre
+        self.voiced = 0
+        self.f0_sum = self.f0_sumsq = 0.0
+        self.rms_sum = self.rms_sumsq = 0.0
+        self._f0_min = deque()  # (index, f0) croissants
+        self._f0_max = deque()  # (index, f0) décroissants
+        self._rms_max = deque()
+    
+    def __len__(self) -> int:
+        return len(self.frames)
+    
+    @staticmethod
+    def _push_monotonic(window: deque, index: int, value: float, keep):
+        while window and not keep(window[-1][1], value):
+            window.pop()
+        window.append((index, value))
+    
+    def push(self, index: int, f0: float, rms: float):
+        self.frames.append((index, f0, rms))
+        self.rms_sum += rms
+        self.rms_sumsq += rms * rms
+        self._push_monotonic(self._rms_max, index, rms, lambda kept, new: kept > new)
+        if not math.isnan(f0):
+            self.voiced += 1
+            self.f0_sum += f0
+            self.f0_sumsq += f0 * f0
+            self._push_monotonic(self._f0_min, index, f0, lambda kept, new: kept < new)
+            self._push_monotonic(self._f0_max, index, f0, lambda kept, new: kept > new)
+    
+    def evict_before(self, index: int):
+        while self.frames and self.frames[0][0] < index:
+            _, f0, rms = self.frames.popleft()
+            self.rms_sum -= rms
+            self.rms_sumsq -= rms * rms
+            if not math.isnan(f0):
+                self.voiced -= 1
+                self.f0_sum -= f0
+                self.f0_sumsq -= f0 * f0
+        for window in (self._f0_min, self._f0_max, self._rms_max):
+            while window and window[0][0] < index:
+                window.popleft()
+    
+    def stats(self, rms_window: np.ndarray) -> dict:
+        """
+        Même format que `frame_stats` pour la fenêtre courante
+        
+        Le seuil de pause (20e percentile) n'est pas incrémental : il est
+        calculé sur `rms_window`, les ~100 valeurs RMS de la fenêtre.
+        """
+        n = len(self.frames)
+        rms_mean = self.rms_sum / n
+        stats = {
+            "frames": n,
+            "voiced_frames": self.voiced,
+            "energy_mean": rms_mean,
+            "energy_std": math.sqrt(max(0.0, self.rms_sumsq / n - rms_mean * rms_mean)),
+            "energy_max": self._rms_max[0][1],
+        }
+        if self.voiced:
+            f0_mean = self.f0_sum / self.voiced
+            stats.update(
+                pitch_mean=f0_mean,
+                pitch_std=math.sqrt(max(0.0, self.f0_sumsq / self.voiced - f0_mean * f0_mean)),
+                pitch_min=self._f0_min[0][1],
+                pitch_max=self._f0_max[0][1],
+            )
+        else:
+            stats.update(pitch_mean=None, pitch_std=None, pitch_min=None, pitch_max=None)
+        
+        threshold = np.percentile(rms_window, 20)
+        pauses = rms_window < threshold
+        stats.update(
+            pause_threshold=float(threshold),
+            pause_frames=int(np.count_nonzero(pauses)),
+            pause_count=int(np.count_nonzero(pauses[1:] > pauses[:-1])),
+        )
+        return stats
+
+
 class StreamingProsodyAnalyzer:
     """
     Analyseur prosodique pour streaming audio en temps réel
     
-    Accumule les chunks audio et analyse par fenêtres glissantes
+    Le pitch (YIN) et l'énergie (RMS) sont calculés une seule fois par
+    frame, à l'arrivée de l'audio, puis gardés dans un buffer de frames :
+    chaque analyse (fenêtre glissante) ne fait que mettre à jour des
+    statistiques courantes au lieu de ré-analyser toute la fenêtre.
     """
     
+    FRAME_LENGTH = 2048
+    HOP_LENGTH = 512
+    
     def __init__(
         self,
         sample_rate: int = 16000,
         window_duration: float = 3.0,  # secondes
-        hop_duration: float = 1.0      # secondes
+        hop_duration: float = 1.0,     # secondes
+        max_backlog: float = 2.0,      # secondes d'audio traitées par passe
+        max_hop_duration: Optional[float] = None
     ):
         """
         Args:
             sample_rate: Taux d'échantillonnage de l'audio
             window_duration: Durée de la fenêtre d'analyse
             hop_duration: Décalage entre chaque analyse
+            max_backlog: Taille maximale d'une passe de calcul des frames
+                (les gros chunks sont découpés, rien n'est abandonné)
+            max_hop_duration: Hop maximal accepté par `set_hop_duration`
+                (défaut: hop_duration)
         """
         self.sr = sample_rate
         self.window_size = int(window_duration * sample_rate)
         self.hop_size = int(hop_duration * sample_rate)
+        self.max_hop_size = max(self.hop_size, int((max_hop_duration or 0) * sample_rate))
+        
+        # Audio pas encore découpé en frames: au plus un hop d'analyse
+        # (frames calculées une fois par fenêtre) plus une passe ; au-delà
+        # (hop étiré), les frames sont calculées dès que le buffer est plein
+        self.piece_size = max(int(max_backlog * sample_rate), self.HOP_LENGTH)
+        self.buffer = AudioRingBuffer(self.FRAME_LENGTH + self.hop_size + self.piece_size)
+        
+        # Frames des fenêtres à venir, indexées par numéro de frame absolu
+        frames_capacity = (self.window_size + self.max_hop_size + self.piece_size) // self.HOP_LENGTH + 2
+        self.frame_f0 = AudioRingBuffer(frames_capacity)
+        self.frame_rms = AudioRingBuffer(frames_capacity)
+        self.window_stats = RollingFrameStats()
+        self.next_emit = self.window_size  # fin (en échantillons) de la prochaine fenêtre
+        self.window_end: Optional[int] = None  # fin de la dernière fenêtre analysée
         
-        self.buffer = np.array([], dtype=np.float32)
         self.analyzer = ProsodyEmotionAnalyzer()
         
         self.emotion_history: List[EmotionScore] = []
     
+    @property
+    def next_frame(self) -> int:
+        return self.frame_f0.end
+    
+    def _compute_frames(self):
+        """YIN + RMS sur les seules frames complètes pas encore calculées"""
+        import librosa
+        
+        available = self.buffer.end - self.next_frame * self.HOP_LENGTH
+        if available < self.FRAME_LENGTH:
+            return
+        n = 1 + (available - self.FRAME_LENGTH) // self.HOP_LENGTH
+        segment = self.buffer.window((n - 1) * self.HOP_LENGTH + self.FRAME_LENGTH)
+        
+        f0 = librosa.yin(segment, fmin=50, fmax=400,
+                         frame_length=self.FRAME_LENGTH, hop_length=self.HOP_LENGTH, center=False)
+        rms = librosa.feature.rms(y=segment, frame_length=self.FRAME_LENGTH,
+                                  hop_length=self.HOP_LENGTH, center=False)[0]
+        self.frame_f0.write(f0)
+        self.frame_rms.write(rms)
+        self.buffer.consume(n * self.HOP_LENGTH)
+    
+    def _window_frames(self, end: int) -> Tuple[int, int]:
+        """Frames [first, stop) entièrement contenues dans [end - window_size, end)"""
+        first = -(-(end - self.window_size) // self.HOP_LENGTH)
+        stop = (end - self.FRAME_LENGTH) // self.HOP_LENGTH + 1
+        return first, stop
+    
+    def _advance(self, end: int) -> dict:
+        """Fait glisser les statistiques jusqu'à la fenêtre finissant à `end`"""
+        first, stop = self._window_frames(end)
+        stats = self.window_stats
+        added = max(stats.frames[-1][0] + 1 if stats.frames else 0, first, self.frame_f0.start)
+        
+        stats.evict_before(first)
+        if added < stop:
+            f0 = self.frame_f0.view(added, stop)
+            rms = self.frame_rms.view(added, stop)
+            for i, index in enumerate(range(added, stop)):
+                stats.push(index, float(f0[i]), float(rms[i]))
+        
+        # Les frames antérieures à la fenêtre ne serviront plus
+        keep = min(first, added)
+        self.frame_f0.consume(max(0, keep - self.frame_f0.start))
+        self.frame_rms.consume(max(0, keep - self.frame_rms.start))
+        
+        return stats.stats(self.frame_rms.view(max(first, self.frame_rms.start), stop))
+    
     def add_audio_chunk(self, chunk: np.ndarray) -> Optional[dict]:
         """
         Ajoute un chunk audio et retourne l'analyse si fenêtre complète
@@ -458,32 +862,43 @@ class StreamingProsodyAnalyzer:
             chunk: Nouveau chunk audio (numpy array)
             
         Returns:
-            Analyse émotionnelle si fenêtre complète, None sinon
+            Analyse émotionnelle de la fenêtre complète la plus récente,
+            None si aucune fenêtre n'a été complétée par ce chunk
         """
-        # Ajouter au buffer
-        self.buffer = np.concatenate([self.buffer, chunk])
-        
-        # Si on a assez de données, analyser
-        if len(self.buffer) >= self.window_size:
-            # Analyser la fenêtre
-            window = self.buffer[:self.window_size]
-            result = extract_prosody_with_emotions(window, self.sr)
+        chunk = np.asarray(chunk, dtype=np.float32).reshape(-1)
+        ready = None
+        
+        for offset in range(0, chunk.size, self.piece_size):
+            # Ajouter au buffer; les frames sont calculées par lots (une passe
+            # par fenêtre, ou quand le buffer ne peut plus recevoir une passe)
+            self.buffer.write(chunk[offset:offset + self.piece_size])
+            if self.buffer.end >= self.next_emit or len(self.buffer) > self.buffer.capacity - self.piece_size:
+                self._compute_frames()
             
-            # Garder historique
-            dominant = result['dominant_emotion']
-            self.emotion_history.append(
-                EmotionScore(
-                    label=EmotionLabel(dominant['label']),
-                    confidence=dominant['confidence']
-                )
+            # Fenêtres complètes (toutes leurs frames sont calculées)
+            while self.buffer.end >= self.next_emit:
+                ready = self.next_emit
+                self.next_emit += self.hop_size
+            if ready is not None:
+                # Seule la dernière fenêtre prête est analysée
+                window_stats = self._advance(ready)
+                self.window_end = ready
+        
+        if ready is None:
+            return None
+        
+        result = calibrated_emotional_state(features_from_stats(window_stats, self.window_size / self.sr))
+        
+        # Garder historique
+        dominant = result['dominant_emotion']
+        self.emotion_history.append(
+            EmotionScore(
+                label=EmotionLabel(dominant['label']),
+                confidence=dominant['confidence']
             )
-            
-            # Décaler le buffer
-            self.buffer = self.buffer[self.hop_size:]
-            
-            return result
+        )
         
-        return None
+        return result
     
     def get_emotion_trend(self, last_n: int = 5) -> EmotionLabel:
         """
@@ -508,7 +923,58 @@ class StreamingProsodyAnalyzer:
         # Retourner la plus fréquente
         return max(counts.items(), key=lambda x: x[1])[0]
     
+    def get_emotion_summary(self) -> dict:
+        """
+        Résumé émotionnel de la session depuis le début (ou le dernier reset)
+        
+        Returns:
+            Dict avec total_analyses, emotion_distribution (part des analyses
+            par émotion dominante), dominant_emotion_overall et average_confidence
+        """
+        total = len(self.emotion_history)
+        if not total:
+            return {
+                "total_analyses": 0,
+                "emotion_distribution": {},
+                "dominant_emotion_overall": EmotionLabel.NEUTRAL.value,
+                "average_confidence": 0.0,
+            }
+        
+        counts = {}
+        for emotion in self.emotion_history:
+            counts[emotion.label.value] = counts.get(emotion.label.value, 0) + 1
+        
+        return {
+            "total_analyses": total,
+            "emotion_distribution": {label: round(n / total, 3) for label, n in counts.items()},
+            "dominant_emotion_overall": self.get_emotion_trend(last_n=total).value,
+            "average_confidence": round(sum(e.confidence for e in self.emotion_history) / total, 3),
+        }
+    
+    def set_hop_duration(self, hop_duration: float):
+        """
+        Change la cadence des analyses (appliqué après la prochaine fenêtre)
+        
+        Étirer le hop réduit le nombre d'analyses et de messages quand
+        l'instance est saturée ; borné par `max_hop_duration`.
+        """
+        self.hop_size = min(max(int(hop_duration * self.sr), self.HOP_LENGTH), self.max_hop_size)
+    
+    def drop_backlog(self):
+        """
+        Abandonne l'audio et les frames en attente, garde l'historique
+        
+        Pour un flux en retard : l'audio suivant repart comme un nouveau
+        flux (première analyse après une fenêtre complète).
+        """
+        self.buffer.clear()
+        self.frame_f0.clear()
+        self.frame_rms.clear()
+        self.window_stats = RollingFrameStats()
+        self.next_emit = self.window_size
+        self.window_end = None
+    
     def reset(self):
-        """Reset le buffer et l'historique"""
-        self.buffer = np.array([], dtype=np.float32)
+        """Reset le buffer, les frames et l'historique"""
+        self.drop_backlog()
         self.emotion_history = []
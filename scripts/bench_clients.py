@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Benchmark: client GCS par requête vs registre partagé
+Mesure la latence d'un appel type handler (`blob.exists()` sur un objet
+d'analytics) quand le client est recréé à chaque requête (ancien
+comportement) puis quand il vient du registre `api.clients`.
+
+Usage:
+    python scripts/bench_clients.py --bucket pz-analytics-... --object 2025-W42/weekly_report.json -n 50
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+
+from google.cloud import storage
+from api.clients import ClientRegistry
+
+
+def summarize(label: str, samples_ms):
+    samples = sorted(samples_ms)
+    p95 = samples[max(0, int(len(samples) * 0.95) - 1)]
+    print(
+        f"  {label:<22s} mean={statistics.mean(samples):7.1f}ms  "
+        f"p50={statistics.median(samples):7.1f}ms  p95={p95:7.1f}ms  "
+        f"max={samples[-1]:7.1f}ms"
+    )
+
+
+def per_request_client(bucket_name: str, object_name: str) -> float:
+    start = time.perf_counter()
+    client = storage.Client()
+    client.bucket(bucket_name).blob(object_name).exists()
+    return (time.perf_counter() - start) * 1000
+
+
+def shared_client(registry: ClientRegistry, bucket_name: str, object_name: str) -> float:
+    start = time.perf_counter()
+    registry.storage.bucket(bucket_name).blob(object_name).exists()
+    return (time.perf_counter() - start) * 1000
+
+
+def run(fn, n: int, concurrency: int):
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        return list(pool.map(lambda _: fn(), range(n)))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--bucket", default=os.environ.get("BUCKET_ANALYTICS", "pz-analytics-build-unicorn25par-4813"))
+    parser.add_argument("--object", default="2025-W42/weekly_report.json")
+    parser.add_argument("-n", type=int, default=50, help="Requêtes par scénario")
+    parser.add_argument("-c", "--concurrency", type=int, default=8)
+    parser.add_argument("--pool-size", type=int, default=32, help="GCS_HTTP_POOL_SIZE du registre")
+    args = parser.parse_args()
+
+    print(f"🏁 {args.n} requêtes, concurrence {args.concurrency}, gs://{args.bucket}/{args.object}\n")
+
+    before = run(lambda: per_request_client(args.bucket, args.object), args.n, args.concurrency)
+
+    registry = ClientRegistry(http_pool_size=args.pool_size)
+    registry.storage  # warm-up: credentials + première connexion
+    after = run(lambda: shared_client(registry, args.bucket, args.object), args.n, args.concurrency)
+    registry.close()
+
+    summarize("before (per request)", before)
+    summarize("after (shared pool)", after)
+    print(f"\n⚡ Speedup (mean): x{statistics.mean(before) / statistics.mean(after):.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Load test: latence des endpoints non liés pendant un listing GCS lent
+Lance en parallèle des appels `/v1/weeks` dont le listing bucket est
+artificiellement ralenti, et mesure la latence de `/health` pendant ce
+temps. Avec un event loop non bloqué, le p99 de `/health` reste au niveau
+de la baseline.
+
+Le backend GCS est remplacé (via `app.dependency_overrides`) par un bucket
+en mémoire qui simule la latence réseau : aucun credential n'est requis.
+
+Usage:
+    python scripts/bench_event_loop.py --listing-delay 2.0 --slow-requests 4 -n 200
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import statistics
+import sys
+import time
+from types import SimpleNamespace
+
+sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+
+import httpx
+from api.main import app
+from api.clients import get_storage_client
+
+logging.getLogger("httpx").setLevel(logging.WARNING)
+
+
+class SlowListing:
+    """Itérateur de listing (pages + préfixes communs) comme `HTTPIterator`"""
+
+    def __init__(self, blobs: list, prefixes: set):
+        self.blobs = blobs
+        self.prefixes = prefixes
+
+    def __iter__(self):
+        return iter(self.blobs)
+
+    @property
+    def pages(self):
+        yield self.blobs
+
+
+class SlowBucket:
+    """Bucket en mémoire dont le listing bloque comme un appel réseau lent"""
+
+    def __init__(self, delay: float):
+        self.delay = delay
+
+    def list_blobs(self, prefix=None, delimiter=None, **kwargs):
+        time.sleep(self.delay)
+        blobs = [SimpleNamespace(name=f"2025-W{w:02d}/weekly_report.json") for w in range(1, 53)]
+        if delimiter:
+            # Avec délimiteur, GCS ne renvoie que les préfixes communs
+            return SlowListing([], {f"2025-W{w:02d}/" for w in range(1, 53)})
+        return SlowListing(blobs, set())
+
+
+class SlowStorageClient:
+    def __init__(self, delay: float):
+        self._bucket = SlowBucket(delay)
+
+    def bucket(self, name):
+        return self._bucket
+
+
+def percentile(samples, pct: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct))]
+
+
+async def probe_health(client: httpx.AsyncClient, n: int, interval: float):
+    latencies = []
+    for _ in range(n):
+        start = time.perf_counter()
+        response = await client.get("/health")
+        response.raise_for_status()
+        latencies.append((time.perf_counter() - start) * 1000)
+        await asyncio.sleep(interval)
+    return latencies
+
+
+async def run(args):
+    app.dependency_overrides[get_storage_client] = lambda: SlowStorageClient(args.listing_delay)
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        await client.get("/health")  # warm-up
+        baseline = await probe_health(client, args.n, args.interval)
+
+        slow = [asyncio.create_task(client.get("/v1/weeks")) for _ in range(args.slow_requests)]
+        loaded = await probe_health(client, args.n, args.interval)
+        await asyncio.gather(*slow)
+    app.dependency_overrides.clear()
+
+    for label, samples in (("baseline", baseline), ("during slow listing", loaded)):
+        print(
+            f"  /health {label:<20s} p50={statistics.median(samples):6.2f}ms  "
+            f"p99={percentile(samples, 0.99):6.2f}ms  max={max(samples):6.2f}ms"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--listing-delay", type=float, default=2.0, help="Durée d'un listing (s)")
+    parser.add_argument("--slow-requests", type=int, default=4)
+    parser.add_argument("-n", type=int, default=200, help="Sondes /health par phase")
+    parser.add_argument("--interval", type=float, default=0.005)
+    args = parser.parse_args()
+
+    print(f"🏁 {args.slow_requests} listings de {args.listing_delay}s en vol, {args.n} sondes /health\n")
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Load test: latence de l'event loop avec N sessions live simultanées
+Chaque session envoie des chunks de 20 ms en temps réel (comme le
+WebSocket `/ws/prosody/{session_id}`) ; une sonde mesure le retard de
+réveil de l'event loop pendant ce temps :
+
+- inline : `StreamingProsodyAnalyzer.add_audio_chunk` appelé dans la
+  coroutine (comportement précédent du handler)
+- workers : chunks copiés dans le ring partagé et analysés par
+  `api.live_analysis` (processus dédiés, lots de `--batch-ms`) ; le
+  retard de traitement (`lag_ms`) des analyses est aussi relevé
+
+Usage:
+    python scripts/bench_live_prosody.py --sessions 1 4 8 --seconds 10 --workers 3 --batch-ms 5
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+
+import numpy as np
+
+sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+
+from api.live_analysis import LIVE_BATCH_MS, PIPELINE_DIR, LiveAnalysisPool
+
+sys.path.append(PIPELINE_DIR)
+from prosody_emotion_analyzer import StreamingProsodyAnalyzer
+
+SR = 16000
+CHUNK = SR // 50  # 20 ms
+
+
+def speech(seconds: float, seed: int) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    t = np.arange(int(seconds * SR), dtype=np.float32) / SR
+    f0 = 140 + 30 * np.sin(2 * np.pi * 0.3 * t + seed)
+    y = np.sin(2 * np.pi * np.cumsum(f0) / SR) * np.clip(np.sin(2 * np.pi * 2.5 * t), 0, None) * 0.3
+    return (y + 0.005 * rng.standard_normal(t.size)).astype(np.float32)
+
+
+def percentile(samples, pct: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct))]
+
+
+async def probe(stop: asyncio.Event, interval: float = 0.005):
+    """Retards de réveil de l'event loop (ms) au-delà de `interval`"""
+    lags = []
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(interval)
+        lags.append(max(0.0, (time.perf_counter() - start - interval) * 1000))
+    return lags
+
+
+async def stream_inline(y: np.ndarray):
+    analyzer = StreamingProsodyAnalyzer(sample_rate=SR)
+    for offset in range(0, y.size, CHUNK):
+        analyzer.add_audio_chunk(y[offset:offset + CHUNK])
+        await asyncio.sleep(CHUNK / SR)
+
+
+async def stream_workers(pool: LiveAnalysisPool, y: np.ndarray, session_id: str):
+    session = pool.open(session_id)
+    lags = []
+
+    async def sender():
+        while True:
+            update = await pool.next_update(session)
+            if update["type"] == "emotion_update":
+                lags.append(update["lag_ms"])
+
+    task = asyncio.create_task(sender())
+    for offset in range(0, y.size, CHUNK):
+        pool.submit(session, y[offset:offset + CHUNK])
+        await asyncio.sleep(CHUNK / SR)
+    await pool.close(session)
+    task.cancel()
+    return lags
+
+
+async def scenario(streams) -> tuple[list, list]:
+    """Retards de l'event loop, et `lag_ms` des analyses envoyées (workers)"""
+    stop = asyncio.Event()
+    sonde = asyncio.create_task(probe(stop))
+    results = await asyncio.gather(*streams)
+    stop.set()
+    return await sonde, [lag for lags in results if lags for lag in lags]
+
+
+async def run(args):
+    signals = [speech(args.seconds, i) for i in range(max(args.sessions))]
+    StreamingProsodyAnalyzer(sample_rate=SR).add_audio_chunk(signals[0][:3 * SR])  # warm-up (imports, JIT)
+
+    pool = LiveAnalysisPool(workers=args.workers, batch_ms=args.batch_ms)
+    await pool.start()
+    try:
+        for n in args.sessions:
+            for label in ("inline", "workers"):
+                if label == "inline":
+                    streams = [stream_inline(y) for y in signals[:n]]
+                else:
+                    streams = [stream_workers(pool, y, f"bench-{i}") for i, y in enumerate(signals[:n])]
+                lags, update_lags = await scenario(streams)
+                print(
+                    f"  {n:3d} sessions  {label:<8s} loop lag p50={statistics.median(lags):6.2f}ms  "
+                    f"p99={percentile(lags, 0.99):7.2f}ms  max={max(lags):7.2f}ms"
+                    + (f"  update lag p50={statistics.median(update_lags):.0f}ms "
+                       f"p99={percentile(update_lags, 0.99):.0f}ms" if update_lags else "")
+                )
+        stats = pool.stats()
+        print(
+            f"\n  avg batch: {stats['avg_batch_size']} sessions, dropped samples: {stats['dropped_samples']}, "
+            f"skipped samples: {stats['skipped_samples']}, stale updates: {stats['stale_updates']}, "
+            f"hop: {stats['hop_sec_per_worker']}"
+        )
+    finally:
+        await pool.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sessions", type=int, nargs="+", default=[1, 4, 8], help="Sessions simultanées par scénario")
+    parser.add_argument("--seconds", type=float, default=10, help="Audio envoyé par session")
+    parser.add_argument("--workers", type=int, default=max(1, (os.cpu_count() or 2) - 1), help="LIVE_WORKERS")
+    parser.add_argument("--batch-ms", type=float, default=LIVE_BATCH_MS, help="LIVE_BATCH_MS")
+    args = parser.parse_args()
+
+    print(f"🏁 {args.seconds:.0f}s de chunks 20 ms par session, {args.workers} workers, lots de {args.batch_ms:.0f}ms\n")
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
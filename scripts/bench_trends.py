@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""
+Benchmark: /v1/reports/trends et /v1/reports/history sur 52 et 260 semaines
+Compare l'ancien algorithme (listing complet du bucket puis `exists()` +
+`download_as_text()` semaine par semaine) aux endpoints actuels (listing
+avec délimiteur puis fetchs concurrents bornés).
+
+Le backend GCS est un bucket en mémoire qui simule un aller-retour réseau
+par appel (et par page de 1000 objets pour les listings) : aucun credential
+n'est requis.
+
+Usage:
+    python scripts/bench_trends.py --rtt-ms 25 --sessions-per-week 10
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import sys
+import time
+
+sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+
+import httpx
+from google.api_core.exceptions import NotFound
+from api.main import app
+from api.clients import get_storage_client
+from api.cache import response_cache
+
+logging.getLogger("httpx").setLevel(logging.WARNING)
+
+PAGE_SIZE = 1000
+
+
+class SimulatedBlob:
+    def __init__(self, bucket, name):
+        self.bucket = bucket
+        self.name = name
+        self.generation = 1
+        self.updated = None
+        self.time_created = None
+
+    def exists(self):
+        self.bucket.roundtrip()
+        return self.name in self.bucket.objects
+
+    def download_as_text(self):
+        self.bucket.roundtrip()
+        if self.name not in self.bucket.objects:
+            raise NotFound(self.name)
+        return self.bucket.objects[self.name]
+
+
+class SimulatedListing:
+    def __init__(self, bucket, names, delimiter):
+        self.bucket = bucket
+        self.names = names
+        self.delimiter = delimiter
+        self.prefixes = set()
+
+    @property
+    def pages(self):
+        if self.delimiter:
+            self.prefixes = {n.split(self.delimiter, 1)[0] + self.delimiter for n in self.names}
+            entries = sorted(self.prefixes)
+        else:
+            entries = self.names
+        for start in range(0, max(1, len(entries)), PAGE_SIZE):
+            self.bucket.roundtrip()
+            yield [] if self.delimiter else [SimulatedBlob(self.bucket, n) for n in entries[start:start + PAGE_SIZE]]
+
+    def __iter__(self):
+        for page in self.pages:
+            yield from page
+
+
+class SimulatedBucket:
+    def __init__(self, objects, rtt: float):
+        self.objects = objects
+        self.rtt = rtt
+
+    def roundtrip(self):
+        time.sleep(self.rtt)
+
+    def blob(self, name):
+        return SimulatedBlob(self, name)
+
+    def get_blob(self, name):
+        self.roundtrip()
+        return SimulatedBlob(self, name) if name in self.objects else None
+
+    def list_blobs(self, prefix=None, delimiter=None, **kwargs):
+        names = sorted(n for n in self.objects if n.startswith(prefix or ""))
+        return SimulatedListing(self, names, delimiter)
+
+
+class SimulatedClient:
+    def __init__(self, bucket):
+        self._bucket = bucket
+
+    def bucket(self, name):
+        return self._bucket
+
+
+def make_bucket(n_weeks: int, sessions_per_week: int, rtt: float) -> SimulatedBucket:
+    objects = {}
+    for i in range(n_weeks):
+        week = f"{2020 + i // 52}-W{i % 52 + 1:02d}"
+        objects[f"{week}/weekly_report.json"] = json.dumps({"emotion_index": 50 + i % 20, "sessions_count": sessions_per_week})
+        objects[f"{week}/weekly_report.pdf"] = "%PDF"
+        for s in range(sessions_per_week):
+            for artifact in ("transcript", "prosody_features", "events_emotions"):
+                objects[f"{week}/session_{s:03d}/{artifact}.json"] = "{}"
+    return SimulatedBucket(objects, rtt)
+
+
+def legacy_trends(bucket: SimulatedBucket, weeks: int):
+    """Ancien algorithme: listing complet + exists/download en série"""
+    weeks_set = {b.name.split("/")[0] for b in bucket.list_blobs() if b.name.startswith("20")}
+    trends = []
+    for week in sorted(weeks_set, reverse=True)[:weeks]:
+        blob = bucket.blob(f"{week}/weekly_report.json")
+        if blob.exists():
+            trends.append(json.loads(blob.download_as_text()))
+    return trends
+
+
+def legacy_history(bucket: SimulatedBucket, limit: int):
+    weeks_set = {b.name.split("/")[0] for b in bucket.list_blobs() if b.name.startswith("20")}
+    return [bucket.blob(f"{w}/weekly_report.pdf").exists() for w in sorted(weeks_set, reverse=True)[:limit]]
+
+
+async def timed_get(client, url):
+    response_cache.invalidate()
+    start = time.perf_counter()
+    response = await client.get(url)
+    response.raise_for_status()
+    return (time.perf_counter() - start) * 1000
+
+
+async def run(args):
+    rtt = args.rtt_ms / 1000
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for n_weeks in (52, 260):
+            bucket = make_bucket(n_weeks, args.sessions_per_week, rtt)
+            app.dependency_overrides[get_storage_client] = lambda: SimulatedClient(bucket)
+
+            start = time.perf_counter()
+            legacy_trends(bucket, n_weeks)
+            trends_before = (time.perf_counter() - start) * 1000
+            trends_after = await timed_get(client, f"/v1/reports/trends?weeks={n_weeks}")
+
+            start = time.perf_counter()
+            legacy_history(bucket, n_weeks)
+            history_before = (time.perf_counter() - start) * 1000
+            history_after = await timed_get(client, f"/v1/reports/history?limit={n_weeks}")
+
+            print(f"  {n_weeks:>3d} weeks ({len(bucket.objects)} objects)")
+            print(f"    trends   before={trends_before:8.0f}ms  after={trends_after:7.0f}ms  x{trends_before / trends_after:.1f}")
+            print(f"    history  before={history_before:8.0f}ms  after={history_after:7.0f}ms  x{history_before / history_after:.1f}")
+    app.dependency_overrides.clear()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rtt-ms", type=float, default=25.0, help="Latence simulée par appel GCS")
+    parser.add_argument("--sessions-per-week", type=int, default=10)
+    args = parser.parse_args()
+
+    print(f"🏁 RTT simulé {args.rtt_ms}ms, {args.sessions_per_week} sessions/semaine\n")
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
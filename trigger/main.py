@@ -1,20 +1,115 @@
 #!/usr/bin/env python3
 """
 Audio Upload Trigger
-Automatically triggers the weekly pipeline when new audio is uploaded
+Automatically processes each new audio upload and schedules a debounced weekly fusion
+
+Every upload starts a pipeline execution for that single session
+(`--audio gs://...`). The weekly fusion is requested by touching
+`_fusion/<week>/requested`; only the upload that wins the week's fusion
+lease starts a `--fuse-only --debounce N` execution, which waits for the
+burst of uploads to settle before rebuilding the report.
 """
 
 import os
+import json
 import functions_framework
-from google.cloud import run_v2
+from google.api_core.exceptions import NotFound, PreconditionFailed
+from google.cloud import run_v2, storage
 from cloudevents.http import CloudEvent
 
-from datetime import datetime, timedelta
-import os
+from datetime import datetime, timedelta, timezone
 
 PROJECT_ID = os.environ.get("PROJECT_ID", "build-unicorn25par-4813")
 REGION = os.environ.get("REGION", "europe-west1")
 JOB_NAME = "pz-weekly-pipeline"
+BUCKET_ANALYTICS = os.environ.get("BUCKET_ANALYTICS", "pz-analytics-build-unicorn25par-4813")
+
+# Quiet period before fusing a week (seconds without new uploads)
+FUSION_DEBOUNCE_SECONDS = int(os.environ.get("FUSION_DEBOUNCE_SECONDS", "180"))
+# Must match the pipeline's FUSION_PREFIX / FUSION_LEASE_TTL
+FUSION_PREFIX = os.environ.get("FUSION_PREFIX", "_fusion/")
+FUSION_LEASE_TTL = int(os.environ.get("FUSION_LEASE_TTL", "900"))
+
+# Clients reused across invocations of the same instance
+jobs_client = run_v2.JobsClient()
+storage_client = storage.Client(project=PROJECT_ID)
+
+
+def run_pipeline(args: list) -> str:
+    """Start a pipeline execution without waiting for it to finish"""
+    job_path = f"projects/{PROJECT_ID}/locations/{REGION}/jobs/{JOB_NAME}"
+    
+    request = run_v2.RunJobRequest(
+        name=job_path,
+        overrides=run_v2.RunJobRequest.Overrides(
+            container_overrides=[
+                run_v2.RunJobRequest.Overrides.ContainerOverride(
+                    args=args
+                )
+            ]
+        )
+    )
+    
+    operation = jobs_client.run_job(request=request)
+    return operation.metadata.name if operation.metadata else job_path
+
+
+def _write_lease(blob, generation: int) -> bool:
+    expires = datetime.now(timezone.utc) + timedelta(seconds=FUSION_LEASE_TTL)
+    try:
+        blob.upload_from_string(
+            json.dumps({"holder": "trigger", "expires_at": expires.isoformat()}),
+            content_type="application/json",
+            if_generation_match=generation,
+        )
+        return True
+    except PreconditionFailed:
+        return False
+
+
+def acquire_fusion_lease(week: str) -> bool:
+    """Create the week's fusion lease, or take it over if it expired"""
+    bucket = storage_client.bucket(BUCKET_ANALYTICS)
+    lease_path = f"{FUSION_PREFIX}{week}/lease"
+    if _write_lease(bucket.blob(lease_path), 0):
+        return True
+    
+    current = bucket.get_blob(lease_path)
+    if current is None:
+        return _write_lease(bucket.blob(lease_path), 0)
+    try:
+        expires_at = datetime.fromisoformat(json.loads(current.download_as_text())["expires_at"])
+    except (NotFound, ValueError, KeyError):
+        expires_at = datetime.min.replace(tzinfo=timezone.utc)
+    if expires_at > datetime.now(timezone.utc):
+        return False
+    return _write_lease(bucket.blob(lease_path), current.generation)
+
+
+def request_fusion(week: str):
+    """
+    Record a fusion request for the week and make sure a debounced fusion is scheduled.
+    The marker is touched even when a fusion is already scheduled: it restarts its quiet window.
+    """
+    bucket = storage_client.bucket(BUCKET_ANALYTICS)
+    bucket.blob(f"{FUSION_PREFIX}{week}/requested").upload_from_string(
+        datetime.now(timezone.utc).isoformat(), content_type="text/plain"
+    )
+    
+    if not acquire_fusion_lease(week):
+        print(f"⏳ Fusion already scheduled for week {week}")
+        return
+    
+    try:
+        execution = run_pipeline([week, "--fuse-only", "--debounce", str(FUSION_DEBOUNCE_SECONDS)])
+        print(f"🧮 Debounced fusion scheduled ({FUSION_DEBOUNCE_SECONDS}s): {execution}")
+    except Exception:
+        # Release the lease so the next upload can schedule the fusion
+        try:
+            bucket.blob(f"{FUSION_PREFIX}{week}/lease").delete()
+        except NotFound:
+            pass
+        raise
 
 
 @functions_framework.cloud_event
@@ -49,29 +144,17 @@ def trigger_pipeline(cloud_event: CloudEvent):
         print(f"⚠️  Skipping: Not an audio file")
         return
     
-    print(f"🚀 Triggering pipeline for week: {week}")
+    audio_uri = f"gs://{bucket}/{file_name}"
+    print(f"🚀 Triggering session processing for week {week}: {audio_uri}")
     
-    # Trigger Cloud Run Job
+    # Trigger Cloud Run Job (this session only) + debounced weekly fusion
     try:
-        client = run_v2.JobsClient()
-        job_path = f"projects/{PROJECT_ID}/locations/{REGION}/jobs/{JOB_NAME}"
-        
-        request = run_v2.RunJobRequest(
-            name=job_path,
-            overrides=run_v2.RunJobRequest.Overrides(
-                container_overrides=[
-                    run_v2.RunJobRequest.Overrides.ContainerOverride(
-                        args=[week]
-                    )
-                ]
-            )
-        )
+        execution = run_pipeline([week, "--audio", audio_uri, "--debounce", str(FUSION_DEBOUNCE_SECONDS)])
         
-        operation = client.run_job(request=request)
-        execution = operation.result()
+        print(f"✅ Session processing triggered successfully!")
+        print(f"   Execution: {execution}")
         
-        print(f"✅ Pipeline triggered successfully!")
-        print(f"   Execution: {execution.name}")
+        request_fusion(week)
         
     except Exception as e:
         print(f"❌ Error triggering pipeline: {e}")